@@ -1,35 +1,54 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from pymongo import MongoClient
-from langgraph.checkpoint.mongodb import MongoDBSaver
+from fastapi.middleware.gzip import GZipMiddleware
 
 from src.Research_Agent.graph.graph_builder import GraphBuilder
+from src.Research_Agent.LLMS.cache import llm_cache
+from src.Research_Agent.LLMS.registry import llm_registry
+from src.db.checkpointer import MotorCheckpointSaver
+from src.config import LLM_CACHE_MONGO
 from src.db.mongo_client import MongoDB
-from src.config import MONGODB_URI
+from src.db import idempotency, message_log, session_store, thread_lock, user_store
+from src.jobs import job_manager
+from src.password_pool import password_pool
+from src.logging.context import RequestContextMiddleware
+from src.tracing import TraceMiddleware, tracer
 from src.routers.auth import router as auth_router
 from src.routers.chat import router as chat_router
 from src.routers.history import router as history_router
 from src.routers.index import router as index_router
 from src.routers.sessions import router as sessions_router
+from src.routers.metrics import router as metrics_router
+from src.routers.stats import router as stats_router
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Async motor client for session store
+    # One Motor client (and one connection pool) for sessions, users and checkpoints
     await MongoDB.connect()
+    await session_store.ensure_indexes()
+    await user_store.ensure_indexes()
+    await message_log.ensure_indexes()
+    await thread_lock.ensure_indexes()
+    await idempotency.ensure_indexes()
+    await tracer.setup()
     
-    # Sync pymongo client for MongoDBSaver memory
-    sync_client = MongoClient(MONGODB_URI)
-    memory = MongoDBSaver(sync_client)
+    memory = MotorCheckpointSaver(MongoDB.client)
+    await memory.setup()
+    if LLM_CACHE_MONGO:
+        await llm_cache.attach_mongo(MongoDB.db)
     
-    builder = GraphBuilder(checkpointer=memory)
+    builder = GraphBuilder(checkpointer=memory, async_nodes=True)
     app.state.agent = builder.build()
-    app.state.sync_client = sync_client
+    await job_manager.start()
     
     yield
     
+    await job_manager.stop()
+    await tracer.close()
+    password_pool.shutdown()
     await MongoDB.close()
-    app.state.sync_client.close()
+    await llm_registry.aclose()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -41,8 +60,16 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Compress large JSON (history, reports); Starlette leaves text/event-stream alone.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+# One root span per request, covering compression and CORS too.
+app.add_middleware(TraceMiddleware)
+# Outermost: request id for log records, trace spans and the X-Request-ID header.
+app.add_middleware(RequestContextMiddleware)
 app.include_router(index_router)
 app.include_router(auth_router)
 app.include_router(chat_router)
 app.include_router(history_router)
 app.include_router(sessions_router)
+app.include_router(stats_router)
+app.include_router(metrics_router)
@@ -0,0 +1,171 @@
+"""
+cache.py
+Content-addressed cache for LLM responses, plugged in through LangChain's BaseCache.
+
+A model created with `cache=llm_cache` looks every call up by the SHA-256 of
+LangChain's llm_string (provider, model, temperature and any bound tools or
+structured-output schema) plus the serialized prompt/message list, so only a
+byte-identical request can hit.
+
+Two tiers:
+  memory — bounded LRU with per-entry TTL, served on both sync and async paths
+  mongo  — optional shared tier (llm_cache collection, TTL index on expires_at),
+           consulted on async lookups after a memory miss and promoted on hit
+
+Caching is opt-in per node via get_llm(cache=True); creative nodes leave it off.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, Generation
+
+from src.config import LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_SECONDS
+from src.logging.logger import logger
+
+COLLECTION = "llm_cache"
+
+# Only these classes may be revived from the Mongo tier.
+_ALLOWED_OBJECTS = [Generation, ChatGeneration, ChatGenerationChunk, AIMessage, AIMessageChunk]
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class TieredLLMCache(BaseCache):
+    """In-memory LRU/TTL cache with an optional Mongo tier behind it."""
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES, ttl_seconds: int = LLM_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.collection = None
+        self._lock = threading.Lock()
+        # key -> (expires_at monotonic, serialized size, generations)
+        self._entries: OrderedDict[str, tuple[float, int, RETURN_VAL_TYPE]] = OrderedDict()
+        self._counters = {
+            "memory_hits":  0,
+            "mongo_hits":   0,
+            "misses":       0,
+            "writes":       0,
+            "evictions":    0,
+            "bytes_stored": 0,
+            "bytes_served": 0,
+        }
+
+    # ── Mongo tier ────────────────────────────────────────────────────────────
+
+    async def attach_mongo(self, db) -> None:
+        """Enable the shared tier on the given Motor database and ensure its TTL index."""
+        self.collection = db[COLLECTION]
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+        logger.info("LLM cache Mongo tier enabled")
+
+    # ── Memory tier ───────────────────────────────────────────────────────────
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[key] += amount
+
+    def _memory_get(self, key: str) -> Optional[RETURN_VAL_TYPE]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, size, generations = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self._counters["memory_hits"] += 1
+            self._counters["bytes_served"] += size
+            return generations
+
+    def _memory_put(self, key: str, size: int, generations: RETURN_VAL_TYPE) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, size, generations)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    # ── BaseCache API ─────────────────────────────────────────────────────────
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        hit = self._memory_get(cache_key(prompt, llm_string))
+        if hit is None:
+            self._count("misses")
+        return hit
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        serialized = dumps(return_val)
+        self._memory_put(cache_key(prompt, llm_string), len(serialized), return_val)
+        self._count("writes")
+        self._count("bytes_stored", len(serialized))
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = cache_key(prompt, llm_string)
+        hit = self._memory_get(key)
+        if hit is not None:
+            return hit
+
+        if self.collection is not None:
+            doc = await self.collection.find_one(
+                {"_id": key, "expires_at": {"$gt": datetime.now(timezone.utc)}}
+            )
+            if doc:
+                generations = loads(doc["value"], allowed_objects=_ALLOWED_OBJECTS)
+                size = len(doc["value"])
+                self._memory_put(key, size, generations)
+                self._count("mongo_hits")
+                self._count("bytes_served", size)
+                return generations
+
+        self._count("misses")
+        return None
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = cache_key(prompt, llm_string)
+        serialized = dumps(return_val)
+        self._memory_put(key, len(serialized), return_val)
+        self._count("writes")
+        self._count("bytes_stored", len(serialized))
+
+        if self.collection is not None:
+            await self.collection.update_one(
+                {"_id": key},
+                {"$set": {
+                    "value":      serialized,
+                    "expires_at": datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds),
+                }},
+                upsert=True,
+            )
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    async def aclear(self, **kwargs: Any) -> None:
+        self.clear()
+        if self.collection is not None:
+            await self.collection.delete_many({})
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            counters["entries"] = len(self._entries)
+        lookups = counters["memory_hits"] + counters["mongo_hits"] + counters["misses"]
+        counters["hit_rate"] = (counters["memory_hits"] + counters["mongo_hits"]) / lookups if lookups else 0.0
+        counters["mongo_tier"] = self.collection is not None
+        return counters
+
+
+# Process-wide instance handed to every client created with cache=True.
+llm_cache = TieredLLMCache()
@@ -1,15 +1,32 @@
-import os
 from langchain_groq import ChatGroq
 from src.config import GROQ_API_KEY
 from src.constants import GROQ_LLM_MODEL_NAME, GROQ_FAST_MODEL_NAME
+from src.Research_Agent.LLMS.cache import llm_cache
+from src.Research_Agent.LLMS.registry import llm_registry
 
-def get_llm(temperature=0.0, use_fast_model=False):
-    """
-    Factory function to return a configured Groq LLM.
-    """
+
+def _build_groq(provider, model, temperature, cache, http_client, http_async_client):
     if not GROQ_API_KEY:
         raise ValueError("CRITICAL ERROR: GROQ_API_KEY is missing from .env file.")
-    
+
+    return ChatGroq(
+        api_key=GROQ_API_KEY,
+        temperature=temperature,
+        model=model,
+        http_client=http_client,
+        http_async_client=http_async_client,
+        cache=llm_cache if cache else False,
+    )
+
+
+llm_registry.register_provider("groq", _build_groq)
+
+
+def get_llm(temperature=0.0, use_fast_model=False, tools=None, cache=False):
+    """
+    Return the shared Groq LLM for this configuration from the process-wide registry.
+    Pass `tools` to get the client with those tools already bound, and `cache=True`
+    to serve identical requests from the LLM response cache (see LLMS/cache.py).
+    """
     model_name = GROQ_FAST_MODEL_NAME if use_fast_model else GROQ_LLM_MODEL_NAME
-    llm = ChatGroq(api_key=GROQ_API_KEY, temperature=temperature, model=model_name)
-    return llm 
\ No newline at end of file
+    return llm_registry.get("groq", model_name, temperature, tools=tools, cache=cache)
@@ -0,0 +1,191 @@
+"""
+registry.py
+Process-wide registry of chat-model clients.
+
+Every node used to build a fresh ChatGroq on entry, which also meant a fresh
+httpx connection pool and a new TLS handshake per LLM call. The registry hands
+out one shared client per (provider, model, temperature, cache, tool binding) and
+backs all of them with a single pooled sync + async HTTP transport, so
+connections to the provider stay warm across nodes, turns and users.
+
+    llm = llm_registry.get("groq", GROQ_LLM_MODEL_NAME, 0.6)
+    llm_registry.stats()   # client + connection reuse counters
+"""
+
+import threading
+from typing import Any, Callable, Optional, Sequence
+
+import httpx
+
+from src.config import (
+    LLM_HTTP_KEEPALIVE_EXPIRY,
+    LLM_HTTP_MAX_CONNECTIONS,
+    LLM_HTTP_MAX_KEEPALIVE,
+)
+from src.logging.logger import logger
+from src.metrics import llm_metrics_callback
+
+# Factory signature: (provider, model, temperature, cache, http_client, http_async_client) -> chat model
+ClientFactory = Callable[[str, str, float, bool, httpx.Client, httpx.AsyncClient], Any]
+
+
+def _tool_key(tools: Optional[Sequence[Any]]) -> tuple:
+    """Stable key for a tool binding — tools are identified by name."""
+    if not tools:
+        return ()
+    return tuple(sorted(getattr(t, "name", repr(t)) for t in tools))
+
+
+def _attach_metrics(client: Any) -> None:
+    """Add the metrics callback to a freshly built chat model (once)."""
+    callbacks = getattr(client, "callbacks", None)
+    if callbacks is None:
+        callbacks = client.callbacks = []
+    if isinstance(callbacks, list) and llm_metrics_callback not in callbacks:
+        callbacks.append(llm_metrics_callback)
+
+
+class LLMRegistry:
+    """Thread-safe cache of chat-model clients sharing one pooled HTTP transport."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clients: dict[tuple, Any] = {}
+        self._factories: dict[str, ClientFactory] = {}
+        self._http_client: Optional[httpx.Client] = None
+        self._http_async_client: Optional[httpx.AsyncClient] = None
+        self._counters = {
+            "clients_created":    0,
+            "client_reuses":      0,
+            "http_requests":      0,
+            "connections_opened": 0,
+        }
+
+    # ── Provider factories ───────────────────────────────────────────────────
+
+    def register_provider(self, provider: str, factory: ClientFactory) -> None:
+        """Register (or replace) the factory used to build clients for a provider.
+        Replacing a factory drops every cached client of that provider."""
+        with self._lock:
+            self._factories[provider] = factory
+            self._clients = {k: v for k, v in self._clients.items() if k[0] != provider}
+
+    # ── Shared HTTP transport ────────────────────────────────────────────────
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY,
+        )
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    # httpcore reports connection lifecycle events through the "trace" request
+    # extension; a TCP connect only happens when the pool has no idle connection.
+    def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.started":
+            self._count("connections_opened")
+
+    async def _atrace(self, event_name: str, info: dict) -> None:
+        self._trace(event_name, info)
+
+    def _on_request(self, request: httpx.Request) -> None:
+        self._count("http_requests")
+        request.extensions["trace"] = self._trace
+
+    async def _aon_request(self, request: httpx.Request) -> None:
+        self._count("http_requests")
+        request.extensions["trace"] = self._atrace
+
+    @property
+    def http_client(self) -> httpx.Client:
+        if self._http_client is None:
+            with self._lock:
+                if self._http_client is None:
+                    self._http_client = httpx.Client(
+                        limits=self._limits(),
+                        event_hooks={"request": [self._on_request]},
+                    )
+        return self._http_client
+
+    @property
+    def http_async_client(self) -> httpx.AsyncClient:
+        if self._http_async_client is None:
+            with self._lock:
+                if self._http_async_client is None:
+                    self._http_async_client = httpx.AsyncClient(
+                        limits=self._limits(),
+                        event_hooks={"request": [self._aon_request]},
+                    )
+        return self._http_async_client
+
+    # ── Client lookup ────────────────────────────────────────────────────────
+
+    def get(self, provider: str, model: str, temperature: float,
+            tools: Optional[Sequence[Any]] = None, cache: bool = False):
+        """
+        Return the shared client for this configuration, creating it on first use.
+        When tools are given, the returned runnable is the client with those tools bound.
+        With cache=True the client reads and writes the shared LLM response cache.
+        """
+        key = (provider, model, float(temperature), bool(cache), _tool_key(tools))
+
+        client = self._clients.get(key)
+        if client is not None:
+            self._count("client_reuses")
+            return client
+
+        base_key = key[:4] + ((),)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._counters["client_reuses"] += 1
+                return client
+
+            base = self._clients.get(base_key)
+            if base is None:
+                factory = self._factories.get(provider)
+                if factory is None:
+                    raise ValueError(f"No LLM provider registered under '{provider}'")
+                base = factory(provider, model, float(temperature), bool(cache),
+                               self.http_client, self.http_async_client)
+                _attach_metrics(base)
+                self._clients[base_key] = base
+                self._counters["clients_created"] += 1
+                logger.info(f"LLM client created: {provider}/{model} @ temperature={temperature} cache={cache}")
+
+            client = base.bind_tools(list(tools)) if tools else base
+            self._clients[key] = client
+            return client
+
+    # ── Introspection / lifecycle ────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            cached = len(self._clients)
+        counters["connections_reused"] = max(counters["http_requests"] - counters["connections_opened"], 0)
+        counters["cached_clients"] = cached
+        return counters
+
+    def clear(self) -> None:
+        """Drop every cached client (the HTTP transport stays open)."""
+        with self._lock:
+            self._clients.clear()
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP transport — call once at application shutdown."""
+        if self._http_async_client is not None:
+            await self._http_async_client.aclose()
+            self._http_async_client = None
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+        self.clear()
+
+
+# Process-wide instance — import this, never construct a second registry.
+llm_registry = LLMRegistry()
@@ -27,30 +27,43 @@ Full flow:
 """
 
 from langgraph.graph import StateGraph, START, END
-from langgraph.prebuilt import ToolNode
-from langgraph.checkpoint.mongodb import MongoDBSaver
-from pymongo import MongoClient
 
 from src.config import MONGODB_URI
+from src.metrics import instrument_node
 from src.Research_Agent.state.state import State
-from src.Research_Agent.nodes.analyze_node import analyze_node
-from src.Research_Agent.nodes.present_node import present_node
-from src.Research_Agent.nodes.classify_node import classify_node
-from src.Research_Agent.nodes.panel_generator_node import panel_generator_node
-from src.Research_Agent.nodes.expert_node import expert_node
-from src.Research_Agent.nodes.moderator_node import moderator_node
-from src.Research_Agent.nodes.blueteam_node import blue_team_node
-
-
-# ── Load Tavily tools once at module level ────────────────────────────────────
-# Loaded here rather than inside nodes so ToolNode and both LLMs share the same
-# tool instances. Wrapped in try/except — app works without Tavily configured.
-_tools = []
-try:
-    from src.Research_Agent.tools.search_tool import search_tool
-    _tools = search_tool()
-except Exception:
-    pass   # Tavily not installed or API key missing — tool nodes are skipped
+from src.Research_Agent.tools.registry import tool_registry
+from src.Research_Agent.nodes.analyze_node import analyze_node, aanalyze_node
+from src.Research_Agent.nodes.present_node import present_node, apresent_node
+from src.Research_Agent.nodes.classify_node import classify_node, aclassify_node
+from src.Research_Agent.nodes.panel_generator_node import panel_generator_node, apanel_generator_node
+from src.Research_Agent.nodes.expert_node import expert_node, aexpert_node
+from src.Research_Agent.nodes.moderator_node import moderator_node, amoderator_node
+from src.Research_Agent.nodes.blueteam_node import blue_team_node, ablue_team_node
+from src.Research_Agent.nodes.synthesis_tools_node import synthesis_tools_node, asynthesis_tools_node
+
+
+# ── Node tables ───────────────────────────────────────────────────────────────
+# Sync nodes are pushed onto LangGraph's thread pool under astream(); the async
+# variants await their LLM calls on the event loop instead.
+SYNC_NODES = {
+    "analyze":         analyze_node,
+    "present":         present_node,
+    "classify":        classify_node,
+    "panel_generator": panel_generator_node,
+    "moderator":       moderator_node,
+    "expert":          expert_node,
+    "blue_team":       blue_team_node,
+}
+
+ASYNC_NODES = {
+    "analyze":         aanalyze_node,
+    "present":         apresent_node,
+    "classify":        aclassify_node,
+    "panel_generator": apanel_generator_node,
+    "moderator":       amoderator_node,
+    "expert":          aexpert_node,
+    "blue_team":       ablue_team_node,
+}
 
 
 # ── Routing functions ─────────────────────────────────────────────────────────
@@ -85,41 +98,54 @@ class GraphBuilder:
 
     Args:
         checkpointer: Optional LangGraph checkpointer to use.
-            - Production: pass MongoDBSaver(MongoClient(MONGODB_URI))
+            - Production: pass MotorCheckpointSaver(MongoDB.client) (see src/db/checkpointer.py)
             - Testing:    pass MemorySaver() to avoid needing Atlas
             - Default:    MongoDBSaver is created automatically using MONGODB_URI
+        async_nodes: Compile the graph with the async node variants. Use this when
+            the graph is driven with astream()/ainvoke() (the FastAPI app); the
+            compiled graph then only supports the async entry points.
     """
 
-    def __init__(self, checkpointer=None):
+    def __init__(self, checkpointer=None, async_nodes: bool = False):
+        self.async_nodes = async_nodes
         if checkpointer is not None:
             self.memory = checkpointer
         else:
             # Production default — connects to Atlas at construction time.
             # MongoDBSaver uses sync pymongo but exposes async wrappers
             # via run_in_executor so graph.astream() works correctly.
+            # Imported here: only this fallback needs the sync saver and client.
+            from langgraph.checkpoint.mongodb import MongoDBSaver
+            from pymongo import MongoClient
+
             sync_client  = MongoClient(MONGODB_URI)
             self.memory  = MongoDBSaver(sync_client)
 
     def build(self):
         """Build and return the compiled LangGraph app."""
-        workflow = StateGraph(State)
-
-        
-        workflow.add_node("analyze",  analyze_node)
-        workflow.add_node("present",  present_node)
-        workflow.add_node("classify", classify_node)
-        workflow.add_node("panel_generator", panel_generator_node)
-        workflow.add_node("moderator", moderator_node)
-        workflow.add_node("expert", expert_node)
-        workflow.add_node("blue_team", blue_team_node)
-
-        # ToolNode for blue_team's web searches — only added when Tavily is available.
-        # messages_key="synthesis_thread" tells ToolNode to read tool_calls from
-        # state["synthesis_thread"] and write ToolMessage results back there.
-        if _tools:
+        workflow  = StateGraph(State)
+        # Only asks whether web search can be loaded; the tool registry builds the
+        # Tavily client on first use (blue_team's first bind), so building the
+        # graph imports no search SDK and touches no network. Without Tavily
+        # configured the tool node is left out.
+        has_tools = tool_registry.available("web_search")
+
+        nodes = ASYNC_NODES if self.async_nodes else SYNC_NODES
+        # Every node is wrapped so its latency and errors land in /metrics.
+        for name, node in nodes.items():
+            workflow.add_node(name, instrument_node(name, node))
+
+        # Tool executor for blue_team's web searches — only added when Tavily is
+        # available. Reads tool_calls from state["synthesis_thread"], runs them
+        # concurrently (capped, with a per-call timeout) and writes the
+        # ToolMessage results back there.
+        if has_tools:
             workflow.add_node(
                 "synthesis_tools",
-                ToolNode(_tools, messages_key="synthesis_thread"),
+                instrument_node(
+                    "synthesis_tools",
+                    asynthesis_tools_node if self.async_nodes else synthesis_tools_node,
+                ),
             )
 
         # ── Phase A: Intake & Confirmation (fixed edges) ──────────────────────
@@ -153,7 +179,7 @@ class GraphBuilder:
         workflow.add_edge("expert", "moderator")
 
         # ── Phase C: Synthesis ────────────────────────────────────────────────
-        if _tools:
+        if has_tools:
             # blue_team may trigger tool calls → synthesis_tools → back to blue_team
             workflow.add_conditional_edges(
                 "blue_team",
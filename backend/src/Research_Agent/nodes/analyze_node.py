@@ -26,24 +26,39 @@ Output your analysis as a structured object with these fields:
 """
 
 
-def analyze_node(state: State) -> dict:
-    """
-    Phase 1  Interpret the raw user input into a structured InterpretedContext.
-    Returns a partial state update dict.
-    """
-    llm = get_llm(temperature=0.3, use_fast_model=True)
-    structured_llm = llm.with_structured_output(InterpretedContext)
-
+def _build_prompt(state: State) -> str:
     raw_input = state.get("raw_input", "")
     corrections = state.get("user_corrections", [])
     corrections_str = str(corrections) if corrections else "None"
 
-    prompt = ANALYZE_PROMPT.format(
+    return ANALYZE_PROMPT.format(
         raw_input=raw_input,
         user_corrections=corrections_str,
     )
 
-    interpreted: InterpretedContext = structured_llm.invoke(prompt)
+
+def _structured_llm():
+    # Cached: re-analysis after a no-op correction or a popular query re-sends the same prompt.
+    llm = get_llm(temperature=0.3, use_fast_model=True, cache=True)
+    return llm.with_structured_output(InterpretedContext)
+
+
+def analyze_node(state: State) -> dict:
+    """
+    Phase 1  Interpret the raw user input into a structured InterpretedContext.
+    Returns a partial state update dict.
+    """
+    interpreted: InterpretedContext = _structured_llm().invoke(_build_prompt(state))
+
+    return {
+        "interpreted_context": interpreted,
+        "iteration_count": state.get("iteration_count", 0) + 1,
+    }
+
+
+async def aanalyze_node(state: State) -> dict:
+    """Async variant of analyze_node — awaits the LLM instead of blocking a thread."""
+    interpreted: InterpretedContext = await _structured_llm().ainvoke(_build_prompt(state))
 
     return {
         "interpreted_context": interpreted,
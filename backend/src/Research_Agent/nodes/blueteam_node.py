@@ -2,19 +2,20 @@
 blueteam_node.py
 Terminal synthesis node — produces the final structured research report.
 
-Uses LangGraph's ToolNode pattern via state["synthesis_thread"]:
+Uses the ToolNode pattern via state["synthesis_thread"]:
   - First entry: builds the synthesis prompt and invokes LLM.
-  - Re-entry (after ToolNode): passes full thread back to LLM to continue.
+  - Re-entry (after synthesis_tools): passes full thread back to LLM to continue.
   - Only writes final_report and messages when LLM produces plain text (no tool_calls).
 
-A separate ToolNode(tools, messages_key="synthesis_thread") in graph_builder
-handles tool execution and routes back here.
+A separate synthesis_tools node (see synthesis_tools_node.py) handles tool
+execution and routes back here.
 """
 
 from langchain_core.messages import HumanMessage
 
 from src.Research_Agent.state.state import State
 from src.Research_Agent.LLMS.groqllm import get_llm
+from src.Research_Agent.nodes.transcript_memory import transcript_view
 from src.logging.logger import logger
 
 
@@ -59,10 +60,11 @@ One sentence justifying the verdict.
 """
 
 
-def _format_debate(expert_critiques: list) -> str:
-    """Convert expert_critique list into a readable debate transcript."""
-    lines = []
-    for entry in expert_critiques:
+def _format_debate(state: State) -> str:
+    """Render the debate: the rolling summary of older rounds, then recent exchanges verbatim."""
+    summary, recent = transcript_view(state)
+    lines = [f"--- Earlier rounds (summarised) ---\n{summary}"] if summary else []
+    for entry in recent:
         lines.append(
             f"--- Round {entry['round']} | {entry['persona']} ({entry['role']}) ---\n"
             f"CRITIQUE:    {entry['critique']}\n"
@@ -71,34 +73,23 @@ def _format_debate(expert_critiques: list) -> str:
     return "\n\n".join(lines) or "No expert exchanges recorded."
 
 
-def blue_team_node(state: State) -> dict:
-    """
-    Runs every time the graph enters this node — fresh or after ToolNode.
-
-    First entry:  synthesis_thread is empty → build prompt and start conversation.
-    Re-entry:     synthesis_thread has tool results → pass full thread to LLM.
-    """
-    logger.info("Blue Team Node Entered")
-
+def _prepare(state: State):
+    """Return (llm_with_tools, thread) for this entry into the synthesis loop."""
     ctx       = state.get("interpreted_context")
-    critiques = state.get("expert_critique", [])
     thread    = state.get("synthesis_thread", [])
 
-    llm = get_llm(temperature=0.4)
-
-    # Bind Tavily if available
+    # Bind Tavily if available — the registry caches the bound client, so
+    # re-entries after a ToolNode step reuse it instead of re-binding.
     try:
         from src.Research_Agent.tools.search_tool import search_tool
-        tools          = search_tool()
-        llm_with_tools = llm.bind_tools(tools)
-        logger.info("Tavily bound to synthesis LLM")
+        llm_with_tools = get_llm(temperature=0.4, tools=search_tool())
     except Exception:
-        llm_with_tools = llm
+        llm_with_tools = get_llm(temperature=0.4)
         logger.info("Tavily unavailable — synthesis proceeds without web search")
 
     if not thread:
         # ── First entry: build the synthesis prompt ────────────────────────
-        debate_transcript = _format_debate(critiques)
+        debate_transcript = _format_debate(state)
         prompt = BLUE_TEAM_PROMPT.format(
             domain            = ctx.domain,
             interpreted_goal  = ctx.interpreted_goal,
@@ -106,8 +97,10 @@ def blue_team_node(state: State) -> dict:
         )
         thread = [HumanMessage(content=prompt)]
 
-    # Invoke LLM with the full thread (includes any ToolMessages on re-entry)
-    response = llm_with_tools.invoke(thread)
+    return llm_with_tools, thread
+
+
+def _synthesis_update(state: State, thread: list, response) -> dict:
     logger.info(f"Synthesis LLM responded — tool_calls: {bool(getattr(response, 'tool_calls', None))}")
 
     update = {"synthesis_thread": [*thread, response] if not state.get("synthesis_thread") else [response]}
@@ -120,3 +113,28 @@ def blue_team_node(state: State) -> dict:
         update["messages"]     = [{"role": "report", "content": final_report}]
 
     return update
+
+
+def blue_team_node(state: State) -> dict:
+    """
+    Runs every time the graph enters this node — fresh or after ToolNode.
+
+    First entry:  synthesis_thread is empty → build prompt and start conversation.
+    Re-entry:     synthesis_thread has tool results → pass full thread to LLM.
+    """
+    logger.info("Blue Team Node Entered")
+
+    llm_with_tools, thread = _prepare(state)
+
+    # Invoke LLM with the full thread (includes any ToolMessages on re-entry)
+    response = llm_with_tools.invoke(thread)
+    return _synthesis_update(state, thread, response)
+
+
+async def ablue_team_node(state: State) -> dict:
+    """Async variant of blue_team_node — awaits the LLM instead of blocking a thread."""
+    logger.info("Blue Team Node Entered")
+
+    llm_with_tools, thread = _prepare(state)
+    response = await llm_with_tools.ainvoke(thread)
+    return _synthesis_update(state, thread, response)
@@ -1,12 +1,17 @@
 """
 classify_node.py
 Phase 3 – Routing Decision: classify user's reply as CONFIRMED, CORRECTED, or REJECTED.
-Uses the LLM to intelligently parse natural-language confirmations/corrections.
+Unambiguous replies are resolved locally by reply_classifier; only the rest go to the LLM,
+which intelligently parses natural-language confirmations/corrections.
 """
 
+import time
 from typing import Literal
+from langchain_core.runnables import RunnableConfig
 from src.Research_Agent.state.state import State
 from src.Research_Agent.LLMS.groqllm import get_llm
+from src.Research_Agent.nodes.panel_generator_node import discard_panel_speculation
+from src.Research_Agent.nodes.reply_classifier import reply_classifier
 from langchain_core.messages import HumanMessage, AIMessage
 
 
@@ -21,34 +26,20 @@ Classify this response as exactly ONE of:
 Reply with ONLY the single word: CONFIRMED, CORRECTED, or REJECTED."""
 
 
-def classify_node(state: State) -> dict:
-    """
-    Phase 3 – Read the last user message (their response to our interpretation)
-    and decide what to do next. Stores classification in is_confirmed and may
-    append a user correction.
-    """
-    llm = get_llm(temperature=0.0, use_fast_model=True)
-
+def _last_user_response(state: State) -> str:
     # The last message in state.messages is the user's reply to our summary
     messages = state.get("messages", [])
-    user_response = ""
     for msg in reversed(messages):
         # Support both dict-style (from our present_node) and BaseMessage objects
         if isinstance(msg, dict):
             if msg.get("role") == "user":
-                user_response = msg.get("content", "")
-                break
+                return msg.get("content", "")
         elif isinstance(msg, HumanMessage):
-            user_response = msg.content
-            break
+            return msg.content
+    return ""
 
-    if not user_response:
-        # Default to asking again if we can't read the response
-        return {"is_confirmed": False}
-
-    prompt = CLASSIFY_PROMPT.format(user_response=user_response)
-    classification = llm.invoke(prompt).content.strip().upper()
 
+def _apply_classification(classification: str, user_response: str) -> dict:
     # Normalize — sometimes the LLM wraps it in extra text
     if "CONFIRMED" in classification:
         return {"is_confirmed": True}
@@ -66,3 +57,48 @@ def classify_node(state: State) -> dict:
             "user_corrections": [user_response],  # operator.add appends this
             "messages": [{"role": "user", "content": user_response}]
         }
+
+
+def classify_node(state: State) -> dict:
+    """
+    Phase 3 – Read the last user message (their response to our interpretation)
+    and decide what to do next. Stores classification in is_confirmed and may
+    append a user correction.
+    """
+    user_response = _last_user_response(state)
+    if not user_response:
+        # Default to asking again if we can't read the response
+        return {"is_confirmed": False}
+
+    classification = reply_classifier.classify(user_response)
+    if classification is None:
+        started = time.perf_counter()
+        llm = get_llm(temperature=0.0, use_fast_model=True, cache=True)
+        prompt = CLASSIFY_PROMPT.format(user_response=user_response)
+        classification = llm.invoke(prompt).content.strip().upper()
+        reply_classifier.record_llm(user_response, classification, started)
+
+    return _apply_classification(classification, user_response)
+
+
+async def aclassify_node(state: State, config: RunnableConfig) -> dict:
+    """Async variant of classify_node — awaits the LLM instead of blocking a thread.
+    Anything but a confirmation discards the speculative panel for this thread."""
+    thread_id = config.get("configurable", {}).get("thread_id")
+    user_response = _last_user_response(state)
+    if not user_response:
+        discard_panel_speculation(thread_id)
+        return {"is_confirmed": False}
+
+    classification = reply_classifier.classify(user_response)
+    if classification is None:
+        started = time.perf_counter()
+        llm = get_llm(temperature=0.0, use_fast_model=True, cache=True)
+        prompt = CLASSIFY_PROMPT.format(user_response=user_response)
+        classification = (await llm.ainvoke(prompt)).content.strip().upper()
+        reply_classifier.record_llm(user_response, classification, started)
+
+    update = _apply_classification(classification, user_response)
+    if not update["is_confirmed"]:
+        discard_panel_speculation(thread_id)
+    return update
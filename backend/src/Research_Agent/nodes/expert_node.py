@@ -1,6 +1,7 @@
 from src.Research_Agent.state.state import State
 from src.logging.logger import logger
 from src.Research_Agent.LLMS.groqllm import get_llm
+from src.Research_Agent.nodes.transcript_memory import format_exchange, transcript_view
 from langgraph.types import interrupt
 
 EXPERT_PROMPT = """
@@ -43,36 +44,33 @@ QUESTION: [Your single, direct, pointed question to the researcher]
 """
 
 
-def expert_node(state: State) -> dict:
-    logger.info("Expert Node Entered")
-
+def _build_prompt(state: State) -> tuple[str, object]:
+    """Return the rendered expert prompt and the persona whose turn it is."""
     current_speaker_idx = state.get("current_speaker_idx", 0)
     current_persona = state.get("personas", [])[current_speaker_idx]
     ctx = state.get("interpreted_context")
 
-    current_domain = current_persona.domain
-    current_prompt = current_persona.system_prompt
-    current_role = current_persona.role
-    current_name = current_persona.name
-    history = state.get("expert_critique", [])
-
-    history_str = "\n\n".join([
-        f"[{e['persona']}]: {e['critique']}\nResearcher: {e['response']}"
-        for e in history
-    ]) or "No previous expert exchanges yet."
+    # Older exchanges arrive pre-summarised by moderator_node; recent ones verbatim.
+    summary, recent = transcript_view(state)
+    sections = [f"Summary of earlier exchanges:\n{summary}"] if summary else []
+    sections += [format_exchange(e) for e in recent]
+    history_str = "\n\n".join(sections) or "No previous expert exchanges yet."
 
-    llm    = get_llm(temperature=0.6)
     prompt = EXPERT_PROMPT.format(
-        system_prompt    = current_prompt,
-        name             = current_name,
-        role             = current_role,
-        domain           = current_domain,
+        system_prompt    = current_persona.system_prompt,
+        name             = current_persona.name,
+        role             = current_persona.role,
+        domain           = current_persona.domain,
         interpreted_goal = ctx.interpreted_goal,
         history          = history_str,
     )
+    return prompt, current_persona
 
-    response      = llm.invoke(prompt)
-    critique_text = response.content
+
+def _exchange(state: State, persona, critique_text: str) -> dict:
+    """Interrupt with the critique, then record the researcher's reply."""
+    current_name = persona.name
+    current_role = persona.role
     logger.info(f"Expert [{current_name}] critique generated — round {state.get('round_number', 1)}")
 
     # Pause graph — hand critique to the outside world, wait for user reply
@@ -100,3 +98,22 @@ def expert_node(state: State) -> dict:
             {"role": "user",   "content": str(user_response)},
         ],
     }
+
+
+def expert_node(state: State) -> dict:
+    logger.info("Expert Node Entered")
+
+    prompt, persona = _build_prompt(state)
+    llm      = get_llm(temperature=0.6)
+    response = llm.invoke(prompt)
+    return _exchange(state, persona, response.content)
+
+
+async def aexpert_node(state: State) -> dict:
+    """Async variant of expert_node — awaits the LLM instead of blocking a thread."""
+    logger.info("Expert Node Entered")
+
+    prompt, persona = _build_prompt(state)
+    llm      = get_llm(temperature=0.6)
+    response = await llm.ainvoke(prompt)
+    return _exchange(state, persona, response.content)
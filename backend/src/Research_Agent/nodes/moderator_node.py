@@ -1,13 +1,11 @@
 from src.Research_Agent.state.state import State
 from src.logging.logger import logger
+from src.Research_Agent.nodes.transcript_memory import compress_transcript, acompress_transcript
 
 MAX_ROUNDS = 2
 
-def moderator_node(state: State) -> dict:
-    """
-    Phase 4: Moderator AI presents the research to the user.
-    """
-    logger.info("Moderator Node Entered")
+def _next_turn(state: State) -> dict:
+    """Decide who speaks next, or whether the gauntlet is complete."""
 
     #Default Value. If the key "personas" does not exist in the dictionary, Python will return this empty list instead of crashing.
     personas = state.get("personas",[])
@@ -33,4 +31,22 @@ def moderator_node(state: State) -> dict:
         "current_speaker_idx":  next_idx,
         "round_number":         completed_rounds + 1,
     }
-    
\ No newline at end of file
+
+
+def moderator_node(state: State) -> dict:
+    """
+    Phase 4: Moderator AI presents the research to the user.
+
+    Also folds old exchanges into the debate summary once the verbatim
+    transcript outgrows its token budget (see transcript_memory.py).
+    """
+    logger.info("Moderator Node Entered")
+
+    return {**_next_turn(state), **compress_transcript(state)}
+
+
+async def amoderator_node(state: State) -> dict:
+    """Async variant of moderator_node — awaits the summariser when compression is due."""
+    logger.info("Moderator Node Entered")
+
+    return {**_next_turn(state), **await acompress_transcript(state)}
@@ -1,5 +1,10 @@
+import asyncio
 import json
-from src.Research_Agent.state.state import State, Persona, PanelOutput
+from typing import Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from src.Research_Agent.state.state import State, Persona, PanelOutput, InterpretedContext
 from src.logging.logger import logger
 from src.Research_Agent.LLMS.groqllm import get_llm
 
@@ -38,23 +43,26 @@ def _first_sentence(text: str) -> str:
     return text[:150].rstrip() + "..."
 
 
-def panel_generator_node(state: State) -> dict:
-    """Phase 3: Generate the adversarial expert panel."""
-    logger.info("Panel Generator Node Entered")
-
-    llm = get_llm(temperature=0.7)
-    structured_llm = llm.with_structured_output(PanelOutput)
-
+def _build_prompt(state: State) -> str:
     ctx = state.get("interpreted_context")
     if ctx is None:
         raise ValueError("panel_generator_node called but interpreted_context is None")
+    return _prompt_for(ctx)
+
 
-    prompt = PANEL_GENERATOR_PROMPT.format(
+def _prompt_for(ctx: InterpretedContext) -> str:
+    return PANEL_GENERATOR_PROMPT.format(
         domain=ctx.domain,
         interpreted_goal=ctx.interpreted_goal,
     )
 
-    panel_output: PanelOutput = structured_llm.invoke(prompt)
+
+def _structured_llm():
+    llm = get_llm(temperature=0.7)
+    return llm.with_structured_output(PanelOutput)
+
+
+def _panel_update(panel_output: PanelOutput) -> dict:
     logger.info(f"Panel generated: {[p.name for p in panel_output.personas]}")
 
     # Build a 'panel_intro' message so the expert lineup appears in chat history
@@ -76,4 +84,115 @@ def panel_generator_node(state: State) -> dict:
         "messages": [
             {"role": "panel_intro", "content": panel_intro_data}
         ],
-    }
\ No newline at end of file
+    }
+
+
+def panel_generator_node(state: State) -> dict:
+    """Phase 3: Generate the adversarial expert panel."""
+    logger.info("Panel Generator Node Entered")
+
+    prompt = _build_prompt(state)
+    panel_output: PanelOutput = _structured_llm().invoke(prompt)
+    return _panel_update(panel_output)
+
+
+async def apanel_generator_node(state: State, config: RunnableConfig) -> dict:
+    """Async variant of panel_generator_node — awaits the LLM instead of blocking a thread.
+    Reuses the panel speculated while the confirmation interrupt was open, if it matches."""
+    logger.info("Panel Generator Node Entered")
+
+    thread_id = config.get("configurable", {}).get("thread_id")
+    panel_output = await _take_speculation(thread_id, state.get("interpreted_context"))
+    if panel_output is None:
+        prompt = _build_prompt(state)
+        panel_output = await _structured_llm().ainvoke(prompt)
+    return _panel_update(panel_output)
+
+
+# ── Speculative panel generation ──────────────────────────────────────────────
+# Most users answer the confirmation interrupt with "yes", after which this node
+# is the first thing on the critical path. While the interrupt is open, the chat
+# router starts the panel call in the background for the current interpretation;
+# a confirmed resume picks the result up, a correction discards it. Speculations
+# are per process — a resume served by another worker simply generates normally.
+#
+# Speculation is optional work outside admission control, so it is bounded on its
+# own: at most MAX_CONCURRENT_SPECULATIONS calls run at once and further ones are
+# skipped, not queued (the router also skips it while admission is saturated).
+# An unclaimed speculation is cancelled and dropped after SPECULATION_TTL_SECONDS,
+# or when its session is deleted.
+
+MAX_SPECULATIONS = 256
+MAX_CONCURRENT_SPECULATIONS = 4
+SPECULATION_TTL_SECONDS = 600
+
+# thread_id -> (fingerprint of the interpreted_context, task producing PanelOutput, expiry timer)
+_speculations: dict[str, tuple[str, asyncio.Task, asyncio.TimerHandle]] = {}
+
+
+def _fingerprint(ctx: InterpretedContext) -> str:
+    return ctx.model_dump_json()
+
+
+def start_panel_speculation(thread_id: str, ctx: Optional[InterpretedContext]) -> None:
+    """Start generating the panel for `ctx` in the background (no-op if already running)."""
+    if ctx is None:
+        return
+    fingerprint = _fingerprint(ctx)
+    existing = _speculations.get(thread_id)
+    if existing and existing[0] == fingerprint:
+        return
+    discard_panel_speculation(thread_id)
+
+    running = sum(1 for _, task, _ in _speculations.values() if not task.done())
+    if running >= MAX_CONCURRENT_SPECULATIONS:
+        logger.info(f"Panel speculation skipped for thread {thread_id} — {running} already running")
+        return
+
+    while len(_speculations) >= MAX_SPECULATIONS:
+        discard_panel_speculation(next(iter(_speculations)))
+
+    task = asyncio.create_task(_structured_llm().ainvoke(_prompt_for(ctx)))
+    # Mark failures as retrieved; _take_speculation falls back to a fresh call.
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    expiry = asyncio.get_running_loop().call_later(SPECULATION_TTL_SECONDS, _expire, thread_id, task)
+    _speculations[thread_id] = (fingerprint, task, expiry)
+    logger.info(f"Panel speculation started for thread: {thread_id}")
+
+
+def _expire(thread_id: str, task: asyncio.Task) -> None:
+    entry = _speculations.get(thread_id)
+    if entry and entry[1] is task:
+        logger.info(f"Panel speculation expired unclaimed for thread: {thread_id}")
+        discard_panel_speculation(thread_id)
+
+
+def discard_panel_speculation(thread_id: Optional[str]) -> None:
+    """Drop (and cancel) any speculative panel for this thread."""
+    entry = _speculations.pop(thread_id, None)
+    if entry:
+        entry[1].cancel()
+        entry[2].cancel()
+        logger.info(f"Panel speculation discarded for thread: {thread_id}")
+
+
+async def _take_speculation(thread_id: Optional[str], ctx: Optional[InterpretedContext]) -> Optional[PanelOutput]:
+    """Return the speculative panel if it was built from this exact context, else None."""
+    entry = _speculations.pop(thread_id, None)
+    if entry is None:
+        return None
+    fingerprint, task, expiry = entry
+    expiry.cancel()
+    if ctx is None:
+        task.cancel()
+        return None
+    if fingerprint != _fingerprint(ctx):
+        task.cancel()
+        return None
+    try:
+        panel_output = await task
+    except Exception as e:
+        logger.warning(f"Panel speculation failed for thread {thread_id}, regenerating: {e}")
+        return None
+    logger.info(f"Panel speculation reused for thread: {thread_id}")
+    return panel_output
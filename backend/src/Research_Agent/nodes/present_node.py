@@ -9,13 +9,7 @@ from langgraph.types import interrupt
 from src.Research_Agent.state.state import State
 
 
-def present_node(state: State) -> dict:
-    """
-    Phase 2 Format the interpreted context and interrupt to get user confirmation.
-    The value passed to interrupt() becomes the payload the API returns to the frontend.
-    After the user replies, LangGraph resumes this node and returns the user's response
-    in `user_response`.
-    """
+def _build_summary(state: State) -> str:
     ctx = state.get("interpreted_context")
     if ctx is None:
         raise ValueError("present_node called but interpreted_context is None")
@@ -23,7 +17,7 @@ def present_node(state: State) -> dict:
     # Build a nice human-readable summary to show the user
     assumptions_text = "\n".join(f"  • {a}" for a in ctx.assumptions) or "  • None"
 
-    summary = (
+    return (
         f"📋 Here's what I understood:\n"
         f"  🔹 Domain:  {ctx.domain}\n"
         f"  🔹 Goal:    {ctx.interpreted_goal}\n"
@@ -32,9 +26,24 @@ def present_node(state: State) -> dict:
         f"❓ Is this correct? Reply 'yes' to proceed, or tell me what to change."
     )
 
+
+def present_node(state: State) -> dict:
+    """
+    Phase 2 Format the interpreted context and interrupt to get user confirmation.
+    The value passed to interrupt() becomes the payload the API returns to the frontend.
+    After the user replies, LangGraph resumes this node and returns the user's response
+    in `user_response`.
+    """
+    summary = _build_summary(state)
+
     # interrupt() pauses the graph here — the payload is sent to the frontend
     user_response: str = interrupt({"summary": summary, "type": "confirmation"})
 
     # When resumed, user_response holds what the user typed
     return {"messages": [{"role": "assistant", "content": summary},
                          {"role": "user",      "content": user_response}]}
+
+
+async def apresent_node(state: State) -> dict:
+    """Async variant of present_node — runs on the event loop instead of an executor thread."""
+    return present_node(state)
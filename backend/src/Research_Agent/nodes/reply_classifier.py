@@ -0,0 +1,249 @@
+"""
+reply_classifier.py
+Local fast path in front of classify_node's LLM call.
+
+Most replies to the confirmation summary are short and unambiguous ("yes",
+"looks good", "start over"). ReplyClassifier resolves those on-box in two stages:
+
+  1. rules  — exact match of the normalized reply against known phrases
+  2. scorer — a small multinomial Naive Bayes over unigrams + bigrams, seeded
+              with built-in examples and retrainable from logged decisions
+
+The scorer may only confirm a reply made entirely of words it has seen, with no
+contrastive or edit word in it: "looks good but add regulation" is a correction
+however confident the confirm words make it. Likewise it may only reject a reply
+made entirely of reject-phrase words: "start over with drones for vineyards"
+carries a new brief, and a local REJECTED would throw it away. Single-letter
+tokens ("y", "k") are only matched by the rules, never scored.
+
+Only replies that neither stage is confident about go to the fast Groq model.
+Every LLM decision is kept (bounded) and logged, so the scorer can be refit
+from real traffic with `refit_from_decisions()`.
+"""
+
+import math
+import re
+import threading
+import time
+from collections import Counter, deque
+from typing import Iterable, Optional
+
+from src.logging.logger import logger
+
+CONFIRMED = "CONFIRMED"
+CORRECTED = "CORRECTED"
+REJECTED  = "REJECTED"
+LABELS = (CONFIRMED, CORRECTED, REJECTED)
+
+CONFIRM_PHRASES = {
+    "yes", "y", "yep", "yeah", "yup", "ya", "sure", "ok", "okay", "k",
+    "correct", "confirmed", "confirm", "exactly", "perfect", "great",
+    "looks good", "look good", "looks great", "looks right", "looks correct",
+    "sounds good", "sounds right", "sounds great", "that is right", "thats right",
+    "that is correct", "thats correct", "right", "spot on", "lgtm",
+    "go ahead", "proceed", "yes proceed", "yes go ahead", "yes please",
+    "yes thats right", "yes thats correct", "yes correct", "yes looks good",
+    "all good", "good to go", "lets go", "continue", "approved",
+}
+
+REJECT_PHRASES = {
+    "start over", "start again", "restart", "reset", "forget it", "forget that",
+    "no forget it", "no start over", "scrap that", "scrap it", "never mind",
+    "nevermind", "thats completely wrong", "that is completely wrong",
+    "completely wrong", "totally wrong", "all wrong", "begin again",
+}
+
+# Seed corpus for the scorer; extended at runtime from LLM-labelled replies.
+SEED_EXAMPLES = (
+    [(p, CONFIRMED) for p in CONFIRM_PHRASES]
+    + [(p, REJECTED) for p in REJECT_PHRASES]
+    + [
+        ("no i meant drones for vineyards not wheat", CORRECTED),
+        ("actually the focus should be on the european market", CORRECTED),
+        ("change the domain to healthcare", CORRECTED),
+        ("not quite it is for small businesses", CORRECTED),
+        ("close but the goal is cost reduction", CORRECTED),
+        ("yes but assume a b2b product", CORRECTED),
+        ("almost please add that we target students", CORRECTED),
+        ("the assumption about budget is wrong it is much lower", CORRECTED),
+        ("i meant mobile apps instead of web", CORRECTED),
+        ("no it should cover regulation too", CORRECTED),
+        ("mostly right but drop the second assumption", CORRECTED),
+        ("rather than farms think greenhouses", CORRECTED),
+        ("yes exactly that", CONFIRMED),
+        ("yes that is what i want", CONFIRMED),
+        ("correct please continue", CONFIRMED),
+        ("yes you got it", CONFIRMED),
+        ("no lets start from scratch", REJECTED),
+        ("none of that is right start over", REJECTED),
+        ("wrong topic entirely forget it", REJECTED),
+    ]
+)
+
+# Every word a reply may contain for the scorer to reject it locally.
+REJECT_WORDS = {
+    word
+    for text, label in SEED_EXAMPLES if label == REJECTED
+    for word in text.split()
+} | {"please", "just", "lets"}
+
+# The scorer only answers for short replies it is very sure about; anything
+# longer is likely to carry a correction and goes to the LLM.
+SCORER_THRESHOLD = 0.95
+SCORER_MAX_TOKENS = 6
+MAX_LOGGED_DECISIONS = 5000
+
+# Words that turn an otherwise confirming reply into a correction — a reply
+# containing any of them is never confirmed by the scorer.
+EDIT_WORDS = {
+    "but", "except", "add", "change", "just", "minus", "instead", "not",
+    "however", "though", "although", "only", "drop", "remove", "replace",
+    "rather", "without", "also", "actually", "use",
+}
+
+_NON_WORD = re.compile(r"[^a-z0-9\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop punctuation/emoji and collapse whitespace."""
+    text = text.lower().replace("'", "").replace("’", "")
+    text = _NON_WORD.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def _features(normalized: str) -> list[str]:
+    tokens = [t for t in normalized.split() if len(t) > 1]
+    return tokens + [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]
+
+
+class ReplyClassifier:
+    """Rule + Naive Bayes classifier for confirmation replies, with per-path counters."""
+
+    def __init__(self, threshold: float = SCORER_THRESHOLD, max_tokens: int = SCORER_MAX_TOKENS):
+        self.threshold = threshold
+        self.max_tokens = max_tokens
+        self._lock = threading.Lock()
+        self._decisions: deque = deque(maxlen=MAX_LOGGED_DECISIONS)
+        self._counters = {
+            path: {"hits": 0, "total_ms": 0.0}
+            for path in ("rule", "scorer", "llm")
+        }
+        self.fit(SEED_EXAMPLES)
+
+    # ── Scorer training ───────────────────────────────────────────────────────
+
+    def fit(self, samples: Iterable[tuple[str, str]]) -> None:
+        """(Re)train the Naive Bayes scorer from (reply, label) pairs."""
+        doc_counts = Counter()
+        feature_counts = {label: Counter() for label in LABELS}
+        for text, label in samples:
+            if label not in LABELS:
+                continue
+            doc_counts[label] += 1
+            feature_counts[label].update(_features(normalize(text)))
+
+        vocab = set().union(*feature_counts.values())
+        self._vocab = vocab
+        total_docs = sum(doc_counts.values()) or 1
+        self._log_prior = {
+            label: math.log((doc_counts[label] + 1) / (total_docs + len(LABELS))) for label in LABELS
+        }
+        self._log_likelihood = {}
+        self._log_unseen = {}
+        for label in LABELS:
+            denom = sum(feature_counts[label].values()) + len(vocab) + 1
+            self._log_likelihood[label] = {
+                f: math.log((c + 1) / denom) for f, c in feature_counts[label].items()
+            }
+            self._log_unseen[label] = math.log(1 / denom)
+
+    def refit_from_decisions(self) -> int:
+        """Retrain on the seed corpus plus every LLM-labelled reply seen so far."""
+        with self._lock:
+            logged = list(self._decisions)
+        self.fit(list(SEED_EXAMPLES) + logged)
+        logger.info(f"Reply classifier refit with {len(logged)} logged decisions")
+        return len(logged)
+
+    def score(self, normalized: str) -> tuple[str, float]:
+        """Return the most likely label and its posterior probability."""
+        feats = _features(normalized)
+        log_probs = {
+            label: self._log_prior[label] + sum(
+                self._log_likelihood[label].get(f, self._log_unseen[label]) for f in feats
+            )
+            for label in LABELS
+        }
+        best = max(log_probs, key=log_probs.get)
+        peak = log_probs[best]
+        total = sum(math.exp(lp - peak) for lp in log_probs.values())
+        return best, 1.0 / total
+
+    # ── Classification ────────────────────────────────────────────────────────
+
+    def classify(self, reply: str) -> Optional[str]:
+        """Return a label when the local stages are confident, else None (ask the LLM)."""
+        started = time.perf_counter()
+        normalized = normalize(reply)
+
+        label, path = None, None
+        if normalized in CONFIRM_PHRASES:
+            label, path = CONFIRMED, "rule"
+        elif normalized in REJECT_PHRASES:
+            label, path = REJECTED, "rule"
+        elif normalized and len(normalized.split()) <= self.max_tokens:
+            guess, prob = self.score(normalized)
+            if prob >= self.threshold and self._safe(guess, normalized):
+                label, path = guess, "scorer"
+
+        if path:
+            self._record(path, started)
+            logger.info(f"classify decision: path={path} label={label} reply={normalized!r}")
+        return label
+
+    def _safe(self, guess: str, normalized: str) -> bool:
+        """Whether a confident scorer label may stand. A confirmation needs a fully
+        known reply with no edit words in it; a rejection may not carry any word
+        beyond the reject phrases (it would be discarded with the interpretation)."""
+        tokens = normalized.split()
+        if guess == CONFIRMED:
+            feats = _features(normalized)
+            return (bool(feats) and all(f in self._vocab for f in feats)
+                    and not EDIT_WORDS.intersection(tokens))
+        if guess == REJECTED:
+            return REJECT_WORDS.issuperset(tokens)
+        return True
+
+    def record_llm(self, reply: str, classification: str, started: float) -> None:
+        """Count an LLM fallback and keep its label as future training data."""
+        self._record("llm", started)
+        label = next((l for l in LABELS if l in classification), CORRECTED)
+        with self._lock:
+            self._decisions.append((reply, label))
+        logger.info(f"classify decision: path=llm label={label} reply={normalize(reply)!r}")
+
+    def _record(self, path: str, started: float) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._counters[path]["hits"] += 1
+            self._counters[path]["total_ms"] += elapsed_ms
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = {path: dict(c) for path, c in self._counters.items()}
+            logged = len(self._decisions)
+        total = sum(c["hits"] for c in counters.values())
+        for c in counters.values():
+            c["hit_rate"] = c["hits"] / total if total else 0.0
+            c["avg_ms"] = c["total_ms"] / c["hits"] if c["hits"] else 0.0
+        return {
+            "total": total,
+            "llm_calls_saved": total - counters["llm"]["hits"],
+            "logged_decisions": logged,
+            "paths": counters,
+        }
+
+
+# Process-wide instance shared by both classify_node variants.
+reply_classifier = ReplyClassifier()
@@ -56,16 +56,13 @@ def research_node(state: State) -> dict:
 
     thread = state.get("research_thread", [])
 
-    llm = get_llm(temperature=0.7)
-
-    # Bind Tavily if available
+    # Bind Tavily if available — the registry caches the bound client, so
+    # re-entries after a ToolNode step reuse it instead of re-binding.
     try:
         from src.Research_Agent.tools.search_tool import search_tool
-        tools          = search_tool()
-        llm_with_tools = llm.bind_tools(tools)
-        logger.info("Tavily bound to research LLM")
+        llm_with_tools = get_llm(temperature=0.7, tools=search_tool())
     except Exception:
-        llm_with_tools = llm
+        llm_with_tools = get_llm(temperature=0.7)
         logger.info("Tavily unavailable — research proceeds without web search")
 
     if not thread:
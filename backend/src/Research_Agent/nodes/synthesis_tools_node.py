@@ -0,0 +1,177 @@
+"""
+synthesis_tools_node.py
+Executes the tool calls blue_team_node makes during synthesis.
+
+Replaces the stock ToolNode in the synthesis loop so a step with several
+tool_calls runs them side by side under:
+  - a concurrency cap   (TOOL_MAX_CONCURRENCY) — at most N searches in flight,
+  - a per-call timeout  (TOOL_CALL_TIMEOUT_SECONDS) — a slow search yields an
+                          error ToolMessage instead of stalling the step.
+
+A failing or timed-out call becomes a ToolMessage with status="error", so the
+LLM sees what went wrong and the run carries on. Every call is timed into
+TOOL_SECONDS; the step's wall-clock and the sum of its per-call durations (what a
+serial loop would have taken) go to TOOL_STEP_SECONDS and the log. Timings are
+kept out of the graph state so they never grow the checkpoints.
+"""
+
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from langchain_core.messages import ToolMessage
+
+from src.config import TOOL_CALL_TIMEOUT_SECONDS, TOOL_MAX_CONCURRENCY
+from src.metrics import TOOL_SECONDS, TOOL_STEP_SECONDS
+from src.tracing import tracer
+from src.Research_Agent.state.state import State
+from src.logging.logger import logger
+
+
+_POLL_SECONDS = 0.05   # how often the sync runner checks for timed-out calls
+
+
+def _tools_by_name() -> dict:
+    try:
+        from src.Research_Agent.tools.search_tool import search_tool
+        return {tool.name: tool for tool in search_tool()}
+    except Exception:
+        return {}
+
+
+def _pending_calls(state: State) -> list[dict]:
+    thread = state.get("synthesis_thread", [])
+    last   = thread[-1] if thread else None
+    return list(getattr(last, "tool_calls", None) or [])
+
+
+def _error_message(call: dict, error: str) -> ToolMessage:
+    return ToolMessage(
+        content      = f"Error: {error}\n Please fix your mistakes.",
+        name         = call["name"],
+        tool_call_id = call["id"],
+        status       = "error",
+    )
+
+
+def _as_message(call: dict, result) -> ToolMessage:
+    # Invoking a tool with a full tool call returns a ToolMessage already; the
+    # fallback covers tools that return raw output regardless.
+    if isinstance(result, ToolMessage):
+        return result
+    return ToolMessage(content=str(result), name=call["name"], tool_call_id=call["id"])
+
+
+def _timing(call: dict, message: ToolMessage, seconds: float) -> dict:
+    TOOL_SECONDS.observe(seconds, tool=call["name"], status=message.status)
+    tracer.record(call["name"], "tool", seconds, status=message.status)
+    return {"status": message.status, "seconds": seconds}
+
+
+def _update(calls: list, messages: dict, timings: dict, wall: float) -> dict:
+    """Build the state update, keeping ToolMessages in tool_call order."""
+    ordered = [timings[call["id"]] for call in calls]
+    serial  = sum(entry["seconds"] for entry in ordered)
+    errors  = sum(entry["status"] == "error" for entry in ordered)
+    TOOL_STEP_SECONDS.observe(wall, measure="wall")
+    TOOL_STEP_SECONDS.observe(serial, measure="serial")
+    logger.info(
+        f"Synthesis tools: {len(calls)} call(s), {errors} error(s) — "
+        f"{wall:.2f}s wall vs {serial:.2f}s serial"
+    )
+    return {"synthesis_thread": [messages[call["id"]] for call in calls]}
+
+
+def synthesis_tools_node(state: State) -> dict:
+    """Run the pending tool calls on a bounded thread pool."""
+    logger.info("Synthesis Tools Node Entered")
+
+    calls    = _pending_calls(state)
+    tools    = _tools_by_name()
+    messages = {}
+    timings  = {}
+    started  = {}
+    batch_start = time.perf_counter()
+
+    def run(call):
+        started[call["id"]] = time.perf_counter()
+        return tools[call["name"]].invoke({**call, "type": "tool_call"})
+
+    def finish(call, message):
+        messages[call["id"]] = message
+        timings[call["id"]]  = _timing(call, message, time.perf_counter() - started.get(call["id"], batch_start))
+
+    runnable = []
+    for call in calls:
+        if call["name"] in tools:
+            runnable.append(call)
+        else:
+            finish(call, _error_message(call, f"{call['name']} is not a valid tool."))
+
+    if runnable:
+        pool    = ThreadPoolExecutor(max_workers=min(TOOL_MAX_CONCURRENCY, len(runnable)))
+        futures = {pool.submit(run, call): call for call in runnable}
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    call = futures[future]
+                    try:
+                        finish(call, _as_message(call, future.result()))
+                    except Exception as e:
+                        logger.warning(f"Tool call {call['name']} failed: {e!r}")
+                        finish(call, _error_message(call, repr(e)))
+
+                # A call's timeout starts when a worker picks it up, not when queued.
+                now = time.perf_counter()
+                for future in list(pending):
+                    call  = futures[future]
+                    begun = started.get(call["id"])
+                    if begun is not None and now - begun > TOOL_CALL_TIMEOUT_SECONDS:
+                        pending.discard(future)
+                        logger.warning(f"Tool call {call['name']} timed out after {TOOL_CALL_TIMEOUT_SECONDS}s")
+                        finish(call, _error_message(call, f"timed out after {TOOL_CALL_TIMEOUT_SECONDS}s"))
+        finally:
+            # Abandon stragglers — their threads finish in the background.
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    return _update(calls, messages, timings, time.perf_counter() - batch_start)
+
+
+async def asynthesis_tools_node(state: State) -> dict:
+    """Async variant — gathers the pending tool calls under a semaphore."""
+    logger.info("Synthesis Tools Node Entered")
+
+    calls     = _pending_calls(state)
+    tools     = _tools_by_name()
+    messages  = {}
+    timings   = {}
+    semaphore = asyncio.Semaphore(TOOL_MAX_CONCURRENCY)
+    batch_start = time.perf_counter()
+
+    async def run(call):
+        tool = tools.get(call["name"])
+        if tool is None:
+            message, seconds = _error_message(call, f"{call['name']} is not a valid tool."), 0.0
+        else:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    result  = await asyncio.wait_for(
+                        tool.ainvoke({**call, "type": "tool_call"}),
+                        timeout=TOOL_CALL_TIMEOUT_SECONDS,
+                    )
+                    message = _as_message(call, result)
+                except asyncio.TimeoutError:
+                    logger.warning(f"Tool call {call['name']} timed out after {TOOL_CALL_TIMEOUT_SECONDS}s")
+                    message = _error_message(call, f"timed out after {TOOL_CALL_TIMEOUT_SECONDS}s")
+                except Exception as e:
+                    logger.warning(f"Tool call {call['name']} failed: {e!r}")
+                    message = _error_message(call, repr(e))
+                seconds = time.perf_counter() - start
+        messages[call["id"]] = message
+        timings[call["id"]]  = _timing(call, message, seconds)
+
+    await asyncio.gather(*(run(call) for call in calls))
+    return _update(calls, messages, timings, time.perf_counter() - batch_start)
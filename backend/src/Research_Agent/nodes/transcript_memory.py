@@ -0,0 +1,114 @@
+"""
+transcript_memory.py
+Rolling compression of the expert debate transcript.
+
+expert_node and blue_team_node both put the debate into their prompts. Pasting
+every exchange verbatim makes the prompt grow with rounds × experts, so the
+transcript is kept in two parts instead:
+
+  - debate_summary   — an incrementally maintained summary of the oldest exchanges,
+  - recent exchanges — expert_critique[summarized_count:], kept verbatim.
+
+After each exchange, moderator_node calls compress_transcript(). If the verbatim
+tail exceeds TRANSCRIPT_TOKEN_BUDGET, the oldest exchanges are folded into the
+summary with one LLM call until the tail is back under half the budget (always
+leaving at least TRANSCRIPT_KEEP_RECENT verbatim).
+The result is written to state, so each exchange is summarised once, not on
+every turn.
+"""
+
+from src.config import TRANSCRIPT_KEEP_RECENT, TRANSCRIPT_TOKEN_BUDGET
+from src.Research_Agent.state.state import State
+from src.Research_Agent.LLMS.groqllm import get_llm
+from src.logging.logger import logger
+
+
+SUMMARY_PROMPT = """
+You maintain the running minutes of an adversarial expert panel reviewing a research proposal.
+
+=== MINUTES SO FAR ===
+{summary}
+
+=== NEW EXCHANGES TO FOLD IN ===
+{exchanges}
+
+=== YOUR TASK ===
+Rewrite the minutes so they cover both the existing minutes and the new exchanges.
+For every expert, keep: their name and role, each concern they raised, and how the
+researcher answered it (or that the answer was weak or missing).
+Drop pleasantries and repetition. Use one short bullet per concern. Output the minutes only.
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) — good enough for budgeting."""
+    return len(text) // 4 + 1
+
+
+def format_exchange(entry: dict) -> str:
+    return f"[{entry['persona']}]: {entry['critique']}\nResearcher: {entry['response']}"
+
+
+def transcript_view(state: State) -> tuple[str | None, list[dict]]:
+    """Return (summary of older exchanges or None, exchanges still kept verbatim)."""
+    critiques = state.get("expert_critique", [])
+    return state.get("debate_summary"), critiques[state.get("summarized_count", 0) or 0:]
+
+
+def _tail_tokens(entries: list[dict]) -> int:
+    return estimate_tokens("\n\n".join(format_exchange(e) for e in entries))
+
+
+def _plan_fold(state: State) -> list[dict]:
+    """Oldest verbatim exchanges to fold once the tail goes over the token budget.
+
+    Folding stops at half the budget rather than just under it, so the
+    summariser runs every few exchanges instead of after every one.
+    """
+    _, recent = transcript_view(state)
+    if _tail_tokens(recent) <= TRANSCRIPT_TOKEN_BUDGET:
+        return []
+    fold = 0
+    while len(recent) - fold > TRANSCRIPT_KEEP_RECENT and _tail_tokens(recent[fold:]) > TRANSCRIPT_TOKEN_BUDGET // 2:
+        fold += 1
+    return recent[:fold]
+
+
+def _summary_prompt(state: State, entries: list[dict]) -> str:
+    return SUMMARY_PROMPT.format(
+        summary   = state.get("debate_summary") or "None yet.",
+        exchanges = "\n\n".join(format_exchange(e) for e in entries),
+    )
+
+
+def _update(state: State, entries: list[dict], summary: str) -> dict:
+    summarized = (state.get("summarized_count", 0) or 0) + len(entries)
+    logger.info(f"Debate transcript compressed — {summarized} exchange(s) summarised")
+    return {"debate_summary": summary, "summarized_count": summarized}
+
+
+def compress_transcript(state: State) -> dict:
+    """Fold old exchanges into debate_summary if the verbatim tail is over budget."""
+    entries = _plan_fold(state)
+    if not entries:
+        return {}
+    try:
+        response = get_llm(temperature=0.0, use_fast_model=True, cache=True).invoke(_summary_prompt(state, entries))
+    except Exception as e:
+        # Compression is an optimisation — on failure the transcript stays verbatim.
+        logger.warning(f"Transcript compression failed, keeping exchanges verbatim: {e}")
+        return {}
+    return _update(state, entries, response.content)
+
+
+async def acompress_transcript(state: State) -> dict:
+    """Async variant of compress_transcript."""
+    entries = _plan_fold(state)
+    if not entries:
+        return {}
+    try:
+        response = await get_llm(temperature=0.0, use_fast_model=True, cache=True).ainvoke(_summary_prompt(state, entries))
+    except Exception as e:
+        logger.warning(f"Transcript compression failed, keeping exchanges verbatim: {e}")
+        return {}
+    return _update(state, entries, response.content)
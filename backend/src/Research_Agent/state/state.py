@@ -4,7 +4,7 @@ Central state definition for the Research Agent graph.
 All nodes read from and write to this TypedDict.
 
 messages         — plain dict list for the UI chat log.
-synthesis_thread — LangChain Message objects used by blue_team_node + its ToolNode.
+synthesis_thread — LangChain Message objects used by blue_team_node + synthesis_tools.
                     Kept separate so ToolMessages (internal search results) never
                     appear in the user-facing chat log.
 """
@@ -57,13 +57,15 @@ class State(TypedDict):
     current_speaker_idx: int
     round_number:        int
     expert_critique:     Annotated[List[dict], operator.add]
+    debate_summary:      Optional[str]   # rolling summary of expert_critique[:summarized_count]
+    summarized_count:    int
     is_gauntlet_complete: bool
     final_report:        Optional[str]
 
 
-    # ── Internal LLM conversation thread for blue_team_node's ToolNode ──
+    # ── Internal LLM conversation thread for blue_team_node's tool loop ──
     # Holds proper LangChain Message objects (HumanMessage, AIMessage, ToolMessage).
-    # ToolNode writes tool results here; blue_team_node reads them on re-entry.
+    # synthesis_tools writes tool results here; blue_team_node reads them on re-entry.
     # Kept separate so tool call machinery never appears in the UI chat log.
     synthesis_thread:    Annotated[list, add_messages]
 
@@ -0,0 +1,86 @@
+"""
+bench_async_nodes.py
+Benchmark: how many gauntlet turns one worker can hold in flight with sync vs async nodes.
+
+Run from the backend/ directory:
+    uv run python -m src.Research_Agent.testing.bench_async_nodes [--latency 0.5] [--users 16 64 256]
+
+Each simulated user runs one full opening turn against its own thread:
+    start  → analyze → present (interrupt)
+    resume → classify → panel_generator → moderator → expert (interrupt)
+
+Every LLM call is served by FakeChatModel with a fixed delay, so the numbers
+show scheduling capacity only. With sync nodes, each call holds one thread of
+the event loop's default executor; with async nodes the calls just await.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Command
+
+from src.Research_Agent.graph.graph_builder import GraphBuilder
+from src.Research_Agent.LLMS import groqllm  # noqa: F401 — registers the real "groq" provider first
+from src.Research_Agent.LLMS.registry import llm_registry
+from src.Research_Agent.testing.fakes import FakeChatModel
+
+
+def _install_fake(model: FakeChatModel) -> None:
+    """Serve every get_llm() call from the shared fake model."""
+    llm_registry.register_provider("groq", lambda *args: model)
+
+
+async def _one_turn(graph) -> None:
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    initial_state = {
+        "raw_input": "Autonomous crop-spraying drones",
+        "messages":  [{"role": "user", "content": "Autonomous crop-spraying drones"}],
+    }
+    async for _ in graph.astream(initial_state, config):
+        pass
+    async for _ in graph.astream(Command(resume="yes"), config):
+        pass
+
+
+async def _run(async_nodes: bool, users: int, model: FakeChatModel) -> dict:
+    graph = GraphBuilder(checkpointer=MemorySaver(), async_nodes=async_nodes).build()
+    model.reset_counters()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_one_turn(graph) for _ in range(users)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "mode":     "async" if async_nodes else "sync",
+        "users":    users,
+        "wall_s":   elapsed,
+        "peak":     model.peak_in_flight,
+        "llm_calls": model.calls,
+        "turns_s":  users / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.5, help="fake LLM latency in seconds")
+    parser.add_argument("--users", type=int, nargs="+", default=[16, 64, 256])
+    args = parser.parse_args()
+
+    model = FakeChatModel(latency=args.latency)
+    _install_fake(model)
+
+    print(f"\nFake LLM latency: {args.latency:.2f}s — 4 LLM calls per turn "
+          f"(ideal wall-clock ≈ {4 * args.latency:.2f}s)\n")
+    print(f"{'mode':<6} {'users':>6} {'wall (s)':>9} {'turns/s':>8} {'peak in-flight LLM':>19}")
+    print("─" * 52)
+    for users in args.users:
+        for async_nodes in (False, True):
+            r = asyncio.run(_run(async_nodes, users, model))
+            print(f"{r['mode']:<6} {r['users']:>6} {r['wall_s']:>9.2f} {r['turns_s']:>8.1f} {r['peak']:>19}")
+
+
+if __name__ == "__main__":
+    main()
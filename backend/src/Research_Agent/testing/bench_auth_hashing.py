@@ -0,0 +1,115 @@
+"""
+bench_auth_hashing.py
+Benchmark: login throughput and chat-endpoint latency during a login storm.
+
+Run from the backend/ directory:
+    uv run python -m src.Research_Agent.testing.bench_auth_hashing [--logins 40] [--concurrency 20]
+
+A small ASGI app is driven in-process through httpx:
+    POST /login/inline  — verify_password() called on the event loop (the old /auth/login)
+    POST /login/pooled  — averify_password(), i.e. on the password hashing pool
+    GET  /chat/probe    — a trivial async endpoint standing in for any chat request
+
+For each mode, `--logins` logins are fired with `--concurrency` in flight while a
+probe loop hits /chat/probe every 10 ms. Reported: logins/s, 503 rejections, and
+probe p50 / p99 latency. Probe latency is what every other user on the
+worker feels while the storm is running.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from src.auth import averify_password, get_password_hash, verify_password
+from src.password_pool import password_pool
+
+PASSWORD = "correct horse battery staple"
+
+
+def _build_app(stored_hash: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login/inline")
+    async def login_inline():
+        if not verify_password(PASSWORD, stored_hash):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.post("/login/pooled")
+    async def login_pooled():
+        if not await averify_password(PASSWORD, stored_hash):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.get("/chat/probe")
+    async def probe():
+        return {"ok": True}
+
+    return app
+
+
+async def _storm(client: httpx.AsyncClient, path: str, logins: int, concurrency: int) -> dict:
+    probe_latencies: list[float] = []
+    statuses: list[int] = []
+    stop = asyncio.Event()
+    gate = asyncio.Semaphore(concurrency)
+
+    async def probe_loop():
+        # Latency is measured from when the probe was due to fire, so time spent
+        # waiting for a blocked event loop counts — as it would for a real request.
+        while not stop.is_set():
+            due = time.perf_counter() + 0.01
+            await asyncio.sleep(0.01)
+            await client.get("/chat/probe")
+            probe_latencies.append(time.perf_counter() - due)
+
+    async def one_login():
+        async with gate:
+            statuses.append((await client.post(path)).status_code)
+
+    prober = asyncio.create_task(probe_loop())
+    await asyncio.sleep(0.05)   # let the prober take a baseline sample
+    started = time.perf_counter()
+    await asyncio.gather(*(one_login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await prober
+
+    ordered = sorted(probe_latencies)
+    return {
+        "logins_s": statuses.count(200) / elapsed,
+        "rejected": statuses.count(503),
+        "p50_ms":   1000 * statistics.median(ordered),
+        "p99_ms":   1000 * ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))],
+        "probes":   len(ordered),
+    }
+
+
+async def _main(logins: int, concurrency: int) -> None:
+    stored_hash = get_password_hash(PASSWORD)
+    transport = httpx.ASGITransport(app=_build_app(stored_hash))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"\n{logins} logins, {concurrency} in flight — pool: {password_pool.workers} workers, "
+              f"queue {password_pool.queue_size}\n")
+        print(f"{'mode':<8} {'logins/s':>9} {'503s':>5} {'probe p50 (ms)':>15} {'probe p99 (ms)':>15} {'probes':>7}")
+        print("─" * 64)
+        for mode in ("inline", "pooled"):
+            r = await _storm(client, f"/login/{mode}", logins, concurrency)
+            print(f"{mode:<8} {r['logins_s']:>9.1f} {r['rejected']:>5} {r['p50_ms']:>15.1f} "
+                  f"{r['p99_ms']:>15.1f} {r['probes']:>7}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(_main(args.logins, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
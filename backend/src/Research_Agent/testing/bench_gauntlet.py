@@ -0,0 +1,191 @@
+"""
+bench_gauntlet.py
+Benchmark: complete gauntlets end to end, offline, with no human in the loop.
+
+Run from the backend/ directory:
+    uv run python -m src.Research_Agent.testing.bench_gauntlet [--runs 3] [--latency 0.2]
+        [--output-tokens 250] [--tool-calls 3] [--tool-latency 0.3] [--sync]
+
+Every get_llm() call is served by FakeChatModel and the web search tool is
+replaced by FakeSearchTool, so nothing touches the network. The graph is built
+with GraphBuilder(checkpointer=MeasuringMemorySaver()). Each run plays one
+gauntlet, and auto_respond() answers every interrupt:
+    analyze → present ⏸ → classify → panel_generator → (moderator → expert ⏸) × rounds
+    → moderator → blue_team ⇄ synthesis_tools → END
+
+Every segment runs under a trace with an in-memory sink. Node, LLM and tool
+spans then give, per phase (intake / panel / debate / synthesis):
+  wall      first node start → last node end, including checkpointing between nodes
+  model     time inside LLM calls
+  tool      time inside search calls
+  overhead  node time minus the model and tool time inside it — prompt building,
+            state handling and the node wrappers themselves
+plus a per-node overhead table and the checkpoint bytes written per gauntlet.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections import defaultdict
+
+from langgraph.types import Command
+
+from src.Research_Agent.graph.graph_builder import GraphBuilder
+from src.Research_Agent.LLMS import groqllm  # noqa: F401 — registers the real "groq" provider first
+from src.Research_Agent.LLMS.registry import llm_registry
+from src.Research_Agent.testing.fakes import FakeChatModel, FakeSearchTool, MeasuringMemorySaver, auto_respond
+from src.Research_Agent.tools.search_tool import install_search_tools
+from src.tracing import MemorySink, tracer
+
+PHASES = {
+    "analyze": "intake", "present": "intake", "classify": "intake",
+    "panel_generator": "panel",
+    "moderator": "debate", "expert": "debate",
+    "blue_team": "synthesis", "synthesis_tools": "synthesis",
+}
+PHASE_ORDER = ("intake", "panel", "debate", "synthesis")
+
+
+def _consume(graph, graph_input, config: dict) -> None:
+    for _ in graph.stream(graph_input, config):
+        pass
+
+
+async def _drive(graph, graph_input, config: dict, sync: bool) -> None:
+    if sync:
+        await asyncio.to_thread(_consume, graph, graph_input, config)
+    else:
+        async for _ in graph.astream(graph_input, config):
+            pass
+
+
+async def _play(graph, sync: bool) -> tuple[int, float]:
+    """One full gauntlet; returns (segments, wall seconds)."""
+    thread_id = str(uuid.uuid4())
+    config = {"configurable": {"thread_id": thread_id}}
+    graph_input = {
+        "raw_input":    "Autonomous crop-spraying drones for mid-size farms",
+        "messages":     [{"role": "user", "content": "Autonomous crop-spraying drones for mid-size farms"}],
+    }
+    segments = 0
+    started = time.perf_counter()
+    while True:
+        with tracer.root("segment", "bench", thread_id=thread_id):
+            await _drive(graph, graph_input, config, sync)
+        segments += 1
+        state = graph.get_state(config)
+        if not state.next:
+            return segments, time.perf_counter() - started
+        interrupt_value = state.tasks[0].interrupts[0].value
+        graph_input = Command(resume=auto_respond(interrupt_value))
+
+
+def _analyse(spans: list[dict]) -> tuple[dict, dict]:
+    """Per-phase and per-node totals from the recorded spans."""
+    children = defaultdict(list)
+    for s in spans:
+        children[s["parent_id"]].append(s)
+
+    def inside(span: dict, kind: str) -> float:
+        """Milliseconds during which at least one child of this kind was running —
+        concurrent searches overlap, so their durations must not simply be summed."""
+        intervals = sorted((c["ts"], c["ts"] + c["duration_ms"] / 1000)
+                           for c in children[span["span_id"]] if c["kind"] == kind)
+        busy, end = 0.0, float("-inf")
+        for start, stop in intervals:
+            if stop > end:
+                busy += stop - max(start, end)
+                end = stop
+        return 1000 * busy
+
+    phases = {p: defaultdict(float) for p in PHASE_ORDER}
+    nodes = defaultdict(lambda: defaultdict(float))
+    windows = defaultdict(lambda: [float("inf"), 0.0])   # (trace, phase) → [first start, last end]
+    for s in spans:
+        if s["kind"] != "node":
+            continue
+        phase = PHASES.get(s["name"])
+        if phase is None:
+            continue
+        model, tool = inside(s, "llm"), inside(s, "tool")
+        overhead = s["duration_ms"] - model - tool
+        for bucket in (phases[phase], nodes[s["name"]]):
+            bucket["model"] += model
+            bucket["tool"] += tool
+            bucket["overhead"] += overhead
+        nodes[s["name"]]["calls"] += 1
+        nodes[s["name"]]["total"] += s["duration_ms"]
+        window = windows[(s["trace_id"], phase)]
+        window[0] = min(window[0], s["ts"])
+        window[1] = max(window[1], s["ts"] + s["duration_ms"] / 1000)
+    for (_, phase), (first, last) in windows.items():
+        phases[phase]["wall"] += 1000 * (last - first)
+    return phases, nodes
+
+
+async def _main(args) -> None:
+    model = FakeChatModel(latency=args.latency, output_tokens=args.output_tokens, tool_calls=args.tool_calls)
+    search = FakeSearchTool(latency=args.tool_latency)
+    llm_registry.register_provider("groq", lambda *a: model)
+    install_search_tools([search])
+
+    sink = MemorySink()
+    tracer.sink = sink
+    saver = MeasuringMemorySaver()
+    graph = GraphBuilder(checkpointer=saver, async_nodes=not args.sync).build()
+
+    await _play(graph, args.sync)   # warm-up: imports, client construction, first compiles
+    sink.spans.clear()
+    model.reset_counters()
+    saver.reset_counters()
+    search.calls = 0
+
+    walls, segments = [], 0
+    for _ in range(args.runs):
+        n, wall = await _play(graph, args.sync)
+        walls.append(wall)
+        segments += n
+    phases, nodes = _analyse(sink.spans)
+    runs = args.runs
+
+    print(f"\n{runs} gauntlet(s), {'sync' if args.sync else 'async'} nodes — LLM latency {args.latency}s, "
+          f"{args.tool_calls} search call(s) at {args.tool_latency}s")
+    print(f"wall per gauntlet: median {statistics.median(walls):.2f}s  ({segments // runs} segments)\n")
+
+    print(f"{'phase':<10} {'wall (ms)':>10} {'model (ms)':>11} {'tool (ms)':>10} {'overhead (ms)':>14}")
+    print("─" * 60)
+    for phase in PHASE_ORDER:
+        p = phases[phase]
+        print(f"{phase:<10} {p['wall'] / runs:>10.1f} {p['model'] / runs:>11.1f} "
+              f"{p['tool'] / runs:>10.1f} {p['overhead'] / runs:>14.2f}")
+
+    print(f"\n{'node':<16} {'calls':>6} {'mean (ms)':>10} {'model (ms)':>11} {'overhead (ms)':>14}")
+    print("─" * 62)
+    for name in PHASES:
+        n = nodes.get(name)
+        if not n:
+            continue
+        calls = n["calls"]
+        print(f"{name:<16} {calls / runs:>6.0f} {n['total'] / calls:>10.1f} "
+              f"{n['model'] / calls:>11.1f} {n['overhead'] / calls:>14.3f}")
+
+    print(f"\nper gauntlet: {saver.bytes_written / runs / 1024:.1f} KiB checkpointed, "
+          f"{model.calls / runs:.0f} LLM calls, {model.prompt_tokens / runs:.0f} prompt + "
+          f"{model.completion_tokens / runs:.0f} completion tokens, {search.calls / runs:.0f} searches")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per fake LLM call")
+    parser.add_argument("--output-tokens", type=int, default=250, help="length of free-text answers")
+    parser.add_argument("--tool-calls", type=int, default=3, help="searches the synthesis step requests")
+    parser.add_argument("--tool-latency", type=float, default=0.3, help="seconds per fake search")
+    parser.add_argument("--sync", action="store_true", help="use the sync node variants")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
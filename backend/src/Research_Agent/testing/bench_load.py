@@ -0,0 +1,183 @@
+"""
+bench_load.py
+Load test: N concurrent users drive the real FastAPI app in-process.
+
+Run from the backend/ directory:
+    uv run python -m src.Research_Agent.testing.bench_load [--users 20] [--gauntlets 1]
+        [--latency 0.2] [--tool-latency 0.3] [--real-mongo]
+
+The requests go straight into `app` through httpx's ASGITransport. That means
+the full middleware stack, the lifespan (indexes, checkpointer, job manager),
+admission control, the routers, the session store and the checkpointer all run
+as in production. The network and the outside services are left out:
+  LLM      FakeChatModel serves every get_llm() call (--latency seconds each)
+  search   FakeSearchTool replaces Tavily (--tool-latency seconds each)
+  MongoDB  an in-memory mongomock-motor client (a dev dependency);
+           with --real-mongo the app connects to MONGODB_URI instead, e.g. the
+           docker-compose mongod. It writes into the research_agent database.
+
+Each simulated user:
+    POST /auth/register → POST /auth/login
+    then per gauntlet:
+        POST /chat/start → GET history  → (POST /chat/resume → GET history) × interrupts
+        → GET /sessions
+History is read incrementally with after_seq, the way the UI polls it.
+
+The report gives latency percentiles and throughput per endpoint, the status
+codes seen (429s from admission control are retried after Retry-After), and the
+event-loop lag: how late a 10 ms sleep wakes up while the load is running.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections import Counter, defaultdict
+
+import httpx
+
+from src.Research_Agent.LLMS import groqllm  # noqa: F401 — registers the real "groq" provider first
+from src.Research_Agent.LLMS.registry import llm_registry
+from src.Research_Agent.testing.fakes import FakeChatModel, FakeSearchTool, auto_respond, install_mongo_stand_in
+from src.Research_Agent.tools.search_tool import install_search_tools
+
+LAG_INTERVAL = 0.01     # seconds between event-loop lag probes
+MAX_RETRY_AFTER = 2.0   # cap on the Retry-After the simulated users honour
+QUERY = "Autonomous crop-spraying drones for mid-size farms"
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class LoadStats:
+    """Per-endpoint latencies and status codes."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    async def call(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """One request, retried on 429; every attempt is recorded under `label`."""
+        while True:
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            self.latencies[label].append(time.perf_counter() - started)
+            self.statuses[label][response.status_code] += 1
+            if response.status_code != 429:
+                return response
+            await asyncio.sleep(min(float(response.headers.get("Retry-After", 1)), MAX_RETRY_AFTER))
+
+
+async def _read_history(client, stats: LoadStats, headers: dict, thread_id: str, after_seq: int) -> int:
+    r = await stats.call(client, "GET /chat/{thread_id}/history", "GET",
+                         f"/chat/{thread_id}/history", params={"after_seq": after_seq}, headers=headers)
+    return r.json()["last_seq"] if r.status_code == 200 else after_seq
+
+
+async def _user(client: httpx.AsyncClient, stats: LoadStats, gauntlets: int) -> int:
+    """One simulated user; returns the number of turns played."""
+    creds = {"email": f"load-{uuid.uuid4().hex[:12]}@example.com", "password": "correct horse battery"}
+    r = await stats.call(client, "POST /auth/register", "POST", "/auth/register", json=creds)
+    r.raise_for_status()
+    r = await stats.call(client, "POST /auth/login", "POST", "/auth/login", json=creds)
+    r.raise_for_status()
+    headers = {"Authorization": f"Bearer {r.json()['idToken']}"}
+
+    turns = 0
+    for _ in range(gauntlets):
+        r = await stats.call(client, "POST /chat/start", "POST", "/chat/start", json={"query": QUERY}, headers=headers)
+        r.raise_for_status()
+        body = r.json()
+        thread_id = body["thread_id"]
+        turns += 1
+        seq = await _read_history(client, stats, headers, thread_id, -1)
+        while body["status"] == "waiting":
+            reply = auto_respond({"type": body["interrupt_type"]})
+            r = await stats.call(client, "POST /chat/resume", "POST", "/chat/resume",
+                                 json={"thread_id": thread_id, "user_response": reply}, headers=headers)
+            r.raise_for_status()
+            body = r.json()
+            turns += 1
+            seq = await _read_history(client, stats, headers, thread_id, seq)
+        r = await stats.call(client, "GET /sessions", "GET", "/sessions", headers=headers)
+        r.raise_for_status()
+    return turns
+
+
+async def _probe_loop_lag(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.append(time.perf_counter() - started - LAG_INTERVAL)
+
+
+async def _main(args) -> None:
+    if not args.real_mongo:
+        install_mongo_stand_in()
+    from app import app   # after the stand-in is in place; importing app pulls in every router
+
+    model = FakeChatModel(latency=args.latency, output_tokens=args.output_tokens, tool_calls=args.tool_calls)
+    search = FakeSearchTool(latency=args.tool_latency)
+    llm_registry.register_provider("groq", lambda *a: model)
+    install_search_tools([search])
+
+    stats = LoadStats()
+    lags: list[float] = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            await _user(client, LoadStats(), 1)   # warm-up: imports, client construction, first compiles
+            model.reset_counters()
+            search.calls = 0
+
+            stop = asyncio.Event()
+            probe = asyncio.create_task(_probe_loop_lag(lags, stop))
+            started = time.perf_counter()
+            results = await asyncio.gather(*(_user(client, stats, args.gauntlets) for _ in range(args.users)),
+                                           return_exceptions=True)
+            wall = time.perf_counter() - started
+            stop.set()
+            await probe
+
+    failures = [r for r in results if isinstance(r, BaseException)]
+    turns = sum(r for r in results if not isinstance(r, BaseException))
+
+    print(f"\n{args.users} user(s) × {args.gauntlets} gauntlet(s), LLM latency {args.latency}s, "
+          f"{'MONGODB_URI' if args.real_mongo else 'in-memory MongoDB'}")
+    print(f"wall {wall:.2f}s, {turns} turns ({turns / wall:.2f}/s), {model.calls} LLM calls, "
+          f"{search.calls} searches, {len(failures)} failed user(s)\n")
+
+    print(f"{'endpoint':<30} {'reqs':>6} {'req/s':>7} {'p50 (ms)':>9} {'p95 (ms)':>9} "
+          f"{'p99 (ms)':>9} {'max (ms)':>9}  status")
+    print("─" * 100)
+    for label, samples in stats.latencies.items():
+        ms = [1000 * s for s in samples]
+        codes = " ".join(f"{code}×{n}" for code, n in sorted(stats.statuses[label].items()))
+        print(f"{label:<30} {len(ms):>6} {len(ms) / wall:>7.2f} {_percentile(ms, 0.50):>9.1f} "
+              f"{_percentile(ms, 0.95):>9.1f} {_percentile(ms, 0.99):>9.1f} {max(ms):>9.1f}  {codes}")
+
+    if lags:
+        ms = [1000 * s for s in lags]
+        print(f"\nevent-loop lag over {len(ms)} probes: mean {statistics.mean(ms):.2f} ms, "
+              f"p50 {_percentile(ms, 0.50):.2f}, p99 {_percentile(ms, 0.99):.2f}, max {max(ms):.2f} ms")
+    for failure in failures[:3]:
+        print(f"failed user: {failure!r}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="concurrent simulated users")
+    parser.add_argument("--gauntlets", type=int, default=1, help="gauntlets each user plays")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per fake LLM call")
+    parser.add_argument("--output-tokens", type=int, default=250, help="length of free-text answers")
+    parser.add_argument("--tool-calls", type=int, default=3, help="searches the synthesis step requests")
+    parser.add_argument("--tool-latency", type=float, default=0.3, help="seconds per fake search")
+    parser.add_argument("--real-mongo", action="store_true", help="connect to MONGODB_URI instead of in-memory")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+bench_startup.py
+Benchmark: import cost and time-to-ready of the API server.
+
+Run from the backend/ directory:
+    uv run python -m src.Research_Agent.testing.bench_startup [--runs 5] [--real-mongo]
+
+Every measurement runs in a fresh interpreter, so nothing is already imported:
+  imports        `python -X importtime -c "import <module>"` for the tools package,
+                 the graph builder and the app. The table shows the cumulative
+                 import time and whether any of the heavy search SDKs
+                 (tavily, chromadb, semanticscholar, langchain_community) were
+                 imported. They should not be: tools load on first use.
+  heaviest       where `import app` spends its time, as module-level import time
+                 summed per top-level package
+  time-to-ready  `uvicorn app:app` is started and GET /index is polled until it
+                 answers. uvicorn only accepts connections once the lifespan has
+                 finished (Mongo indexes, checkpointer setup, graph build), so
+                 this is the delay before the server can take traffic. The app
+                 runs against an in-memory MongoDB (mongomock-motor) unless
+                 --real-mongo is given, in which case MONGODB_URI is used.
+  first search   the cost that moved off startup: the first
+                 tool_registry.get("web_search"), reported only when Tavily is
+                 installed and TAVILY_API_KEY is set
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+IMPORT_TARGETS = ("src.Research_Agent.tools", "src.Research_Agent.graph.graph_builder", "app")
+HEAVY_MODULES = ("tavily", "chromadb", "semanticscholar", "langchain_community")
+READY_TIMEOUT = 120.0   # seconds before a server that never answers counts as failed
+POLL_INTERVAL = 0.01
+
+# Runs the app under uvicorn with MongoDB.connect() swapped for the in-memory client.
+_STAND_IN_SERVER = """
+import sys, uvicorn
+from src.Research_Agent.testing.fakes import install_mongo_stand_in
+install_mongo_stand_in()
+uvicorn.run("app:app", host="127.0.0.1", port=int(sys.argv[1]), log_level="warning")
+"""
+
+_FIRST_SEARCH = """
+import time
+from src.Research_Agent.tools.registry import tool_registry
+if tool_registry.available("web_search"):
+    started = time.perf_counter()
+    tools = tool_registry.get("web_search")
+    print(time.perf_counter() - started if tools else "")
+"""
+
+
+def _backend_dir() -> str:
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+def _import_profile(module: str) -> tuple[float, dict[str, float], set[str]]:
+    """(total seconds, own import time per top-level package, modules imported)
+    for importing `module` in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_backend_dir(), capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    total, packages, imported = 0.0, defaultdict(float), set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        own, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not own.isdigit():
+            continue   # the header line
+        imported.add(name)
+        packages[name.split(".")[0]] += int(own) / 1e6
+        if name == module:
+            total = int(cumulative) / 1e6
+    return total, packages, imported
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _time_to_ready(real_mongo: bool) -> float:
+    """Seconds from spawning the server to its first successful response."""
+    port = _free_port()
+    if real_mongo:
+        command = [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning"]
+    else:
+        command = [sys.executable, "-c", _STAND_IN_SERVER, str(port)]
+
+    started = time.perf_counter()
+    server = subprocess.Popen(command, cwd=_backend_dir(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1.0) as client:
+            while time.perf_counter() - started < READY_TIMEOUT:
+                if server.poll() is not None:
+                    raise SystemExit(f"server exited during startup:\n{server.stderr.read().decode()[-2000:]}")
+                try:
+                    if client.get("/index").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                time.sleep(POLL_INTERVAL)
+        raise SystemExit(f"server not ready after {READY_TIMEOUT:.0f}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def _first_search() -> str:
+    result = subprocess.run([sys.executable, "-c", _FIRST_SEARCH], cwd=_backend_dir(),
+                            capture_output=True, text=True)
+    out = result.stdout.strip()
+    return f"{float(out) * 1000:.0f} ms" if out else "n/a (Tavily not installed or TAVILY_API_KEY unset)"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--real-mongo", action="store_true", help="connect to MONGODB_URI instead of in-memory")
+    args = parser.parse_args()
+
+    _import_profile("app")   # warm-up: write the .pyc files so every run measures the same thing
+
+    print(f"\n{'import':<42} {'median (ms)':>12} {'min (ms)':>9}  heavy SDKs imported")
+    print("─" * 90)
+    app_packages = defaultdict(list)
+    for module in IMPORT_TARGETS:
+        totals, heavy = [], set()
+        for _ in range(args.runs):
+            total, packages, imported = _import_profile(module)
+            totals.append(total)
+            heavy |= {m for m in HEAVY_MODULES if m in imported}
+            if module == "app":
+                for package, seconds in packages.items():
+                    app_packages[package].append(seconds)
+        print(f"{module:<42} {1000 * statistics.median(totals):>12.0f} {1000 * min(totals):>9.0f}  "
+              f"{', '.join(sorted(heavy)) or 'none'}")
+
+    print(f"\n{'heaviest packages under import app':<42} {'median (ms)':>12}")
+    print("─" * 56)
+    heaviest = sorted(app_packages.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for package, seconds in heaviest[:10]:
+        print(f"{package:<42} {1000 * statistics.median(seconds):>12.0f}")
+
+    ready = [_time_to_ready(args.real_mongo) for _ in range(args.runs)]
+    print(f"\ntime-to-ready (uvicorn app:app, {'MONGODB_URI' if args.real_mongo else 'in-memory MongoDB'}): "
+          f"median {statistics.median(ready):.2f}s, min {min(ready):.2f}s, max {max(ready):.2f}s")
+    print(f"first web_search use: {_first_search()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+bench_transcript.py
+Benchmark: prompt size and LLM latency of the debate with and without transcript compression.
+
+Run from the backend/ directory:
+    uv run python -m src.Research_Agent.testing.bench_transcript [--rounds 2 4 8] [--experts 3]
+
+For each round count, a synthetic debate is played exchange by exchange, the
+way the graph does it: the moderator runs after every exchange (and may fold
+old exchanges into the summary), then the next expert prompt is built; after
+the last round, the blue-team prompt is built.
+
+  full       — summarised_count stays 0, every prompt carries the whole transcript
+  compressed — moderator_node's compress_transcript() keeps the tail under
+               TRANSCRIPT_TOKEN_BUDGET
+
+Every LLM call goes to FakeChatModel, whose latency grows with prompt tokens,
+so the latency column reflects prompt size rather than Groq. The compressed
+totals include the summariser calls.
+"""
+
+import argparse
+import time
+
+from src.Research_Agent.LLMS import groqllm  # noqa: F401 — registers the real "groq" provider first
+from src.Research_Agent.LLMS.registry import llm_registry
+from src.Research_Agent.nodes import blueteam_node, expert_node
+from src.Research_Agent.nodes.transcript_memory import compress_transcript, estimate_tokens
+from src.Research_Agent.testing.fakes import FakeChatModel, canned_structured
+from src.Research_Agent.state.state import InterpretedContext, PanelOutput
+
+
+CRITIQUE = (
+    "The proposal assumes spray drones can hold a centimetre-level RTK fix across the whole "
+    "field, yet the cited trials were run on flat, open plots. Hedgerows, tree lines and "
+    "terrain shadowing routinely drop the fix, and the plan has no fallback beyond returning "
+    "home. That silently leaves strips untreated and undermines the yield model.\n\n"
+    "QUESTION: What happens to coverage guarantees when the fix degrades mid-pass?"
+)
+RESPONSE = (
+    "We log every pass and re-plan untreated strips at the end of the mission using the "
+    "coverage map; in the pilot, fix loss affected under 3% of passes and re-plans closed them."
+)
+
+
+def _install_fake(model: FakeChatModel) -> None:
+    llm_registry.register_provider("groq", lambda *args: model)
+
+
+def _play(rounds: int, experts: int, compress: bool, model: FakeChatModel) -> dict:
+    personas = canned_structured(PanelOutput).personas[:experts]
+    state = {
+        "interpreted_context": canned_structured(InterpretedContext),
+        "personas":            personas,
+        "expert_critique":     [],
+        "debate_summary":      None,
+        "summarized_count":    0,
+    }
+    model.reset_counters()
+    expert_tokens = []
+    started = time.perf_counter()
+
+    for n in range(rounds * experts):
+        if compress:
+            state.update(compress_transcript(state))
+        state["current_speaker_idx"] = n % experts
+        prompt, persona = expert_node._build_prompt(state)
+        expert_tokens.append(estimate_tokens(prompt))
+        model.invoke(prompt)
+        state["expert_critique"] = [*state["expert_critique"], {
+            "persona": persona.name, "role": persona.role,
+            "critique": CRITIQUE, "response": RESPONSE, "round": n // experts + 1,
+        }]
+
+    if compress:
+        state.update(compress_transcript(state))
+    _, thread = blueteam_node._prepare(state)
+    blue_tokens = estimate_tokens(thread[0].content)
+    model.invoke(thread)
+
+    return {
+        "last_expert": expert_tokens[-1],
+        "blue_team":   blue_tokens,
+        "total":       model.prompt_tokens,
+        "calls":       model.calls,
+        "wall_s":      time.perf_counter() - started,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--experts", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.02, help="fixed fake LLM latency per call (s)")
+    parser.add_argument("--per-1k", type=float, default=0.05, help="extra fake latency per 1k prompt tokens (s)")
+    args = parser.parse_args()
+
+    model = FakeChatModel(latency=args.latency, latency_per_1k_tokens=args.per_1k)
+    _install_fake(model)
+    _play(1, args.experts, False, model)   # warm-up: keep one-off import cost out of the first row
+
+    print(f"\n{args.experts} experts — prompt tokens estimated at ~4 chars/token\n")
+    print(f"{'rounds':>6} {'mode':<11} {'last expert':>12} {'blue team':>10} {'all prompts':>12} {'LLM calls':>10} {'wall (s)':>9}")
+    print("─" * 76)
+    for rounds in args.rounds:
+        for compress in (False, True):
+            r = _play(rounds, args.experts, compress, model)
+            mode = "compressed" if compress else "full"
+            print(f"{rounds:>6} {mode:<11} {r['last_expert']:>12} {r['blue_team']:>10} "
+                  f"{r['total']:>12} {r['calls']:>10} {r['wall_s']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
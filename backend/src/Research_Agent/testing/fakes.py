@@ -0,0 +1,286 @@
+"""
+fakes.py
+Offline stand-ins for Groq, Tavily and the user, used by the benchmark scripts in this folder.
+
+FakeChatModel answers every node of the Gauntlet with canned output after a
+configurable delay — time.sleep() on the sync path, asyncio.sleep() on the
+async path — so the scripts measure the graph and its concurrency, not Groq.
+The delay can grow with prompt size (latency_per_1k_tokens) for benchmarks
+that compare prompt lengths. It also tracks how many calls are in flight at
+once and how many prompt / completion tokens went through it, pads answers
+to `output_tokens`, and with `tool_calls` > 0 asks for web searches whenever
+it is called with tools bound (the blue-team synthesis loop).
+
+FakeSearchTool replaces the Tavily tool, auto_respond() answers the confirmation
+and expert interrupts, MeasuringMemorySaver counts checkpoint bytes written, and
+install_mongo_stand_in() points MongoDB.connect() at an in-memory database.
+"""
+
+import asyncio
+import inspect
+import threading
+import time
+import uuid
+from typing import Any, Callable, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import BaseTool
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.Research_Agent.state.state import InterpretedContext, PanelOutput, Persona
+from src.db.mongo_client import MongoDB
+
+
+def canned_structured(schema: type) -> Any:
+    """Return a plausible instance of the structured-output schemas the nodes request."""
+    if schema is InterpretedContext:
+        return InterpretedContext(
+            domain="Agricultural Drone Technology",
+            interpreted_goal="Assess the viability of autonomous crop-spraying drones.",
+            assumptions=["Mid-size farms", "EU regulatory context"],
+            confidence="high",
+        )
+    if schema is PanelOutput:
+        return PanelOutput(personas=[
+            Persona(
+                domain=domain,
+                name=name,
+                role=role,
+                system_prompt=f"You are a {role}. You are skeptical of unproven claims.",
+            )
+            for domain, name, role in (
+                ("Engineering", "Dana Reyes", "ML Systems Engineer"),
+                ("Regulation",  "Omar Haddad", "Aviation Compliance Officer"),
+                ("Finance",     "Lena Fischer", "Agri-Finance Analyst"),
+            )
+        ])
+    raise ValueError(f"FakeChatModel has no canned output for {schema!r}")
+
+
+def _prompt_tokens(messages: list[BaseMessage]) -> int:
+    # Same ~4 characters per token estimate the transcript budget uses.
+    return sum(len(str(m.content)) for m in messages) // 4
+
+
+def default_responder(messages: list[BaseMessage]) -> str:
+    """Answer the classify prompt with CONFIRMED, the transcript summariser with
+    one bullet per exchange, and everything else with a short critique."""
+    text = str(messages[-1].content) if messages else ""
+    if "CONFIRMED, CORRECTED, or REJECTED" in text:
+        return "CONFIRMED"
+    if "running minutes" in text:
+        speakers = [line.split("]:")[0] + "]" for line in text.splitlines() if line.startswith("[") and "]:" in line]
+        previous = text.split("=== MINUTES SO FAR ===")[1].split("=== NEW EXCHANGES")[0].strip()
+        bullets  = [] if previous == "None yet." else [previous]
+        bullets += [f"- {who}: raised offline-degradation risk; researcher answer partial." for who in speakers]
+        return "\n".join(bullets)
+    return "The proposal assumes reliable connectivity in rural fields.\n\nQUESTION: How does it degrade offline?"
+
+
+class FakeChatModel(BaseChatModel):
+    """Latency-configurable chat model that never touches the network."""
+
+    model_name: str = "fake-chat-model"
+    latency: float = 0.5
+    latency_per_1k_tokens: float = 0.0
+    output_tokens: Optional[int] = None      # pad free-text answers to ~this many tokens
+    tool_calls: int = 0                      # searches requested on a tool-bound call
+    responder: Callable[[list[BaseMessage]], str] = default_responder
+
+    # Concurrency bookkeeping shared by every call on this instance.
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    _lock: Any = None
+
+    def model_post_init(self, __context: Any) -> None:
+        self._lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    @property
+    def _identifying_params(self) -> dict:
+        # Surfaces as invocation_params["model"], which metrics and tracing label by.
+        return {"model": self.model_name}
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.in_flight = self.peak_in_flight = self.calls = 0
+            self.prompt_tokens = self.completion_tokens = 0
+
+    def _delay(self, messages: list[BaseMessage]) -> float:
+        return self.latency + self.latency_per_1k_tokens * _prompt_tokens(messages) / 1000
+
+    def _enter(self, messages: list[BaseMessage] = ()) -> None:
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += _prompt_tokens(messages)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _exit(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _content(self, messages: list[BaseMessage], schema: Optional[type]) -> str:
+        if schema is not None:
+            return canned_structured(schema).model_dump_json()
+        text = self.responder(messages)
+        if self.output_tokens and len(text) // 4 < self.output_tokens:
+            filler = " Further evidence is needed on field reliability."
+            text += filler * ((self.output_tokens * 4 - len(text)) // len(filler) + 1)
+        return text
+
+    def _result(self, messages: list[BaseMessage], tools: Optional[list[str]] = None,
+                schema: Optional[type] = None) -> ChatResult:
+        if tools and self.tool_calls and not any(isinstance(m, ToolMessage) for m in messages):
+            # First tool-bound call of a synthesis loop: ask for searches instead of answering.
+            message = AIMessage(content="", tool_calls=[
+                {"name": tools[0], "args": {"query": f"crop-spraying drone evidence {i}"}, "id": f"call_{uuid.uuid4().hex[:12]}"}
+                for i in range(self.tool_calls)
+            ])
+        else:
+            message = AIMessage(content=self._content(messages, schema))
+        completion = max(len(str(message.content)) // 4, 1)
+        message.usage_metadata = {
+            "input_tokens":  _prompt_tokens(messages),
+            "output_tokens": completion,
+            "total_tokens":  _prompt_tokens(messages) + completion,
+        }
+        with self._lock:
+            self.completion_tokens += completion
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self._enter(messages)
+        try:
+            time.sleep(self._delay(messages))
+            return self._result(messages, kwargs.get("tools"), kwargs.get("structured_schema"))
+        finally:
+            self._exit()
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self._enter(messages)
+        try:
+            await asyncio.sleep(self._delay(messages))
+            return self._result(messages, kwargs.get("tools"), kwargs.get("structured_schema"))
+        finally:
+            self._exit()
+
+    def bind_tools(self, tools, **kwargs):
+        # Only the tool names matter: with tool_calls > 0 the fake requests searches.
+        return self.bind(tools=[getattr(t, "name", str(t)) for t in tools])
+
+    def with_structured_output(self, schema, **kwargs):
+        # Routed through the model (not a bare lambda) so callbacks — metrics,
+        # tracing — see structured calls like any other LLM call.
+        return self.bind(structured_schema=schema) | RunnableLambda(
+            lambda message: schema.model_validate_json(message.content)
+        )
+
+
+class FakeSearchTool(BaseTool):
+    """Stand-in for the Tavily search tool: fixed latency, canned results, no network."""
+
+    name: str = "tavily_search_results_json"
+    description: str = "A search engine. Input should be a search query."
+    latency: float = 0.3
+    result_chars: int = 1200
+    calls: int = 0
+
+    def _results(self, query: str) -> list[dict]:
+        self.calls += 1
+        body = (f"Field trials relevant to '{query}' report mixed reliability. " * 40)[: self.result_chars]
+        return [{"url": f"https://example.org/{abs(hash(query)) % 10_000}", "content": body}]
+
+    def _run(self, query: str, **kwargs: Any) -> list[dict]:
+        time.sleep(self.latency)
+        return self._results(query)
+
+    async def _arun(self, query: str, **kwargs: Any) -> list[dict]:
+        await asyncio.sleep(self.latency)
+        return self._results(query)
+
+
+def auto_respond(interrupt_value: dict) -> str:
+    """Canned researcher replies for the Gauntlet's interrupts: confirm the
+    interpretation, then answer each expert's question."""
+    if interrupt_value.get("type") == "confirmation":
+        return "Yes, that's right."
+    return ("We fall back to pre-loaded field maps and RTK positioning; spraying pauses "
+            "if the link drops for more than 30 seconds.")
+
+
+class _CountingSerde:
+    """Serializer wrapper that adds up the bytes of everything it serializes."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.bytes_written = 0
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        type_, data = self.inner.dumps_typed(obj)
+        self.bytes_written += len(data)
+        return type_, data
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
+
+
+class MeasuringMemorySaver(MemorySaver):
+    """MemorySaver that reports how many serialized bytes the graph checkpoints —
+    the payload a Mongo-backed checkpointer would write."""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.serde = _CountingSerde(self.serde)
+
+    @property
+    def bytes_written(self) -> int:
+        return self.serde.bytes_written
+
+    def reset_counters(self) -> None:
+        self.serde.bytes_written = 0
+
+
+def install_mongo_stand_in() -> None:
+    """Make MongoDB.connect() open an in-memory mongomock-motor client instead of MONGODB_URI."""
+    try:
+        import mongomock.collection
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("The in-memory MongoDB needs mongomock-motor (uv sync --group dev), "
+                         "or pass --real-mongo to use MONGODB_URI.")
+
+    # pymongo ≥ 4.11 passes sort= to bulk updates (message_log.sync_thread);
+    # mongomock's builder predates it and would reject the keyword.
+    builder = mongomock.collection.BulkOperationBuilder
+    if "sort" not in inspect.signature(builder.add_update).parameters:
+        add_update = builder.add_update
+        builder.add_update = lambda self, *args, sort=None, **kwargs: add_update(self, *args, **kwargs)
+
+    async def connect():
+        MongoDB.client = AsyncMongoMockClient()
+        MongoDB.db = MongoDB.client["research_agent"]
+
+    MongoDB.connect = connect
@@ -0,0 +1,135 @@
+"""
+test_admission.py
+Behaviour tests for the admission controller in front of every graph run.
+
+Run from the backend/ directory:
+    uv run python -m pytest -q src/Research_Agent/testing/test_admission.py
+    uv run python src/Research_Agent/testing/test_admission.py
+
+What this tests:
+    1. A second turn for a thread already in flight is refused with 429
+    2. A run that waits longer than max_wait is refused with 429 + Retry-After
+    3. A slot handed to a waiter that is cancelled in the same tick is passed on,
+       not leaked
+    4. A waiter that is cancelled while queued leaves the queue
+    5. has_headroom() reports a free slot with nobody waiting
+"""
+
+import asyncio
+
+from fastapi import HTTPException
+
+from src.admission import AdmissionController
+
+
+async def _hold(controller: AdmissionController, thread_id: str, seconds: float, user_id: str = "u") -> None:
+    async with controller.admit(user_id, thread_id):
+        await asyncio.sleep(seconds)
+
+
+async def _refusal(coro) -> HTTPException:
+    try:
+        await coro
+    except HTTPException as e:
+        return e
+    raise AssertionError("expected a 429")
+
+
+def test_thread_in_flight_is_refused():
+    async def run():
+        controller = AdmissionController(max_concurrent=4, queue_size=4, max_wait=1)
+        first = asyncio.create_task(_hold(controller, "t1", 0.1))
+        await asyncio.sleep(0)
+        refused = await _refusal(_hold(controller, "t1", 0))
+        await _hold(controller, "t1", 0, user_id="someone-else")   # threads are scoped per user
+        await first
+        return controller, refused
+
+    controller, refused = asyncio.run(run())
+    assert refused.status_code == 429
+    assert refused.headers["Retry-After"] == "2"
+    assert controller.stats()["rejected_thread_busy"] == 1
+
+
+def test_wait_timeout_is_refused_with_retry_after():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, queue_size=4, max_wait=0.05)
+        holder = asyncio.create_task(_hold(controller, "t1", 0.2))
+        await asyncio.sleep(0)
+        refused = await _refusal(_hold(controller, "t2", 0))
+        await holder
+        return controller, refused
+
+    controller, refused = asyncio.run(run())
+    assert refused.status_code == 429
+    assert refused.headers["Retry-After"] == "5"
+    stats = controller.stats()
+    assert stats["rejected_wait_timeout"] == 1
+    assert stats["queued"] == 0 and stats["running"] == 0
+    assert controller.has_headroom()
+
+
+def test_slot_granted_to_cancelled_waiter_is_passed_on():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, queue_size=4, max_wait=5)
+        holder = asyncio.create_task(_hold(controller, "t1", 0.05))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(_hold(controller, "t2", 1))
+        await asyncio.sleep(0)
+        await holder              # the release hands the slot to t2's waiter...
+        cancelled.cancel()        # ...which is cancelled before it can run
+        try:
+            await cancelled
+        except asyncio.CancelledError:
+            pass
+        # The slot must still be usable, immediately.
+        await asyncio.wait_for(_hold(controller, "t3", 0), timeout=0.5)
+        return controller
+
+    controller = asyncio.run(run())
+    assert controller.stats()["running"] == 0
+    assert controller.has_headroom()
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, queue_size=4, max_wait=5)
+        holder = asyncio.create_task(_hold(controller, "t1", 0.05))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_hold(controller, "t2", 0))
+        await asyncio.sleep(0.01)
+        assert controller.stats()["queued"] == 1
+        waiter.cancel()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            pass
+        assert controller.stats()["queued"] == 0
+        await holder
+        await _hold(controller, "t2", 0)   # the thread is free again
+        return controller
+
+    controller = asyncio.run(run())
+    assert controller.stats()["admitted"] == 2
+
+
+def test_has_headroom():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, queue_size=4, max_wait=5)
+        assert controller.has_headroom()
+        holder = asyncio.create_task(_hold(controller, "t1", 0.05))
+        await asyncio.sleep(0)
+        busy = controller.has_headroom()
+        await holder
+        return controller, busy
+
+    controller, busy = asyncio.run(run())
+    assert not busy
+    assert controller.has_headroom()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"  ✓ {name}")
@@ -50,7 +50,7 @@ async def run_tests():
     session_id = session["_id"]
 
     # ── Test 2: get_sessions ───────────────────────────────────────────────
-    sessions = await get_sessions(USER_A)
+    sessions, _ = await get_sessions(USER_A)
     assert any(s["_id"] == session_id for s in sessions), "❌  Created session not found in list"
     print(f"✅  get_sessions    → {len(sessions)} session(s) found for USER_A")
 
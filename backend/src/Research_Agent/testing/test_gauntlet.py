@@ -78,7 +78,7 @@ async def main():
     print("═" * 60)
 
     # Build graph with MemorySaver — no Atlas needed for CLI testing.
-    # Production (app.py) will use MongoDBSaver for persistence.
+    # Production (app.py) persists with MotorCheckpointSaver (src/db/checkpointer.py).
     builder = GraphBuilder(checkpointer=MemorySaver())
     graph   = builder.build()
     logger.info("Graph compiled successfully")
@@ -106,6 +106,8 @@ async def main():
         "current_speaker_idx": 0,
         "round_number":        0,
         "expert_critique":     [],
+        "debate_summary":      None,
+        "summarized_count":    0,
         "is_gauntlet_complete": False,
         "final_report":        None,
         "synthesis_thread":    [],
@@ -0,0 +1,154 @@
+"""
+test_idempotency.py
+Behaviour tests for Idempotency-Key handling (src/db/idempotency.py) against an
+in-memory MongoDB (mongomock-motor, a dev dependency).
+
+Run from the backend/ directory:
+    uv run python -m pytest -q src/Research_Agent/testing/test_idempotency.py
+    uv run python src/Research_Agent/testing/test_idempotency.py
+
+What this tests:
+    1. A completed key is replayed without running the handler again
+    2. A duplicate of an in-flight run attaches to it — on the same worker, and
+       from another worker by polling the record
+    3. Reusing a key with a different body is refused with 422
+    4. A key whose run failed may be run again
+    5. A key whose owner died (lease expired) is taken over
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+
+from src.db import idempotency
+from src.db.mongo_client import MongoDB
+from src.Research_Agent.testing.fakes import install_mongo_stand_in
+
+install_mongo_stand_in()
+
+FP = idempotency.fingerprint("/chat/resume", {"thread_id": "t1", "user_response": "yes"})
+
+
+def _run(test):
+    async def wrapper():
+        await MongoDB.connect()   # a fresh in-memory database per test
+        try:
+            return await test()
+        finally:
+            await MongoDB.close()
+    return asyncio.run(wrapper())
+
+
+class Handler:
+    """Counts runs; optionally slow or failing."""
+
+    def __init__(self, seconds: float = 0.0, fail: bool = False):
+        self.seconds, self.fail, self.calls = seconds, fail, 0
+
+    async def __call__(self) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.seconds)
+        if self.fail:
+            raise HTTPException(status_code=500, detail="boom")
+        return {"status": "waiting", "run": self.calls}
+
+
+def test_completed_key_is_replayed():
+    async def test():
+        handler = Handler()
+        first = await idempotency.run_once("u1", "k1", FP, handler)
+        second = await idempotency.run_once("u1", "k1", FP, handler)
+        other_user = await idempotency.run_once("u2", "k1", FP, handler)
+        return handler, first, second, other_user
+
+    handler, first, second, other_user = _run(test)
+    assert first == ({"status": "waiting", "run": 1}, False)
+    assert second == ({"status": "waiting", "run": 1}, True)
+    assert other_user == ({"status": "waiting", "run": 2}, False)   # keys are scoped per user
+    assert handler.calls == 2
+
+
+def test_duplicate_attaches_to_in_flight_run_on_same_worker():
+    async def test():
+        handler = Handler(seconds=0.2)
+        return handler, await asyncio.gather(
+            idempotency.run_once("u1", "k1", FP, handler),
+            idempotency.run_once("u1", "k1", FP, handler),
+        )
+
+    handler, results = _run(test)
+    assert handler.calls == 1
+    assert sorted(replayed for _, replayed in results) == [False, True]
+    assert results[0][0] == results[1][0]
+
+
+def test_duplicate_attaches_to_in_flight_run_on_another_worker():
+    async def test():
+        handler = Handler(seconds=0.6)
+        owner = asyncio.create_task(idempotency.run_once("u1", "k1", FP, handler))
+        await asyncio.sleep(0.05)
+        local = idempotency._in_flight.pop("u1:k1")   # as if the duplicate hit another worker
+        try:
+            duplicate = await idempotency.run_once("u1", "k1", FP, handler)
+        finally:
+            idempotency._in_flight["u1:k1"] = local
+        return handler, await owner, duplicate
+
+    handler, owner, duplicate = _run(test)
+    assert handler.calls == 1
+    assert duplicate == (owner[0], True)
+
+
+def test_key_reused_with_different_body_is_refused():
+    async def test():
+        await idempotency.run_once("u1", "k1", FP, Handler())
+        other = idempotency.fingerprint("/chat/resume", {"thread_id": "t1", "user_response": "no"})
+        try:
+            await idempotency.run_once("u1", "k1", other, Handler())
+        except HTTPException as e:
+            return e
+        raise AssertionError("expected a 422")
+
+    assert _run(test).status_code == 422
+
+
+def test_failed_key_may_run_again():
+    async def test():
+        failing = Handler(fail=True)
+        try:
+            await idempotency.run_once("u1", "k1", FP, failing)
+        except HTTPException as e:
+            assert e.status_code == 500
+        retry = Handler()
+        return failing, retry, await idempotency.run_once("u1", "k1", FP, retry)
+
+    failing, retry, result = _run(test)
+    assert failing.calls == 1 and retry.calls == 1
+    assert result == ({"status": "waiting", "run": 1}, False)
+
+
+def test_expired_run_is_taken_over():
+    async def test():
+        # A running record whose worker died: nobody is renewing its lease.
+        past = datetime.utcnow() - timedelta(seconds=1)
+        await MongoDB.db[idempotency.COLLECTION].insert_one({
+            "_id": "u1:k1", "fingerprint": FP, "owner": "dead-worker", "status": "running",
+            "created_at": past, "expires_at": past,
+        })
+        taken_over = idempotency.stats()["taken_over"]
+        handler = Handler()
+        result = await idempotency.run_once("u1", "k1", FP, handler)
+        return handler, result, idempotency.stats()["taken_over"] - taken_over
+
+    handler, result, taken_over = _run(test)
+    assert handler.calls == 1
+    assert result == ({"status": "waiting", "run": 1}, False)
+    assert taken_over == 1
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"  ✓ {name}")
@@ -0,0 +1,82 @@
+"""
+test_reply_classifier.py
+Behaviour tests for the local reply classifier in front of the fast LLM.
+
+Run from the backend/ directory:
+    uv run python -m pytest -q src/Research_Agent/testing/test_reply_classifier.py
+    uv run python src/Research_Agent/testing/test_reply_classifier.py
+
+What this tests:
+    1. Plain confirmations and rejections are decided locally
+    2. "Confirm + edit" replies are never CONFIRMED — they go to the LLM (None)
+    3. "Reject + new brief" replies are never REJECTED locally, so the new
+       information reaches the LLM instead of being discarded
+    4. Single-letter tokens are matched by the rules, never scored
+    5. classify() records which path decided each reply
+"""
+
+from src.Research_Agent.nodes.reply_classifier import (
+    CONFIRMED, REJECTED, ReplyClassifier, _features, normalize,
+)
+
+CONFIRM_PLUS_EDIT = [
+    "looks good but add regulation",
+    "looks good but target europe",
+    "looks good except budget",
+    "yes go ahead but use EU",
+    "looks good just add drones",
+    "looks good minus assumption 3",
+    "yes, not the consumer market though",
+    "correct, change the region to asia",
+]
+
+REJECT_PLUS_BRIEF = [
+    "no forget it i meant healthcare",
+    "start over with drones for vineyards",
+    "scrap that, focus on greenhouses",
+    "never mind, it is for hospitals",
+]
+
+
+def test_plain_replies_are_decided_locally():
+    classifier = ReplyClassifier()
+    for reply in ("yes", "Looks good!", "yes exactly that", "correct please continue"):
+        assert classifier.classify(reply) == CONFIRMED, reply
+    for reply in ("start over", "no start from scratch please"):
+        assert classifier.classify(reply) == REJECTED, reply
+
+
+def test_confirm_plus_edit_is_not_confirmed():
+    classifier = ReplyClassifier()
+    for reply in CONFIRM_PLUS_EDIT:
+        assert classifier.classify(reply) != CONFIRMED, reply
+
+
+def test_reject_plus_brief_is_not_rejected():
+    classifier = ReplyClassifier()
+    for reply in REJECT_PLUS_BRIEF:
+        assert classifier.classify(reply) != REJECTED, reply
+
+
+def test_single_letters_are_rules_only():
+    classifier = ReplyClassifier()
+    assert _features(normalize("y")) == []
+    assert _features(normalize("k thanks")) == ["thanks"]
+    assert classifier.classify("y") == CONFIRMED
+    assert classifier.classify("k") == CONFIRMED
+
+
+def test_stats_count_the_deciding_path():
+    classifier = ReplyClassifier()
+    classifier.classify("yes")
+    assert classifier.classify("looks good but add regulation") is None
+    stats = classifier.stats()
+    assert stats["paths"]["rule"]["hits"] == 1
+    assert stats["paths"]["scorer"]["hits"] == 0
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"  ✓ {name}")
@@ -0,0 +1,84 @@
+"""
+test_search_cache.py
+Behaviour tests for the caching, de-duplicating search tool wrapper.
+
+Run from the backend/ directory:
+    uv run python -m pytest -q src/Research_Agent/testing/test_search_cache.py
+    uv run python src/Research_Agent/testing/test_search_cache.py
+
+What this tests:
+    1. Concurrent identical searches make one upstream call and all get its result
+    2. A repeat search is served from the cache
+    3. A caller cancelled by its own timeout does not cancel the others waiting on
+       the same search — they still get the result, and it is cached
+    4. An upstream error reaches every waiter and is not cached
+"""
+
+import asyncio
+
+from src.Research_Agent.testing.fakes import FakeSearchTool
+from src.Research_Agent.tools.search_cache import CachedSearchTool, search_cache
+
+
+class FailingSearchTool(FakeSearchTool):
+    async def _arun(self, query: str, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.calls += 1
+        raise RuntimeError("upstream down")
+
+
+def _tool(inner=None) -> tuple[CachedSearchTool, FakeSearchTool]:
+    search_cache.clear()
+    inner = inner or FakeSearchTool(latency=0.3)
+    return CachedSearchTool(inner, offline=False), inner
+
+
+def test_concurrent_searches_share_one_call():
+    tool, inner = _tool()
+
+    async def run():
+        return await asyncio.gather(*(tool.ainvoke({"query": q}) for q in ("Drone law", "drone law?", " DRONE  law")))
+
+    results = asyncio.run(run())
+    assert inner.calls == 1
+    assert results[0] == results[1] == results[2]
+    assert asyncio.run(tool.ainvoke({"query": "drone law"})) == results[0]
+    assert inner.calls == 1
+
+
+def test_cancelled_caller_does_not_cancel_waiters():
+    tool, inner = _tool()
+
+    async def run():
+        first = asyncio.create_task(asyncio.wait_for(tool.ainvoke({"query": "vineyard drones"}), timeout=0.1))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(asyncio.wait_for(tool.ainvoke({"query": "vineyard drones"}), timeout=5))
+        return await asyncio.gather(first, second, return_exceptions=True)
+
+    first, second = asyncio.run(run())
+    assert isinstance(first, asyncio.TimeoutError)
+    assert isinstance(second, list) and second, second
+    assert inner.calls == 1
+    assert asyncio.run(tool.ainvoke({"query": "vineyard drones"})) == second
+    assert inner.calls == 1
+
+
+def test_upstream_error_reaches_waiters_and_is_not_cached():
+    tool, inner = _tool(FailingSearchTool(latency=0.1))
+
+    async def run():
+        return await asyncio.gather(*(tool.ainvoke({"query": "soil sensors"}) for _ in range(2)),
+                                    return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results), results
+    assert inner.calls == 1
+    asyncio.run(run())
+    assert inner.calls == 2
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"  ✓ {name}")
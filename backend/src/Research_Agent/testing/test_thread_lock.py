@@ -0,0 +1,113 @@
+"""
+test_thread_lock.py
+Behaviour tests for the per-thread lease lock and its write fence
+(src/db/thread_lock.py) against an in-memory MongoDB (mongomock-motor, a dev
+dependency).
+
+Run from the backend/ directory:
+    uv run python -m pytest -q src/Research_Agent/testing/test_thread_lock.py
+    uv run python src/Research_Agent/testing/test_thread_lock.py
+
+What this tests:
+    1. A held lease refuses a second holder (429 from hold()); a released one
+       is taken again with a higher fencing token
+    2. An expired lease is taken over, and the old holder's renewal marks it lost
+    3. check_fence() raises LeaseLost once the lease deadline has passed, or once
+       a renewal found the lease taken over — and is a no-op outside hold()
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+
+from src.db import thread_lock
+from src.db.mongo_client import MongoDB
+from src.Research_Agent.testing.fakes import install_mongo_stand_in
+
+install_mongo_stand_in()
+
+
+def _run(test):
+    async def wrapper():
+        await MongoDB.connect()   # a fresh in-memory database per test
+        try:
+            return await test()
+        finally:
+            await MongoDB.close()
+    return asyncio.run(wrapper())
+
+
+def _fence_raises(thread_id: str) -> bool:
+    try:
+        thread_lock.check_fence(thread_id)
+    except thread_lock.LeaseLost:
+        return True
+    return False
+
+
+def test_held_lease_refuses_a_second_holder():
+    async def test():
+        async with thread_lock.hold("t1") as first:
+            assert await thread_lock.acquire("t1") is None
+            try:
+                async with thread_lock.hold("t1"):
+                    raise AssertionError("second holder admitted")
+            except HTTPException as e:
+                refused = e
+        second = await thread_lock.acquire("t1")
+        return first, refused, second
+
+    first, refused, second = _run(test)
+    assert refused.status_code == 429 and refused.headers["Retry-After"] == "2"
+    assert second is not None and second.token == first.token + 1
+
+
+def test_expired_lease_is_taken_over():
+    async def test():
+        stale = await thread_lock.acquire("t1")
+        # The holder stalled: its lease ran out without being renewed.
+        await MongoDB.db[thread_lock.COLLECTION].update_one(
+            {"_id": "t1"}, {"$set": {"expires_at": datetime.utcnow() - timedelta(seconds=1)}})
+        fresh = await thread_lock.acquire("t1")
+        renewed = await thread_lock.renew(stale)
+        return stale, fresh, renewed
+
+    stale, fresh, renewed = _run(test)
+    assert fresh is not None and fresh.token == stale.token + 1
+    assert renewed is False and stale.lost
+
+
+def test_fence_trips_once_the_deadline_passes():
+    async def test():
+        async with thread_lock.hold("t1") as lease:
+            before = _fence_raises("t1")
+            other_thread = _fence_raises("t2")
+            lease.deadline = time.monotonic() - 0.001   # the lease ran out locally
+            after = _fence_raises("t1")
+        return before, other_thread, after, lease
+
+    before, other_thread, after, lease = _run(test)
+    assert not before and not other_thread
+    assert after and lease.lost
+    assert not _fence_raises("t1")   # outside hold() there is nothing to fence
+
+
+def test_fence_trips_after_a_failed_renewal():
+    async def test():
+        async with thread_lock.hold("t1") as lease:
+            await MongoDB.db[thread_lock.COLLECTION].update_one({"_id": "t1"}, {"$set": {"owner": "someone-else"}})
+            renewed = await thread_lock.renew(lease)
+            return renewed, _fence_raises("t1")
+
+    renewed, raised = _run(test)
+    assert renewed is False
+    assert raised
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"  ✓ {name}")
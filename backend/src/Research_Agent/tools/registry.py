@@ -0,0 +1,131 @@
+"""
+registry.py
+Process-wide registry of agent tools, loaded lazily.
+
+Tools are declared by import path, not imported. Nothing runs at import time:
+no client is constructed and no network is touched, and heavy SDKs such as
+langchain_community/Tavily are not pulled in until a node first asks for the
+tool. The first get() imports the loader, builds the tools once and caches them.
+Every later caller gets the same instances.
+
+    tool_registry.available("web_search")   # cheap: dependency + env check, no import
+    tool_registry.get("web_search")         # builds on first use; [] if it cannot load
+    tool_registry.stats()                   # load status and cost per tool
+"""
+
+import importlib
+import importlib.util
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+from src.logging.logger import logger
+
+
+@dataclass
+class ToolSpec:
+    """Where a tool lives and what it needs before it is worth loading.
+
+    loader:   "package.module:function", called with no arguments; returns a list of tools
+    requires: top-level modules that must be importable
+    env:      environment variables that must be set
+    """
+    loader: str
+    requires: Sequence[str] = ()
+    env: Sequence[str] = ()
+
+
+def _missing(spec: ToolSpec) -> Optional[str]:
+    """What keeps this tool from loading, checked without importing it."""
+    modules = [m for m in spec.requires if importlib.util.find_spec(m) is None]
+    env = [var for var in spec.env if not os.environ.get(var)]
+    if modules or env:
+        return "missing " + ", ".join([f"module {m}" for m in modules] + [f"${var}" for var in env])
+    return None
+
+
+@dataclass
+class _Loaded:
+    tools: list = field(default_factory=list)
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class ToolRegistry:
+    """Thread-safe, build-once cache of tool lists keyed by tool name."""
+
+    def __init__(self, specs: Optional[dict[str, ToolSpec]] = None):
+        self._lock = threading.Lock()
+        self._specs: dict[str, ToolSpec] = dict(specs or {})
+        self._loaded: dict[str, _Loaded] = {}
+
+    def register(self, name: str, spec: ToolSpec) -> None:
+        """Declare (or replace) a tool. Replacing drops the built instances."""
+        with self._lock:
+            self._specs[name] = spec
+            self._loaded.pop(name, None)
+
+    def install(self, name: str, tools: Sequence[Any]) -> None:
+        """Serve `name` from these ready-made tools for this process (benchmarks, fakes)."""
+        with self._lock:
+            self._loaded[name] = _Loaded(tools=list(tools))
+
+    def available(self, name: str) -> bool:
+        """Whether get(name) can be expected to return tools, without importing them."""
+        with self._lock:
+            loaded = self._loaded.get(name)
+            spec = self._specs.get(name)
+        if loaded is not None:
+            return bool(loaded.tools)
+        return spec is not None and _missing(spec) is None
+
+    def get(self, name: str) -> list:
+        """The tools registered under `name`, built on first use. A tool that fails
+        to load is logged once and served as [] from then on."""
+        with self._lock:
+            loaded = self._loaded.get(name)
+            if loaded is None:
+                loaded = self._loaded[name] = self._load(name)
+            return loaded.tools
+
+    def _load(self, name: str) -> _Loaded:
+        spec = self._specs.get(name)
+        if spec is None:
+            return _Loaded(error="not registered")
+        missing = _missing(spec)
+        if missing:
+            logger.info(f"Tool '{name}' not loaded — {missing}")
+            return _Loaded(error=missing)
+        started = time.perf_counter()
+        try:
+            module_name, _, function = spec.loader.partition(":")
+            tools = list(getattr(importlib.import_module(module_name), function)())
+        except Exception as e:
+            logger.warning(f"Tool '{name}' unavailable — continuing without it: {e}")
+            return _Loaded(seconds=time.perf_counter() - started, error=str(e))
+        seconds = time.perf_counter() - started
+        logger.info(f"Tool '{name}' loaded in {seconds * 1000:.0f} ms")
+        return _Loaded(tools=tools, seconds=seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {name: {"loaded": False, "tools": [], "load_ms": None, "error": None} for name in self._specs}
+            for name, loaded in self._loaded.items():
+                stats[name] = {
+                    "loaded":  True,
+                    "tools":   [getattr(t, "name", repr(t)) for t in loaded.tools],
+                    "load_ms": round(loaded.seconds * 1000, 1),
+                    "error":   loaded.error,
+                }
+            return dict(sorted(stats.items()))
+
+
+tool_registry = ToolRegistry({
+    "web_search": ToolSpec(
+        loader="src.Research_Agent.tools.search_tool:build_web_search",
+        requires=("langchain_community",),
+        env=("TAVILY_API_KEY",),
+    ),
+})
@@ -0,0 +1,206 @@
+"""
+search_cache.py
+Caching, de-duplicating wrapper around the web search tool.
+
+The blue-team synthesis loop searches live on every tool call, even when another
+session searched the same claim minutes earlier. CachedSearchTool sits in front
+of the real tool (Tavily) with the same name and argument schema, so the LLM and
+ToolNode see no difference, and:
+
+  - normalizes the query (case, whitespace, trailing punctuation) into a cache key
+  - keeps successful results in a process-wide LRU with a TTL
+  - collapses identical concurrent searches into one upstream request
+  - in offline mode (SEARCH_OFFLINE=true) serves only cached results and never
+    calls the upstream API
+"""
+
+import asyncio
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Optional
+
+from langchain_core.tools import BaseTool
+
+from src.config import SEARCH_CACHE_MAX_ENTRIES, SEARCH_CACHE_TTL_SECONDS, SEARCH_OFFLINE
+
+OFFLINE_MISS = "No cached search results are available for this query (offline mode)."
+
+_SPACES = re.compile(r"\s+")
+_ERROR_REPR = re.compile(r"^\w*(Error|Exception)\(")
+
+
+def normalize_query(query: str) -> str:
+    return _SPACES.sub(" ", query.lower()).strip().rstrip("?.!").strip()
+
+
+class SearchCache:
+    """Process-wide TTL/LRU store of search results plus in-flight request tables."""
+
+    def __init__(self, max_entries: int = SEARCH_CACHE_MAX_ENTRIES, ttl_seconds: int = SEARCH_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._inflight_sync: dict[str, Future] = {}
+        self._inflight_async: dict[str, asyncio.Task] = {}
+        self._counters = {"hits": 0, "misses": 0, "deduplicated": 0, "upstream_calls": 0,
+                          "upstream_errors": 0, "offline_misses": 0}
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # ── In-flight de-duplication ──────────────────────────────────────────────
+    # Sync: the first caller of a key becomes its owner and performs the upstream
+    # request; concurrent callers of the same key wait on the owner's future.
+    # Async: the upstream request runs in a task owned by the cache, which every
+    # caller (the first included) awaits through shield(). A caller that is
+    # cancelled (a tool timeout, a client disconnect) only stops waiting; the
+    # request carries on for the others, and no one else sees the cancellation.
+
+    def claim_sync(self, key: str) -> tuple[Future, bool]:
+        with self._lock:
+            pending = self._inflight_sync.get(key)
+            if pending is not None:
+                self._counters["deduplicated"] += 1
+                return pending, False
+            pending = self._inflight_sync[key] = Future()
+            return pending, True
+
+    def release_sync(self, key: str) -> None:
+        with self._lock:
+            self._inflight_sync.pop(key, None)
+
+    def inflight_async(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """The running upstream task for `key`, started from `fetch()` if there is none."""
+        task = self._inflight_async.get(key)
+        if task is not None and not task.done():
+            self.count("deduplicated")
+            return task
+        task = self._inflight_async[key] = asyncio.get_running_loop().create_task(fetch())
+        task.add_done_callback(lambda t: self._release_async(key, t))
+        return task
+
+    def _release_async(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight_async.get(key) is task:
+            del self._inflight_async[key]
+        # Mark the outcome as retrieved: every waiter may have given up already.
+        task.cancelled() or task.exception()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            counters["entries"] = len(self._entries)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+        counters["offline"] = SEARCH_OFFLINE
+        return counters
+
+
+search_cache = SearchCache()
+
+
+class CachedSearchTool(BaseTool):
+    """Drop-in wrapper that serves a search tool's results through `search_cache`."""
+
+    inner: BaseTool
+    offline: bool = SEARCH_OFFLINE
+
+    def __init__(self, inner: BaseTool, **kwargs: Any):
+        super().__init__(
+            inner=inner,
+            name=inner.name,
+            description=inner.description,
+            args_schema=inner.args_schema,
+            **kwargs,
+        )
+
+    @staticmethod
+    def _cacheable(result: Any) -> bool:
+        # Tavily reports API failures as a repr() string instead of raising.
+        return not (isinstance(result, str) and _ERROR_REPR.match(result))
+
+    def _lookup(self, query: str) -> tuple[str, Optional[Any]]:
+        key = normalize_query(query)
+        return key, search_cache.get(key)
+
+    def _run(self, query: str, **kwargs: Any) -> Any:
+        key, cached = self._lookup(query)
+        if cached is not None:
+            return cached
+        search_cache.count("misses")
+        if self.offline:
+            search_cache.count("offline_misses")
+            return OFFLINE_MISS
+
+        pending, owner = search_cache.claim_sync(key)
+        if not owner:
+            return pending.result()
+
+        try:
+            search_cache.count("upstream_calls")
+            result = self.inner.invoke({"query": query})
+            if self._cacheable(result):
+                search_cache.put(key, result)
+            else:
+                search_cache.count("upstream_errors")
+            pending.set_result(result)
+            return result
+        except Exception as e:
+            search_cache.count("upstream_errors")
+            pending.set_exception(e)
+            raise
+        finally:
+            search_cache.release_sync(key)
+
+    async def _arun(self, query: str, **kwargs: Any) -> Any:
+        key, cached = self._lookup(query)
+        if cached is not None:
+            return cached
+        search_cache.count("misses")
+        if self.offline:
+            search_cache.count("offline_misses")
+            return OFFLINE_MISS
+
+        task = search_cache.inflight_async(key, lambda: self._afetch(key, query))
+        return await asyncio.shield(task)
+
+    async def _afetch(self, key: str, query: str) -> Any:
+        search_cache.count("upstream_calls")
+        try:
+            result = await self.inner.ainvoke({"query": query})
+        except Exception:
+            search_cache.count("upstream_errors")
+            raise
+        if self._cacheable(result):
+            search_cache.put(key, result)
+        else:
+            search_cache.count("upstream_errors")
+        return result
@@ -1,15 +1,37 @@
-from langchain_community.tools.tavily_search import TavilySearchResults
 from langgraph.prebuilt import ToolNode
+
+from src.Research_Agent.tools.registry import tool_registry
+from src.Research_Agent.tools.search_cache import CachedSearchTool
+
+
+def install_search_tools(tools) -> None:
+    """
+    Serve `tools` from search_tool() instead of Tavily, for this process.
+    Used by the offline benchmarks to plug in a fake search backend; must be
+    called before the graph is built.
+    """
+    tool_registry.install("web_search", tools)
+
+
 def search_tool():
     """
-    Creates and returns a configured Tavily search tool.
+    Returns the configured Tavily search tool, or [] when it cannot be loaded.
     This tool is used by the agent to perform web searches.
+    The list is built by the tool registry on first use and shared by the
+    ToolNode and every node that binds it, so re-entering a node never rebuilds
+    the tool. Searches go through the shared search cache (see search_cache.py).
     """
-    tool = [TavilySearchResults(max_results=2)]
-    return tool
+    return tool_registry.get("web_search")
+
+
+def build_web_search():
+    """Loader for the "web_search" registry entry — imports Tavily only when called."""
+    from langchain_community.tools.tavily_search import TavilySearchResults
+
+    return [CachedSearchTool(TavilySearchResults(max_results=2))]
 
 def create_tool_node(tools):
     """
     created and returns a tool node for the specified tools
     """
-    return ToolNode(tools=tools)
\ No newline at end of file
+    return ToolNode(tools=tools)
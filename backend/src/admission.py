@@ -0,0 +1,144 @@
+"""
+admission.py
+Admission control for LLM-bound graph runs (/chat/start, /chat/resume and their
+streaming and background variants).
+
+Without a limit, every request drives its segment straight into Groq. A burst
+of resumes exhausts the rate limit for everyone, and the request latencies
+collapse together. The controller admits at most ADMISSION_MAX_CONCURRENT
+segments at once. Up to ADMISSION_QUEUE_SIZE more wait their turn, each for at
+most ADMISSION_MAX_WAIT_SECONDS. A thread may only have one turn in flight,
+whether running or queued. Anything else is refused with 429 + Retry-After, so
+clients back off instead of piling on.
+
+Slots are handed out through an explicit FIFO of waiter futures rather than
+asyncio.wait_for(Semaphore.acquire()): the wait times out by resolving the
+waiter, never by cancelling an acquire, so a slot granted at the instant of a
+timeout or a client disconnect is passed on instead of leaked (Python < 3.12).
+
+Counters, current queue depth and recent wait times are exposed through stats().
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException
+
+from src.config import ADMISSION_MAX_CONCURRENT, ADMISSION_MAX_WAIT_SECONDS, ADMISSION_QUEUE_SIZE
+from src.logging.logger import logger
+
+_WAIT_SAMPLES = 1000   # recent admissions kept for the wait-time percentiles
+
+
+class AdmissionController:
+    """Global concurrency cap + bounded wait queue + one turn per thread."""
+
+    def __init__(self, max_concurrent: int = ADMISSION_MAX_CONCURRENT,
+                 queue_size: int = ADMISSION_QUEUE_SIZE,
+                 max_wait: float = ADMISSION_MAX_WAIT_SECONDS):
+        self.max_concurrent = max_concurrent
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self._free = max_concurrent
+        self._waiters: deque[asyncio.Future] = deque()
+        self._running = 0
+        self._queued = 0
+        self._threads: set[tuple[str, str]] = set()
+        self._waits: deque[float] = deque(maxlen=_WAIT_SAMPLES)
+        self._counters = {
+            "admitted": 0, "rejected_thread_busy": 0,
+            "rejected_queue_full": 0, "rejected_wait_timeout": 0,
+        }
+
+    def _reject(self, reason: str, detail: str, retry_after: int) -> HTTPException:
+        self._counters[f"rejected_{reason}"] += 1
+        logger.warning(f"Admission rejected ({reason}) — running {self._running}, queued {self._queued}")
+        return HTTPException(status_code=429, detail=detail, headers={"Retry-After": str(retry_after)})
+
+    @asynccontextmanager
+    async def admit(self, user_id: str, thread_id: str):
+        """Hold one run slot for this thread for the duration of the block, or raise 429."""
+        key = (user_id, thread_id)
+        if key in self._threads:
+            raise self._reject("thread_busy", "A turn is already running for this conversation", 2)
+        if self._running + self._queued >= self.max_concurrent + self.queue_size:
+            raise self._reject("queue_full", "The server is busy, please retry shortly", 5)
+
+        self._threads.add(key)
+        try:
+            self._queued += 1
+            started = time.perf_counter()
+            try:
+                granted = await self._acquire_slot()
+            finally:
+                self._queued -= 1
+            if not granted:
+                raise self._reject("wait_timeout", "The server is busy, please retry shortly", 5)
+
+            self._waits.append(time.perf_counter() - started)
+            self._counters["admitted"] += 1
+            self._running += 1
+            try:
+                yield
+            finally:
+                self._running -= 1
+                self._release_slot()
+        finally:
+            self._threads.discard(key)
+
+    async def _acquire_slot(self) -> bool:
+        """Take a free slot or wait for one, up to max_wait. False on timeout."""
+        if self._free > 0 and not self._waiters:
+            self._free -= 1
+            return True
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        timer = loop.call_later(self.max_wait, lambda: waiter.done() or waiter.set_result(False))
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            # Cancelled after the slot was handed over: pass it on rather than leak it.
+            if waiter.done() and not waiter.cancelled() and waiter.result():
+                self._release_slot()
+            raise
+        finally:
+            timer.cancel()
+            if waiter in self._waiters:   # timed out or cancelled while still queued
+                self._waiters.remove(waiter)
+
+    def _release_slot(self) -> None:
+        """Hand the slot to the longest waiter still waiting, or return it to the pool."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self._free += 1
+
+    def has_headroom(self) -> bool:
+        """Whether a run slot is free with nobody waiting — optional work may start."""
+        return self._queued == 0 and self._running < self.max_concurrent
+
+    def stats(self) -> dict:
+        waits = sorted(self._waits)
+
+        def pct(p: float) -> float:
+            return round(1000 * waits[min(len(waits) - 1, int(p * len(waits)))], 1) if waits else 0.0
+
+        return {
+            "max_concurrent": self.max_concurrent,
+            "queue_size":     self.queue_size,
+            "running":        self._running,
+            "queued":         self._queued,
+            **self._counters,
+            "wait_ms_p50":    pct(0.50),
+            "wait_ms_p95":    pct(0.95),
+            "wait_ms_max":    round(1000 * waits[-1], 1) if waits else 0.0,
+        }
+
+
+# Process-wide instance used by the chat router.
+admission = AdmissionController()
@@ -9,6 +9,11 @@ from datetime import datetime, timedelta, timezone
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from src.logging.context import bind_log_context
+from src.password_pool import password_pool
+from src.token_cache import token_cache
+from src.tracing import tracer
+
 try:
     import bcrypt
 except Exception:
@@ -43,6 +48,14 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return _hash_pbkdf2_password(password)
 
+async def averify_password(plain_password, hashed_password) -> bool:
+    """verify_password on the hashing pool — use this from async routes."""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+async def aget_password_hash(password) -> str:
+    """get_password_hash on the hashing pool — use this from async routes."""
+    return await password_pool.run(get_password_hash, password)
+
 def _hash_pbkdf2_password(password: str) -> str:
     salt = os.urandom(16)
     dk = hashlib.pbkdf2_hmac(
@@ -88,20 +101,52 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(_bearer)) -> dict:
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(_bearer)) -> dict:
     """
     Decodes the native PyJWT token sent from Streamlit.
+
+    Verified tokens are served from token_cache until their `exp`, so repeat
+    requests skip jwt.decode. Declared async so cache hits also skip the
+    threadpool hop FastAPI makes for sync dependencies.
     """
-    token = credentials.credentials
+    with tracer.span("get_current_user", "auth") as span:
+        user = _authenticate(credentials.credentials, span)
+    bind_log_context(user_id=user["uid"])
+    return user
+
+def _authenticate(token: str, span) -> dict:
+    """Cache lookup, then full JWT verification — the body of get_current_user."""
+    user = token_cache.get(token)
+    if span is not None:
+        span.attrs["cached"] = user is not None
+    if user is not None:
+        return user
+
+    if token_cache.is_revoked(token):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         uid: str = payload.get("sub")
         email: str = payload.get("email")
         if uid is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
-        return {"uid": uid, "email": email}
+        user = {"uid": uid, "email": email}
+        if payload.get("exp") is not None:
+            token_cache.put(token, user, float(payload["exp"]))
+        return user
     except jwt.PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
+
+def get_bearer_token(credentials: HTTPAuthorizationCredentials = Depends(_bearer)) -> str:
+    """FastAPI dependency — the raw bearer token of the current request."""
+    return credentials.credentials
+
+def revoke_token(token: str) -> None:
+    """Reject an already-verified token for the rest of its lifetime (logout)."""
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    exp = payload.get("exp")
+    token_cache.revoke(token, float(exp) if exp is not None else float("inf"))
@@ -9,3 +9,74 @@ TAVILY_API_KEY = os.environ.get('TAVILY_API_KEY')
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
 FIREBASE_SERVICE_ACCOUNT = os.environ.get('FIREBASE_SERVICE_ACCOUNT')
 MONGODB_URI = os.environ.get('MONGODB_URI')
+
+# Shared HTTP transport for LLM clients (see LLMS/registry.py)
+LLM_HTTP_MAX_CONNECTIONS = int(os.environ.get('LLM_HTTP_MAX_CONNECTIONS', '100'))
+LLM_HTTP_MAX_KEEPALIVE = int(os.environ.get('LLM_HTTP_MAX_KEEPALIVE', '20'))
+LLM_HTTP_KEEPALIVE_EXPIRY = float(os.environ.get('LLM_HTTP_KEEPALIVE_EXPIRY', '60'))
+
+# MongoDB connection pool (shared by sessions, users and the checkpointer)
+MONGODB_MAX_POOL_SIZE = int(os.environ.get('MONGODB_MAX_POOL_SIZE', '100'))
+MONGODB_MIN_POOL_SIZE = int(os.environ.get('MONGODB_MIN_POOL_SIZE', '0'))
+MONGODB_MAX_IDLE_TIME_MS = int(os.environ.get('MONGODB_MAX_IDLE_TIME_MS', '300000'))
+
+# Background job mode for /chat/start and /chat/resume (see src/jobs.py)
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '4'))
+JOB_QUEUE_SIZE = int(os.environ.get('JOB_QUEUE_SIZE', '64'))
+JOB_RESULT_TTL_SECONDS = int(os.environ.get('JOB_RESULT_TTL_SECONDS', '900'))
+
+# LLM response cache (see LLMS/cache.py)
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get('LLM_CACHE_MAX_ENTRIES', '1024'))
+LLM_CACHE_TTL_SECONDS = int(os.environ.get('LLM_CACHE_TTL_SECONDS', '3600'))
+LLM_CACHE_MONGO = os.environ.get('LLM_CACHE_MONGO', 'false').lower() == 'true'
+
+# Web search cache (see Research_Agent/tools/search_cache.py)
+SEARCH_CACHE_TTL_SECONDS = int(os.environ.get('SEARCH_CACHE_TTL_SECONDS', '1800'))
+SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get('SEARCH_CACHE_MAX_ENTRIES', '512'))
+SEARCH_OFFLINE = os.environ.get('SEARCH_OFFLINE', 'false').lower() == 'true'
+
+# Synthesis tool calls (see Research_Agent/nodes/synthesis_tools_node.py)
+TOOL_MAX_CONCURRENCY = int(os.environ.get('TOOL_MAX_CONCURRENCY', '4'))
+TOOL_CALL_TIMEOUT_SECONDS = float(os.environ.get('TOOL_CALL_TIMEOUT_SECONDS', '20'))
+
+# Debate transcript compression (see Research_Agent/nodes/transcript_memory.py)
+TRANSCRIPT_TOKEN_BUDGET = int(os.environ.get('TRANSCRIPT_TOKEN_BUDGET', '1500'))
+TRANSCRIPT_KEEP_RECENT = int(os.environ.get('TRANSCRIPT_KEEP_RECENT', '3'))
+
+# Password hashing pool for /auth (see src/password_pool.py)
+HASH_WORKERS = int(os.environ.get('HASH_WORKERS', '2'))
+HASH_QUEUE_SIZE = int(os.environ.get('HASH_QUEUE_SIZE', '32'))
+
+# Verified access-token cache for get_current_user (see src/token_cache.py)
+TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get('TOKEN_CACHE_MAX_ENTRIES', '4096'))
+
+# Admission control for LLM-bound graph runs (see src/admission.py)
+ADMISSION_MAX_CONCURRENT = int(os.environ.get('ADMISSION_MAX_CONCURRENT', '8'))
+ADMISSION_QUEUE_SIZE = int(os.environ.get('ADMISSION_QUEUE_SIZE', '32'))
+ADMISSION_MAX_WAIT_SECONDS = float(os.environ.get('ADMISSION_MAX_WAIT_SECONDS', '30'))
+
+# Per-thread lease lock across workers (see src/db/thread_lock.py)
+THREAD_LOCK_TTL_SECONDS = float(os.environ.get('THREAD_LOCK_TTL_SECONDS', '30'))
+
+# Idempotency-Key handling for /chat/start and /chat/resume (see src/db/idempotency.py)
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', str(24 * 3600)))
+IDEMPOTENCY_WAIT_SECONDS = float(os.environ.get('IDEMPOTENCY_WAIT_SECONDS', '120'))
+
+# Prometheus scrape endpoint (see src/routers/metrics.py) — open when unset
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Log / trace file directory — anchored to backend/, not the process cwd
+LOG_DIR = os.environ.get('LOG_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs'))
+
+# Structured logging (see src/logging/logger.py)
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_LEVELS = os.environ.get('LOG_LEVELS', '')   # per-module overrides: "src.routers=DEBUG,httpx=WARNING"
+LOG_FILE_MAX_BYTES = int(os.environ.get('LOG_FILE_MAX_BYTES', str(20 * 1024 * 1024)))
+LOG_ROTATE_HOURS = float(os.environ.get('LOG_ROTATE_HOURS', '24'))
+LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', '10'))
+
+# Request tracing (see src/tracing.py): "jsonl", "mongo" or "off"
+TRACE_SINK = os.environ.get('TRACE_SINK', 'jsonl').lower()
+TRACE_FILE = os.environ.get('TRACE_FILE', os.path.join(LOG_DIR, 'traces.jsonl'))
+TRACE_FILE_MAX_BYTES = int(os.environ.get('TRACE_FILE_MAX_BYTES', str(50 * 1024 * 1024)))
+TRACE_TTL_SECONDS = int(os.environ.get('TRACE_TTL_SECONDS', str(7 * 24 * 3600)))
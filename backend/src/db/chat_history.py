@@ -1,9 +1,14 @@
 """
 chat_history.py
 Retrieve and manage chat history for sessions using LangGraph's state checkpointer.
+Message history is read from the append-only message log (see message_log.py),
+falling back to the checkpoint only to backfill threads the log has never seen,
+or has fewer messages of than the session last recorded (a failed mirror).
 """
 from typing import List, Dict, Any
 
+from src.db import message_log
+
 async def get_thread_messages(agent: Any, thread_id: str) -> List[Dict[str, Any]]:
     config = {"configurable": {"thread_id": thread_id}}
     state = await agent.aget_state(config)
@@ -11,6 +16,21 @@ async def get_thread_messages(agent: Any, thread_id: str) -> List[Dict[str, Any]
         return []
     return state.values.get("messages", [])
 
+async def get_logged_messages(agent: Any, thread_id: str, after_seq: int = -1, limit: int | None = None,
+                              expected_count: int | None = None) -> List[Dict[str, Any]]:
+    """Messages with seq > after_seq from the message log, backfilled from the checkpoint
+    on first read, or when the log holds fewer than `expected_count` (the session's
+    message_count) because a run's mirror failed."""
+    messages = await message_log.get_messages(thread_id, after_seq, limit)
+    logged = await message_log.next_seq(thread_id)
+    if logged > 0 and (expected_count is None or logged >= expected_count):
+        return messages
+
+    # The thread predates the log, or its last mirror failed — catch up from the checkpoint.
+    if await message_log.sync_thread(thread_id, await get_thread_messages(agent, thread_id)):
+        return await message_log.get_messages(thread_id, after_seq, limit)
+    return messages
+
 async def get_thread_report(agent: Any, thread_id: str) -> str | None:
     config = {"configurable": {"thread_id": thread_id}}
     state = await agent.aget_state(config)
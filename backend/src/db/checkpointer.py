@@ -0,0 +1,290 @@
+"""
+checkpointer.py
+LangGraph checkpointer backed by the shared Motor client.
+
+langgraph's MongoDBSaver is built on sync pymongo; its async methods just push
+each blocking call onto the default executor. MotorCheckpointSaver talks to the
+same collections with native async I/O over the connection pool MongoDB.connect()
+already owns, so a turn's checkpoint writes never occupy an executor thread.
+
+Documents are stored exactly as MongoDBSaver stores them (same database,
+collections, keys and serialization), so existing threads stay readable and the
+two savers can be swapped freely.
+
+Writes made under a thread lease (src/db/thread_lock.py) are fenced: once the
+lease has been taken over, aput/aput_writes raise LeaseLost instead of writing.
+
+Usage (FastAPI lifespan):
+    await MongoDB.connect()
+    memory = MotorCheckpointSaver(MongoDB.client)
+    await memory.setup()
+    GraphBuilder(checkpointer=memory, async_nodes=True).build()
+"""
+
+import functools
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.mongodb.utils import dumps_metadata, loads_metadata
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from src.db import thread_lock
+from src.logging.logger import logger
+from src.tracing import tracer
+
+DB_NAME = "checkpointing_db"
+CHECKPOINT_COLLECTION = "checkpoints"
+WRITES_COLLECTION = "checkpoint_writes"
+
+
+def _identifier(value: Any, name: str, *, optional: bool = False) -> Any:
+    """Reject non-string identifiers so they can't be read as query operators."""
+    if value is None and optional:
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid {name}: expected a string, got {type(value).__name__}.")
+    return value
+
+
+def _traced(fn):
+    """Record the call as a `checkpoint` span when the surrounding request is traced."""
+    @functools.wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        with tracer.span(f"checkpoint.{fn.__name__}", "checkpoint"):
+            return await fn(self, *args, **kwargs)
+    return wrapper
+
+
+class MotorCheckpointSaver(BaseCheckpointSaver):
+    """
+    Async-only checkpointer on top of an AsyncIOMotorClient.
+
+    Args:
+        client: The shared Motor client (MongoDB.client).
+        db_name: Database holding the checkpoint collections.
+        ttl: Optional time-to-live in seconds for checkpoints and writes.
+        serde: Optional serializer; defaults to LangGraph's JsonPlusSerializer.
+
+    The sync BaseCheckpointSaver methods are intentionally not implemented —
+    drive graphs compiled with this saver through astream()/ainvoke()/aget_state().
+    """
+
+    def __init__(
+        self,
+        client: AsyncIOMotorClient,
+        db_name: str = DB_NAME,
+        ttl: Optional[int] = None,
+        serde: SerializerProtocol | None = None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.client = client
+        self.db = client[db_name]
+        self.checkpoint_collection = self.db[CHECKPOINT_COLLECTION]
+        self.writes_collection = self.db[WRITES_COLLECTION]
+        self.ttl = ttl
+
+    async def setup(self) -> None:
+        """Create the compound (and optional TTL) indexes — idempotent, call once at startup."""
+        await self.checkpoint_collection.create_index(
+            [("thread_id", 1), ("checkpoint_ns", 1), ("checkpoint_id", -1)],
+            unique=True,
+        )
+        await self.writes_collection.create_index(
+            [("thread_id", 1), ("checkpoint_ns", 1), ("checkpoint_id", -1), ("task_id", 1), ("idx", 1)],
+            unique=True,
+        )
+        if self.ttl:
+            for col in (self.checkpoint_collection, self.writes_collection):
+                await col.create_index([("created_at", 1)], expireAfterSeconds=self.ttl)
+        logger.info("Motor checkpointer indexes ensured")
+
+    # ── Helpers ───────────────────────────────────────────────────────────────
+
+    async def _pending_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> list:
+        cursor = self.writes_collection.find(
+            {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}
+        )
+        return [
+            (wrt["task_id"], wrt["channel"], self.serde.loads_typed((wrt["type"], wrt["value"])))
+            async for wrt in cursor
+        ]
+
+    async def _to_tuple(self, doc: dict) -> CheckpointTuple:
+        thread_id     = doc["thread_id"]
+        checkpoint_ns = doc["checkpoint_ns"]
+        checkpoint_id = doc["checkpoint_id"]
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id":     thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((doc["type"], doc["checkpoint"])),
+            metadata=loads_metadata(self.serde, doc["metadata"]),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id":     thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": doc["parent_checkpoint_id"],
+                    }
+                }
+                if doc.get("parent_checkpoint_id")
+                else None
+            ),
+            pending_writes=await self._pending_writes(thread_id, checkpoint_ns, checkpoint_id),
+        )
+
+    # ── Async checkpointer API ────────────────────────────────────────────────
+
+    @_traced
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Return the requested checkpoint, or the latest one for the thread."""
+        thread_id     = _identifier(config["configurable"]["thread_id"], "thread_id")
+        checkpoint_ns = _identifier(config["configurable"].get("checkpoint_ns", ""), "checkpoint_ns")
+        checkpoint_id = _identifier(get_checkpoint_id(config), "checkpoint_id", optional=True)
+
+        query = {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns}
+        if checkpoint_id:
+            query["checkpoint_id"] = checkpoint_id
+
+        docs = await self.checkpoint_collection.find(query).sort("checkpoint_id", -1).limit(1).to_list(1)
+        if not docs:
+            return None
+        return await self._to_tuple(docs[0])
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Yield checkpoints newest first, optionally filtered by metadata."""
+        query: dict[str, Any] = {}
+        if config is not None:
+            if "thread_id" in config["configurable"]:
+                query["thread_id"] = _identifier(config["configurable"]["thread_id"], "thread_id")
+            if "checkpoint_ns" in config["configurable"]:
+                query["checkpoint_ns"] = _identifier(config["configurable"]["checkpoint_ns"], "checkpoint_ns")
+
+        if filter:
+            for key, value in filter.items():
+                if not isinstance(key, str) or key.startswith("$"):
+                    raise ValueError(f"Invalid filter key '{key}': MongoDB operator keys are not allowed.")
+                query[f"metadata.{key}"] = dumps_metadata(self.serde, value)
+
+        if before is not None:
+            before_id = _identifier(before["configurable"]["checkpoint_id"], "before checkpoint_id")
+            query["checkpoint_id"] = {"$lt": before_id}
+
+        cursor = self.checkpoint_collection.find(query).sort("checkpoint_id", -1)
+        if limit:
+            cursor = cursor.limit(limit)
+        async for doc in cursor:
+            yield await self._to_tuple(doc)
+
+    @_traced
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Upsert one checkpoint and return the config that points at it."""
+        thread_id     = _identifier(config["configurable"]["thread_id"], "thread_id")
+        checkpoint_ns = _identifier(config["configurable"]["checkpoint_ns"], "checkpoint_ns")
+        checkpoint_id = _identifier(checkpoint["id"], "checkpoint id")
+        parent_checkpoint_id = _identifier(
+            config["configurable"].get("checkpoint_id"), "checkpoint_id", optional=True
+        )
+        thread_lock.check_fence(thread_id)   # a run whose lease was taken over must not write
+
+        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        doc = {
+            "parent_checkpoint_id": parent_checkpoint_id,
+            "type":                 type_,
+            "checkpoint":           serialized_checkpoint,
+            "metadata":             dumps_metadata(self.serde, get_checkpoint_metadata(config, metadata)),
+        }
+        if self.ttl:
+            doc["created_at"] = datetime.now(tz=timezone.utc)
+
+        await self.checkpoint_collection.update_one(
+            {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id},
+            {"$set": doc},
+            upsert=True,
+        )
+        return {
+            "configurable": {
+                "thread_id":     thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint_id,
+            }
+        }
+
+    @_traced
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Store a task's intermediate writes in one bulk round trip."""
+        thread_id     = _identifier(config["configurable"]["thread_id"], "thread_id")
+        checkpoint_ns = _identifier(config["configurable"]["checkpoint_ns"], "checkpoint_ns")
+        checkpoint_id = _identifier(config["configurable"]["checkpoint_id"], "checkpoint_id")
+        _identifier(task_id, "task_id")
+        _identifier(task_path, "task_path")
+        thread_lock.check_fence(thread_id)
+
+        # Allow replacement on existing writes only for special (error/interrupt) channels.
+        set_method = "$set" if all(w[0] in WRITES_IDX_MAP for w in writes) else "$setOnInsert"
+        now = datetime.now(tz=timezone.utc)
+
+        operations = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, serialized_value = self.serde.dumps_typed(value)
+            update_doc: dict[str, Any] = {"channel": channel, "type": type_, "value": serialized_value}
+            if self.ttl:
+                update_doc["created_at"] = now
+            operations.append(UpdateOne(
+                filter={
+                    "thread_id":     thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                    "task_id":       task_id,
+                    "task_path":     task_path,
+                    "idx":           WRITES_IDX_MAP.get(channel, idx),
+                },
+                update={set_method: update_doc},
+                upsert=True,
+            ))
+
+        if operations:
+            await self.writes_collection.bulk_write(operations, ordered=False)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Delete every checkpoint and pending write of a thread."""
+        _identifier(thread_id, "thread_id")
+        await self.checkpoint_collection.delete_many({"thread_id": thread_id})
+        await self.writes_collection.delete_many({"thread_id": thread_id})
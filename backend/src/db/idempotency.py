@@ -0,0 +1,213 @@
+"""
+idempotency.py
+Idempotency-Key handling for /chat/start and /chat/resume, in the 'idempotency_keys' collection.
+
+Without a key, a client that retries a resume after a timeout, or a
+double-click, answers the next interrupt with a stale reply, and it pays for
+the LLM calls twice. A client that sends `Idempotency-Key: <key>` gets exactly
+one run per key:
+
+    {
+        "_id":         str  ("<user_id>:<key>" — keys are scoped per user),
+        "fingerprint": str  (hash of the route + request body),
+        "owner":       str  (random id of the run that claimed the key),
+        "status":      str  ("running" | "complete" | "failed"),
+        "response":    dict (the response body, once complete),
+        "error":       dict ({"status_code", "detail"}, once failed),
+        "expires_at":  datetime,
+    }
+
+The first request inserts the record and runs. A duplicate never starts a
+second run:
+  complete  the stored response is replayed
+  running   the duplicate attaches to the in-flight run and returns its result.
+            On the same worker it waits on the run itself; on another worker it
+            polls the record. It gives up with 409 after IDEMPOTENCY_WAIT_SECONDS.
+  failed    the key is free again, so a retry re-runs the request. Duplicates
+            that were already attached get the same error.
+Reusing a key with a different body is refused with 422.
+
+While a run is in flight, its record is a lease: a heartbeat keeps pushing
+expires_at forward. A record whose run died (worker crash) therefore expires, and
+the next duplicate takes the key over. Complete records are kept for
+IDEMPOTENCY_TTL_SECONDS and then removed by a TTL index.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError
+
+from src.config import IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_WAIT_SECONDS, THREAD_LOCK_TTL_SECONDS
+from src.db.mongo_client import MongoDB
+from src.logging.logger import logger
+from src.metrics import timed_mongo
+
+COLLECTION = "idempotency_keys"
+LEASE_SECONDS = THREAD_LOCK_TTL_SECONDS   # a running record expires this long after its last heartbeat
+POLL_SECONDS = 0.25                       # how often a duplicate on another worker re-reads the record
+
+
+@dataclass
+class _InFlight:
+    """A run owned by this process, for duplicates arriving on the same worker."""
+    done:     asyncio.Event = field(default_factory=asyncio.Event)
+    response: Optional[dict] = None
+    error:    Optional[HTTPException] = None
+
+
+_in_flight: dict[str, _InFlight] = {}
+_counters = {"runs": 0, "replayed": 0, "attached": 0, "taken_over": 0, "mismatched": 0}
+
+
+async def ensure_indexes() -> None:
+    """Create the TTL index that drops expired records. Idempotent."""
+    col = MongoDB.db[COLLECTION]
+    await col.create_indexes([
+        IndexModel([("expires_at", ASCENDING)], name="expires_ttl", expireAfterSeconds=0),
+    ])
+    logger.info("Idempotency key indexes ensured")
+
+
+def fingerprint(route: str, body: Any) -> str:
+    """Stable hash of what was asked for — a key may only be replayed for the same request."""
+    raw = json.dumps({"route": route, "body": body}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _error(status_code: int, detail: str) -> HTTPException:
+    return HTTPException(status_code=status_code, detail=detail)
+
+
+@timed_mongo(COLLECTION, "claim")
+async def _claim(record_id: str, fp: str, owner: str) -> Optional[dict]:
+    """Insert the running record; on a clash return the existing one instead."""
+    now = datetime.utcnow()
+    try:
+        await MongoDB.db[COLLECTION].insert_one({
+            "_id": record_id, "fingerprint": fp, "owner": owner, "status": "running",
+            "created_at": now, "expires_at": now + timedelta(seconds=LEASE_SECONDS),
+        })
+        return None
+    except DuplicateKeyError:
+        return await MongoDB.db[COLLECTION].find_one({"_id": record_id})
+
+
+@timed_mongo(COLLECTION, "finish")
+async def _finish(record_id: str, owner: str, fields: dict, keep_seconds: float) -> None:
+    await MongoDB.db[COLLECTION].update_one(
+        {"_id": record_id, "owner": owner},
+        {"$set": {**fields, "expires_at": datetime.utcnow() + timedelta(seconds=keep_seconds)}},
+    )
+
+
+async def _keep_alive(record_id: str, owner: str) -> None:
+    while True:
+        await asyncio.sleep(LEASE_SECONDS / 3)
+        try:
+            await MongoDB.db[COLLECTION].update_one(
+                {"_id": record_id, "owner": owner, "status": "running"},
+                {"$set": {"expires_at": datetime.utcnow() + timedelta(seconds=LEASE_SECONDS)}},
+            )
+        except Exception as e:
+            logger.warning(f"Idempotency heartbeat failed for {record_id}: {e}")
+
+
+async def _own(record_id: str, owner: str, handler: Callable[[], Awaitable[dict]]) -> dict:
+    """Run the request as the key's owner and store the outcome for duplicates."""
+    _counters["runs"] += 1
+    local = _in_flight[record_id] = _InFlight()
+    keep_alive = asyncio.create_task(_keep_alive(record_id, owner))
+    try:
+        local.response = await handler()
+    except Exception as e:
+        local.error = e if isinstance(e, HTTPException) else _error(500, "Internal server error")
+        # Kept only long enough for attached duplicates to see it; a retry may claim the key now.
+        await _finish(record_id, owner, {"status": "failed", "error": {
+            "status_code": local.error.status_code, "detail": local.error.detail}}, IDEMPOTENCY_WAIT_SECONDS)
+        raise
+    else:
+        await _finish(record_id, owner, {"status": "complete", "response": local.response}, IDEMPOTENCY_TTL_SECONDS)
+        return local.response
+    finally:
+        keep_alive.cancel()
+        local.done.set()
+        _in_flight.pop(record_id, None)
+
+
+async def _attach(record_id: str, deadline: float) -> Optional[dict]:
+    """Wait for another request's run of this key. Returns its response, raises its
+    error, or returns None when the record vanished or its run died (claim again)."""
+    local = _in_flight.get(record_id)
+    if local is not None:
+        try:
+            await asyncio.wait_for(local.done.wait(), max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            pass
+        else:
+            if local.error is not None:
+                raise local.error
+            return local.response
+
+    while time.monotonic() < deadline:
+        doc = await MongoDB.db[COLLECTION].find_one({"_id": record_id})
+        if doc is None or (doc["status"] == "running" and doc["expires_at"] <= datetime.utcnow()):
+            return None
+        if doc["status"] == "complete":
+            return doc["response"]
+        if doc["status"] == "failed":
+            raise _error(doc["error"]["status_code"], doc["error"]["detail"])
+        await asyncio.sleep(POLL_SECONDS)
+
+    raise HTTPException(
+        status_code=409,
+        detail="A request with this Idempotency-Key is still running",
+        headers={"Retry-After": "5"},
+    )
+
+
+async def run_once(user_id: str, key: str, fp: str, handler: Callable[[], Awaitable[dict]]) -> tuple[dict, bool]:
+    """
+    Run `handler` at most once per (user, key), across workers.
+    Returns (response, replayed) — replayed is True when the response came from
+    an earlier or concurrent request with the same key.
+    """
+    record_id = f"{user_id}:{key}"
+    owner = uuid.uuid4().hex
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        existing = await _claim(record_id, fp, owner)
+        if existing is None:
+            return await _own(record_id, owner, handler), False
+
+        if existing["fingerprint"] != fp:
+            _counters["mismatched"] += 1
+            raise _error(422, "This Idempotency-Key was already used for a different request")
+
+        if existing["status"] == "complete":
+            _counters["replayed"] += 1
+            return existing["response"], True
+
+        if existing["status"] == "failed" or existing["expires_at"] <= datetime.utcnow():
+            # The earlier attempt failed or its worker died — take the key over.
+            _counters["taken_over"] += 1
+            await MongoDB.db[COLLECTION].delete_one(
+                {"_id": record_id, "owner": existing["owner"], "status": existing["status"]})
+            continue
+
+        _counters["attached"] += 1
+        response = await _attach(record_id, deadline)
+        if response is not None:
+            return response, True
+
+
+def stats() -> dict:
+    return {"in_flight": len(_in_flight), **_counters}
@@ -0,0 +1,99 @@
+"""
+message_log.py
+Append-only log of each thread's UI messages in the 'messages' MongoDB collection.
+
+The checkpoint remains the source of truth. Reading `messages` from it, though,
+means loading and deserialising the whole latest checkpoint: personas,
+critiques and the tool-laden synthesis_thread. So after every graph run the
+chat router mirrors state["messages"] here, one document per message:
+
+    {
+        "_id":        str  ("<thread_id>:<seq>" — makes mirroring idempotent),
+        "thread_id":  str,
+        "seq":        int  (0-based position in state["messages"]),
+        "role":       str,
+        "content":    str,
+        "created_at": datetime,
+    }
+
+state["messages"] only ever grows (operator.add), so a message's position is a
+stable sequence number, and history reads become indexed range scans on
+(thread_id, seq). Threads whose messages predate the log are backfilled from
+the checkpoint the first time their history is read.
+"""
+
+from datetime import datetime
+
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
+
+from src.db.mongo_client import MongoDB
+from src.logging.logger import logger
+
+COLLECTION = "messages"
+
+
+async def ensure_indexes() -> None:
+    """Create the (thread_id, seq) index every read and append relies on. Idempotent."""
+    col = MongoDB.db[COLLECTION]
+    await col.create_indexes([
+        IndexModel([("thread_id", ASCENDING), ("seq", ASCENDING)], name="thread_seq", unique=True),
+    ])
+    logger.info("Message log indexes ensured")
+
+
+async def next_seq(thread_id: str) -> int:
+    """Sequence number the next mirrored message will get (= messages logged so far)."""
+    col = MongoDB.db[COLLECTION]
+    last = await col.find_one({"thread_id": thread_id}, {"seq": 1}, sort=[("seq", DESCENDING)])
+    return last["seq"] + 1 if last else 0
+
+
+async def sync_thread(thread_id: str, messages: list) -> int:
+    """
+    Append the messages not yet logged for this thread.
+    `messages` is the thread's full state["messages"]; only the tail past the
+    last logged seq is written. Safe to call repeatedly or concurrently.
+    Returns the number of messages appended.
+    """
+    start = await next_seq(thread_id)
+    new = messages[start:]
+    if not new:
+        return 0
+
+    now = datetime.utcnow()
+    col = MongoDB.db[COLLECTION]
+    await col.bulk_write([
+        UpdateOne(
+            {"_id": f"{thread_id}:{seq}"},
+            {"$setOnInsert": {
+                "thread_id":  thread_id,
+                "seq":        seq,
+                "role":       message.get("role"),
+                "content":    message.get("content"),
+                "created_at": now,
+            }},
+            upsert=True,
+        )
+        for seq, message in enumerate(new, start=start)
+    ], ordered=False)
+    logger.info(f"Message log: {len(new)} message(s) appended for thread: {thread_id}")
+    return len(new)
+
+
+async def get_messages(thread_id: str, after_seq: int = -1, limit: int | None = None) -> list:
+    """Return logged messages with seq > after_seq, oldest first, as {seq, role, content}."""
+    col = MongoDB.db[COLLECTION]
+    cursor = col.find(
+        {"thread_id": thread_id, "seq": {"$gt": after_seq}},
+        {"_id": 0, "seq": 1, "role": 1, "content": 1},
+    ).sort("seq", ASCENDING)
+    if limit:
+        cursor = cursor.limit(limit)
+    return await cursor.to_list(None)
+
+
+async def delete_thread(thread_id: str) -> int:
+    """Remove a thread's logged messages. Returns the number deleted."""
+    col = MongoDB.db[COLLECTION]
+    result = await col.delete_many({"thread_id": thread_id})
+    return result.deleted_count
@@ -1,5 +1,10 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from src.config import MONGODB_URI
+from src.config import (
+    MONGODB_MAX_IDLE_TIME_MS,
+    MONGODB_MAX_POOL_SIZE,
+    MONGODB_MIN_POOL_SIZE,
+    MONGODB_URI,
+)
 from src.logging.logger import logger
 
 
@@ -17,10 +22,19 @@ class MongoDB:
 
     @classmethod
     async def connect(cls):
-        """Create the client and select the application database."""
-        cls.client = AsyncIOMotorClient(MONGODB_URI)
+        """Create the client and select the application database.
+        The client's pool is shared by every store and by the checkpointer."""
+        cls.client = AsyncIOMotorClient(
+            MONGODB_URI,
+            maxPoolSize=MONGODB_MAX_POOL_SIZE,
+            minPoolSize=MONGODB_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGODB_MAX_IDLE_TIME_MS,
+        )
         cls.db = cls.client["research_agent"]
-        logger.info("MongoDB connected — database: research_agent")
+        logger.info(
+            f"MongoDB connected — database: research_agent "
+            f"(pool {MONGODB_MIN_POOL_SIZE}-{MONGODB_MAX_POOL_SIZE})"
+        )
 
     @classmethod
     async def close(cls):
@@ -9,20 +9,60 @@ A session document:
         "user_id":     str  (Firebase uid — scopes all queries),
         "title":       str  (display name shown in sidebar),
         "agent_phase": str  ("idle" | "waiting" | "complete"),
+        "message_count": int (UI messages in the checkpoint after the last run —
+                              lets /history notice a message log that fell behind),
         "created_at":  datetime,
         "updated_at":  datetime,
     }
+
+The sidebar listing is keyset-paginated on (updated_at, _id), both descending,
+and served by the compound index created in ensure_indexes().
 """
 
+import base64
 import uuid
 from datetime import datetime
 
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
 from src.db.mongo_client import MongoDB
 from src.logging.logger import logger
+from src.metrics import timed_mongo
 
 COLLECTION = "sessions"
 
+# Only what the sidebar renders — keeps list pages small regardless of schema growth.
+SIDEBAR_PROJECTION = {"thread_id": 1, "title": 1, "agent_phase": 1, "created_at": 1, "updated_at": 1}
+
+
+async def ensure_indexes() -> None:
+    """Create the indexes this collection's queries rely on. Idempotent."""
+    col = MongoDB.db[COLLECTION]
+    await col.create_indexes([
+        IndexModel(
+            [("user_id", ASCENDING), ("updated_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_updated_at",
+        ),
+    ])
+    logger.info("Session indexes ensured")
+
+
+def encode_cursor(session: dict) -> str:
+    """Opaque cursor pointing just past this session in the newest-first listing."""
+    raw = f"{session['updated_at'].isoformat()}|{session['_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
 
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Inverse of encode_cursor(). Raises ValueError on a malformed cursor."""
+    try:
+        updated_at, session_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(updated_at), session_id
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+@timed_mongo(COLLECTION, "create")
 async def create_session(user_id: str, title: str) -> dict:
     """
     Create a new session for a user and return the session document.
@@ -43,19 +83,38 @@ async def create_session(user_id: str, title: str) -> dict:
     return session
 
 
-async def get_sessions(user_id: str) -> list:
+@timed_mongo(COLLECTION, "list")
+async def get_sessions(user_id: str, cursor: str | None = None, limit: int = 50) -> tuple[list, str | None]:
     """
-    Return all sessions belonging to this user, sorted newest first.
-    Used to populate the sidebar.
+    Return one page of this user's sessions, newest first, plus the cursor of
+    the next page (None on the last page). Used to populate the sidebar.
+
+    Keyset pagination: each page resumes strictly after the (updated_at, _id)
+    of the previous page's last session, so a page costs the same index walk
+    no matter how deep into the listing it is.
+    Raises ValueError if the cursor is malformed.
     """
+    query = {"user_id": user_id}
+    if cursor:
+        updated_at, session_id = decode_cursor(cursor)
+        query["$or"] = [
+            {"updated_at": {"$lt": updated_at}},
+            {"updated_at": updated_at, "_id": {"$lt": session_id}},
+        ]
+
     col = MongoDB.db[COLLECTION]
-    sessions = await col.find(
-        {"user_id": user_id}
-    ).sort("updated_at", -1).to_list(100)
+    sessions = await col.find(query, SIDEBAR_PROJECTION).sort(
+        [("updated_at", DESCENDING), ("_id", DESCENDING)]
+    ).limit(limit + 1).to_list(limit + 1)
+
+    # One extra document tells us whether another page exists.
+    next_cursor = encode_cursor(sessions[limit - 1]) if len(sessions) > limit else None
+    sessions = sessions[:limit]
     logger.info(f"Fetched {len(sessions)} sessions for user: {user_id}")
-    return sessions
+    return sessions, next_cursor
 
 
+@timed_mongo(COLLECTION, "get")
 async def get_session(session_id: str, user_id: str) -> dict | None:
     """
     Return a single session document.
@@ -70,6 +129,7 @@ async def get_session(session_id: str, user_id: str) -> dict | None:
     return session
 
 
+@timed_mongo(COLLECTION, "update")
 async def update_session(session_id: str, user_id: str, updates: dict) -> dict | None:
     """
     Update specific fields on a session document.
@@ -85,6 +145,7 @@ async def update_session(session_id: str, user_id: str, updates: dict) -> dict |
     return await get_session(session_id, user_id)
 
 
+@timed_mongo(COLLECTION, "delete")
 async def delete_session(session_id: str, user_id: str) -> bool:
     """
     Delete a session document.
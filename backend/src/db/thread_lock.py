@@ -0,0 +1,172 @@
+"""
+thread_lock.py
+Per-thread lease lock in the 'thread_locks' MongoDB collection, shared by every worker.
+
+Admission control already keeps one turn per thread within a process. Two
+uvicorn workers (or two API replicas), though, could both resume the same
+thread, and both would run the segment and write interleaved checkpoints. The
+chat router holds this lease while a turn runs:
+
+    {
+        "_id":        str       (thread_id),
+        "owner":      str|None  (random id of the holding run; None once released),
+        "token":      int       (fencing token — incremented on every acquisition),
+        "expires_at": datetime  (lease end; renewed every TTL/3 while the turn runs),
+    }
+
+A lease that is not renewed, because its worker crashed or stalled, expires after
+THREAD_LOCK_TTL_SECONDS, and the next request takes the thread over with a
+higher token. The stalled run may still wake up and try to write, so the
+checkpointer calls check_fence() before every write. The check costs no round
+trip: each run knows how long its lease is good for, because another worker can
+only take it over once it has expired. The lease counts as lost, and the write
+fails with LeaseLost, once a renewal found it taken over or the local deadline
+(the lease end as of the last successful renewal, less CLOCK_SKEW_SECONDS) has
+passed. A run that stalls past its lease therefore never overwrites the new
+owner's checkpoints, whether or not its renew loop ran in between.
+
+Documents outlive their lease by a day, so tokens keep increasing across turns,
+and are then removed by a TTL index.
+"""
+
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import HTTPException
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.config import THREAD_LOCK_TTL_SECONDS
+from src.db.mongo_client import MongoDB
+from src.logging.logger import logger
+from src.metrics import timed_mongo
+
+COLLECTION = "thread_locks"
+RETENTION_SECONDS = 24 * 3600   # how long a released lock document (and its token) is kept
+CLOCK_SKEW_SECONDS = 1.0        # allowance for worker clocks disagreeing on when a lease ends
+
+
+class LeaseLost(Exception):
+    """The run's lease was taken over; its writes must not land."""
+
+
+@dataclass
+class Lease:
+    thread_id: str
+    owner:     str
+    token:     int
+    deadline:  float        # time.monotonic() after which another run may hold the thread
+    lost:      bool = False
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+
+# The lease held by the current run — read by the checkpointer's fence check.
+_current: ContextVar[Optional[Lease]] = ContextVar("thread_lease", default=None)
+
+
+async def ensure_indexes() -> None:
+    """Create the TTL index that purges long-released locks. Idempotent."""
+    col = MongoDB.db[COLLECTION]
+    await col.create_indexes([
+        IndexModel([("expires_at", ASCENDING)], name="expires_ttl", expireAfterSeconds=RETENTION_SECONDS),
+    ])
+    logger.info("Thread lock indexes ensured")
+
+
+@timed_mongo(COLLECTION, "acquire")
+async def acquire(thread_id: str, ttl: float = THREAD_LOCK_TTL_SECONDS) -> Optional[Lease]:
+    """Take the lease if it is free or expired; None while another run holds it."""
+    owner = uuid.uuid4().hex
+    started = time.monotonic()
+    now = datetime.utcnow()
+    try:
+        doc = await MongoDB.db[COLLECTION].find_one_and_update(
+            {"_id": thread_id, "$or": [{"owner": None}, {"expires_at": {"$lte": now}}]},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=ttl)}, "$inc": {"token": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+    except DuplicateKeyError:
+        return None   # the document exists and is held — the upsert's insert collided
+    return Lease(thread_id=thread_id, owner=owner, token=doc["token"],
+                 deadline=started + ttl - CLOCK_SKEW_SECONDS)
+
+
+@timed_mongo(COLLECTION, "renew")
+async def renew(lease: Lease, ttl: float = THREAD_LOCK_TTL_SECONDS) -> bool:
+    """Extend the lease; False (and lease.lost) if it has been taken over."""
+    started = time.monotonic()
+    result = await MongoDB.db[COLLECTION].update_one(
+        {"_id": lease.thread_id, "owner": lease.owner, "token": lease.token},
+        {"$set": {"expires_at": datetime.utcnow() + timedelta(seconds=ttl)}},
+    )
+    if result.matched_count == 0:
+        lease.lost = True
+    elif not lease.lost:
+        lease.deadline = started + ttl - CLOCK_SKEW_SECONDS
+    return not lease.lost
+
+
+@timed_mongo(COLLECTION, "release")
+async def release(lease: Lease) -> None:
+    """Free the lease (if still ours), keeping the token for the next holder."""
+    await MongoDB.db[COLLECTION].update_one(
+        {"_id": lease.thread_id, "owner": lease.owner, "token": lease.token},
+        {"$set": {"owner": None, "expires_at": datetime.utcnow()}},
+    )
+
+
+def check_fence(thread_id: str) -> None:
+    """Raise LeaseLost if the current run's lease on this thread was taken over or
+    may have been (its deadline passed). No I/O. A no-op outside hold() (scripts,
+    benchmarks, other threads)."""
+    lease = _current.get()
+    if lease is None or lease.thread_id != thread_id:
+        return
+    if not lease.lost and lease.expired():
+        lease.lost = True
+    if lease.lost:
+        raise LeaseLost(f"Lease on thread {thread_id} (token {lease.token}) was taken over or expired")
+
+
+async def _keep_alive(lease: Lease, ttl: float) -> None:
+    while not lease.lost:
+        await asyncio.sleep(ttl / 3)
+        try:
+            if not await renew(lease, ttl):
+                logger.warning(f"Lease on thread {lease.thread_id} lost (token {lease.token})")
+        except Exception as e:
+            # A missed renewal is not fatal — the lease still has two thirds of its TTL.
+            logger.warning(f"Lease renewal failed for thread {lease.thread_id}: {e}")
+
+
+@asynccontextmanager
+async def hold(thread_id: str, ttl: float = THREAD_LOCK_TTL_SECONDS):
+    """Hold the thread's lease for the block, renewing it in the background.
+    Raises 429 + Retry-After while another run (on any worker) holds it."""
+    lease = await acquire(thread_id, ttl)
+    if lease is None:
+        raise HTTPException(
+            status_code=429,
+            detail="A turn is already running for this conversation",
+            headers={"Retry-After": "2"},
+        )
+    keep_alive = asyncio.create_task(_keep_alive(lease, ttl))
+    token = _current.set(lease)
+    try:
+        yield lease
+    finally:
+        _current.reset(token)
+        keep_alive.cancel()
+        try:
+            await release(lease)
+        except Exception as e:
+            logger.warning(f"Lease release failed for thread {thread_id} — it expires in {ttl:.0f}s: {e}")
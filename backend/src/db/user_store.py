@@ -1,9 +1,21 @@
 import uuid
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
 from src.db.mongo_client import MongoDB
 from src.logging.logger import logger
 
 COLLECTION = "users"
 
+async def ensure_indexes() -> None:
+    """Create the unique email index used by login and registration. Idempotent."""
+    col = MongoDB.db[COLLECTION]
+    try:
+        await col.create_indexes([IndexModel([("email", ASCENDING)], name="email_unique", unique=True)])
+        logger.info("User indexes ensured")
+    except OperationFailure as e:
+        # Existing duplicate emails block the unique index — keep serving, but say so loudly.
+        logger.error(f"Could not create unique email index on users: {e}")
+
 async def get_user_by_email(email: str) -> dict | None:
     col = MongoDB.db[COLLECTION]
     return await col.find_one({"email": email})
@@ -0,0 +1,149 @@
+"""
+jobs.py
+Bounded in-process worker pool for running gauntlet segments in the background.
+
+The chat router enqueues a graph run and answers 202 Accepted with a job id
+straight away; clients then long-poll GET /chat/jobs/{job_id}. A fixed number
+of worker tasks drain the queue, so at most JOB_WORKERS segments run at once
+per process and at most JOB_QUEUE_SIZE wait behind them.
+
+Job records live in memory only and are dropped JOB_RESULT_TTL_SECONDS after
+they finish — a job id is only valid on the worker process that issued it.
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+
+from src.config import JOB_QUEUE_SIZE, JOB_RESULT_TTL_SECONDS, JOB_WORKERS
+from src.logging.context import log_context
+from src.logging.logger import logger
+from src.tracing import tracer
+
+JobRunner = Callable[[], Awaitable[dict]]
+
+
+@dataclass
+class Job:
+    job_id:      str
+    user_id:     str
+    thread_id:   str
+    runner:      JobRunner
+    status:      str = "queued"          # queued | running | complete | failed
+    result:      Optional[dict] = None
+    error:       Optional[str] = None
+    created_at:  float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+    done:        asyncio.Event = field(default_factory=asyncio.Event)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id":    self.job_id,
+            "thread_id": self.thread_id,
+            "status":    self.status,
+            "result":    self.result,
+            "error":     self.error,
+        }
+
+
+class JobManager:
+    """Owns the job queue, its worker tasks and the table of recent jobs."""
+
+    def __init__(self, workers: int = JOB_WORKERS, queue_size: int = JOB_QUEUE_SIZE,
+                 result_ttl: int = JOB_RESULT_TTL_SECONDS):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.result_ttl = result_ttl
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self._jobs: dict[str, Job] = {}
+
+    async def start(self) -> None:
+        """Spawn the worker tasks — call once from the FastAPI lifespan."""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"Job pool started — {self.workers} workers, queue size {self.queue_size}")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Job pool stopped")
+
+    def submit(self, user_id: str, thread_id: str, runner: JobRunner) -> Job:
+        """Enqueue a run. Raises 503 when the pool is not running or the queue is full."""
+        if self._queue is None:
+            raise HTTPException(status_code=503, detail="Background jobs are not available")
+        self._evict_expired()
+
+        job = Job(job_id=str(uuid.uuid4()), user_id=user_id, thread_id=thread_id, runner=runner)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many queued requests, please retry shortly",
+                headers={"Retry-After": "5"},
+            )
+        self._jobs[job.job_id] = job
+        logger.info(f"Job queued: {job.job_id} for thread: {thread_id}")
+        return job
+
+    def get(self, job_id: str, user_id: str) -> Optional[Job]:
+        """Return the job if it exists and belongs to this user."""
+        job = self._jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    async def wait(self, job: Job, timeout: float) -> Job:
+        """Block until the job finishes or `timeout` seconds pass, whichever is first."""
+        if timeout > 0 and not job.done.is_set():
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    def stats(self) -> dict:
+        return {
+            "workers":   self.workers,
+            "queued":    self._queue.qsize() if self._queue else 0,
+            "running":   sum(1 for j in self._jobs.values() if j.status == "running"),
+            "tracked":   len(self._jobs),
+        }
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            job: Job = await self._queue.get()
+            job.status = "running"
+            try:
+                # Worker tasks sit outside any request, so each job is its own trace.
+                with log_context(request_id=job.job_id, user_id=job.user_id, thread_id=job.thread_id), \
+                        tracer.root("background job", "job", thread_id=job.thread_id, job_id=job.job_id):
+                    job.result = await job.runner()
+                job.status = "complete"
+            except HTTPException as e:
+                job.status, job.error = "failed", str(e.detail)
+            except Exception as e:
+                logger.error(f"Job {job.job_id} failed: {e}", exc_info=True)
+                job.status, job.error = "failed", "Internal server error during agent execution."
+            finally:
+                job.finished_at = time.monotonic()
+                job.done.set()
+                self._queue.task_done()
+
+    def _evict_expired(self) -> None:
+        cutoff = time.monotonic() - self.result_ttl
+        expired = [jid for jid, j in self._jobs.items() if j.finished_at and j.finished_at < cutoff]
+        for jid in expired:
+            del self._jobs[jid]
+
+
+# Process-wide instance — started/stopped by the FastAPI lifespan.
+job_manager = JobManager()
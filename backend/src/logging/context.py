@@ -0,0 +1,72 @@
+"""
+context.py
+Per-request fields stamped onto every log record (see logger.py).
+
+request_id, user_id and thread_id live in ContextVars, so they follow a request
+through awaits, asyncio tasks and executor threads without being passed around:
+
+    RequestContextMiddleware   — assigns request_id (honours an incoming X-Request-ID)
+    bind_log_context(...)      — adds user_id / thread_id once they are known
+    log_context(...)           — scoped variant for work outside a request (jobs)
+"""
+
+import re
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+user_id_var: ContextVar[Optional[str]] = ContextVar("user_id", default=None)
+thread_id_var: ContextVar[Optional[str]] = ContextVar("thread_id", default=None)
+
+_VARS = {"request_id": request_id_var, "user_id": user_id_var, "thread_id": thread_id_var}
+
+# Client-supplied ids are echoed into logs and headers — keep them short and inert.
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+def current_context() -> dict:
+    """The bound fields, for stamping onto a log record."""
+    return {name: var.get() for name, var in _VARS.items()}
+
+
+def bind_log_context(**fields: Optional[str]) -> None:
+    """Set request_id / user_id / thread_id for the rest of the current context."""
+    for name, value in fields.items():
+        _VARS[name].set(value)
+
+
+@contextmanager
+def log_context(**fields: Optional[str]):
+    """Set fields for the duration of the block only."""
+    tokens = [(_VARS[name], _VARS[name].set(value)) for name, value in fields.items()]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware: gives each HTTP request a request id (X-Request-ID in,
+    X-Request-ID out), with user / thread fields starting out empty."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope.get("headers") or []).get(b"x-request-id", b"").decode("latin-1")
+        request_id = incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex[:16]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers") or []) + [(b"x-request-id", request_id.encode())]
+            await send(message)
+
+        with log_context(request_id=request_id, user_id=None, thread_id=None):
+            await self.app(scope, receive, send_wrapper)
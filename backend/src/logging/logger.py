@@ -1,26 +1,153 @@
+"""
+logger.py
+Process-wide logging setup: non-blocking, JSON-structured, rotated.
+
+Callers only ever touch a QueueHandler, which stamps the record with the bound
+request_id / user_id / thread_id (see context.py) and drops it on an in-memory
+queue. A QueueListener thread does the formatting and the disk I/O, so a
+logger.info() on the event loop never waits on the file system.
+
+The file is LOG_DIR/research_agent.log (LOG_DIR is anchored to backend/, not the
+cwd), one JSON object per line. It rolls over to numbered backups once it passes
+LOG_FILE_MAX_BYTES or is LOG_ROTATE_HOURS old, keeping LOG_BACKUP_COUNT of them.
+LOG_LEVEL sets the root level; LOG_LEVELS overrides it per module, e.g.
+"src.routers=DEBUG,httpx=WARNING".
+
+Import the named logger in other modules:
+    from src.logging.logger import logger
+"""
+
+import atexit
+import copy
+import json
 import logging
 import os
-from datetime import datetime
-
-LOG_FILE=f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
-
-#cwd point to where you ran the script
-logs_dir = os.path.join(os.getcwd(), "logs")
-os.makedirs(logs_dir, exist_ok=True)
-LOG_FILE_PATH = os.path.join(logs_dir, LOG_FILE)
-
-#All log messages of current exec will be written into the file at LOG_FILE_PATH.
-'''
-Level: Set to logging.INFO (or configurable) to capture informational messages and above.
-Format: A custom formatter for log messages, including timestamps, log levels, module names, and messages (e.g., "%(asctime)s - %(name)s - %(levelname)s - %(message)s").
-
-you're importing the standard logging module itself (which is imported at the top of logger.py). Since logger.py calls logging.basicConfig() when the module is loaded, it configures the root logger globally for the entire application.
-'''
-logging.basicConfig(
-    filename=LOG_FILE_PATH,
-    format="[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
+import queue
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from src.config import (
+    LOG_BACKUP_COUNT,
+    LOG_DIR,
+    LOG_FILE_MAX_BYTES,
+    LOG_LEVEL,
+    LOG_LEVELS,
+    LOG_ROTATE_HOURS,
 )
+from src.logging.context import current_context
+
+LOG_FILE_PATH = os.path.join(LOG_DIR, "research_agent.log")
+
+# Record attributes that are part of every LogRecord — anything else was passed
+# through `extra=` and is copied into the JSON line.
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class ContextQueueHandler(QueueHandler):
+    """QueueHandler that captures the context fields on the calling thread and
+    hands the listener a picklable, pre-rendered record."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)   # other handlers may still see the original
+        for name, value in current_context().items():
+            if value is not None and not hasattr(record, name):
+                setattr(record, name, value)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts":     datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level":  record.levelname,
+            "logger": record.name,
+            "msg":    record.getMessage(),
+            "module": record.module,
+            "line":   record.lineno,
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SizeAndTimeRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that also rolls over once the current file is
+    `interval_seconds` old; backups are numbered either way."""
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int, interval_seconds: float):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        self.interval_seconds = interval_seconds
+        opened = os.path.getmtime(filename) if os.path.exists(filename) else time.time()
+        self.rollover_at = opened + interval_seconds
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.interval_seconds > 0 and time.time() >= self.rollover_at and os.path.exists(self.baseFilename):
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self.rollover_at = time.time() + self.interval_seconds
+
+
+def _parse_levels(spec: str) -> dict[str, str]:
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+_listener: QueueListener | None = None
+
+
+def configure_logging() -> QueueListener:
+    """Route the root logger through the queue to the rotating JSON file. Idempotent."""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+    file_handler = SizeAndTimeRotatingFileHandler(
+        LOG_FILE_PATH, LOG_FILE_MAX_BYTES, LOG_BACKUP_COUNT, LOG_ROTATE_HOURS * 3600,
+    )
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(shutdown_logging)   # drain what is still queued on exit
+
+    root = logging.getLogger()
+    root.addHandler(ContextQueueHandler(log_queue))
+    root.setLevel(LOG_LEVEL.upper())
+    for name, level in _parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = listener
+    return listener
+
+
+def shutdown_logging() -> None:
+    """Flush the queue and stop the listener thread. Safe to call more than once."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+configure_logging()
 
 # Named logger — import this in other modules:
 # from src.logging.logger import logger
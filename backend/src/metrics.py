@@ -0,0 +1,329 @@
+"""
+metrics.py
+In-process metrics registry with Prometheus text exposition.
+
+No client library or external service: counters and histograms live in
+process memory and GET /metrics renders them in the Prometheus text format,
+ready to be scraped. Instrumented today:
+
+  gauntlet_node_duration_seconds  — every graph node (wrapped in GraphBuilder.build)
+  llm_request_duration_seconds,
+  llm_tokens_total                — every chat-model call made through get_llm()
+  tool_call_duration_seconds      — every synthesis tool call
+  tool_step_duration_seconds      — every synthesis tool step (wall vs serial)
+  mongo_operation_duration_seconds — session_store operations
+
+Usage:
+    from src.metrics import NODE_SECONDS
+    NODE_SECONDS.observe(0.42, node="expert", status="ok")
+"""
+
+import asyncio
+import functools
+import math
+import threading
+import time
+from typing import Any, Callable, Iterable, Optional, Sequence
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.tracing import span_status, tracer
+
+# Latency buckets (seconds) sized for LLM calls as well as fast Mongo reads.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, key)} {_number(v)}" for key, v in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: dict[tuple, list] = {}   # key → [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        lines = self.header()
+        for key, values in sorted(series.items()):
+            for bound, count in zip(self.buckets, values):
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(values[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {values[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Owns every metric plus gauge collectors read at scrape time."""
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors: list[tuple[str, Callable[[], dict]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_stats(self, prefix: str, stats: Callable[[], dict]) -> None:
+        """Export the numeric fields of a component's stats() dict as gauges named <prefix>_<field>."""
+        self._collectors.append((prefix, stats))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines += metric.render()
+        for prefix, stats in self._collectors:
+            try:
+                values = stats()
+            except Exception:
+                continue   # a broken collector must not take down the scrape
+            for field, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"{prefix}_{field}"
+                lines += [f"# TYPE {name} gauge", f"{name} {_number(value)}"]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+NODE_SECONDS = registry.histogram(
+    "gauntlet_node_duration_seconds", "Wall-clock time of one graph node execution.", ["node", "status"])
+NODE_ERRORS = registry.counter(
+    "gauntlet_node_errors_total", "Graph node executions that raised.", ["node"])
+LLM_SECONDS = registry.histogram(
+    "llm_request_duration_seconds", "Latency of one chat-model call.", ["model", "status"])
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total", "Tokens sent to / received from chat models.", ["model", "kind"])
+LLM_ERRORS = registry.counter(
+    "llm_errors_total", "Chat-model calls that failed.", ["model"])
+TOOL_SECONDS = registry.histogram(
+    "tool_call_duration_seconds", "Latency of one tool call in the synthesis loop.", ["tool", "status"])
+TOOL_STEP_SECONDS = registry.histogram(
+    "tool_step_duration_seconds",
+    "One synthesis tool step: its wall-clock, or the sum of its calls' durations (serial).", ["measure"])
+MONGO_SECONDS = registry.histogram(
+    "mongo_operation_duration_seconds", "Latency of one MongoDB store operation.",
+    ["collection", "operation", "status"])
+
+
+def timed_mongo(collection: str, operation: str):
+    """Decorator recording an async store function's latency in MONGO_SECONDS
+    (and as a `mongo` span when the call is traced)."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            status = "ok"
+            try:
+                with tracer.span(f"{collection}.{operation}", "mongo"):
+                    return await fn(*args, **kwargs)
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                MONGO_SECONDS.observe(time.perf_counter() - started,
+                                      collection=collection, operation=operation, status=status)
+        return wrapper
+    return decorator
+
+
+def _graph_step() -> Optional[int]:
+    """The LangGraph super-step the calling node belongs to, if running inside a graph."""
+    try:
+        from langgraph.config import get_config
+        return get_config()["metadata"].get("langgraph_step")
+    except Exception:
+        return None
+
+
+def instrument_node(name: str, node: Callable) -> Callable:
+    """Wrap a graph node so each execution lands in NODE_SECONDS / NODE_ERRORS and,
+    when the run is traced, in a `node` span under its super-step's `step` span.
+    functools.wraps keeps the signature visible, so LangGraph still passes
+    `config` to nodes that accept it."""
+    def enter():
+        step = _graph_step()
+        span = tracer.start(name, "node", parent=tracer.step(step) if step is not None else None, step=step)
+        return time.perf_counter(), span, tracer.activate(span)
+
+    def leave(started: float, span, token, status: str) -> None:
+        tracer.deactivate(token)
+        tracer.finish(span, status)
+        NODE_SECONDS.observe(time.perf_counter() - started, node=name, status=status)
+        if status == "error":
+            NODE_ERRORS.inc(node=name)
+
+    if asyncio.iscoroutinefunction(node):
+        @functools.wraps(node)
+        async def async_wrapper(*args, **kwargs):
+            started, span, token = enter()
+            try:
+                result = await node(*args, **kwargs)
+            except BaseException as e:
+                leave(started, span, token, span_status(e))
+                raise
+            leave(started, span, token, "ok")
+            return result
+        return async_wrapper
+
+    @functools.wraps(node)
+    def wrapper(*args, **kwargs):
+        started, span, token = enter()
+        try:
+            result = node(*args, **kwargs)
+        except BaseException as e:
+            leave(started, span, token, span_status(e))
+            raise
+        leave(started, span, token, "ok")
+        return result
+    return wrapper
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """LangChain callback attached to every client the LLM registry builds.
+    Records per-call latency, prompt/completion tokens and failures by model,
+    plus an `llm` span when the call is traced."""
+
+    run_inline = True   # cheap; and keeps the caller's context (its current span) visible
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: dict[UUID, tuple[float, str, Any]] = {}
+
+    def _start(self, run_id: UUID, serialized: Optional[dict], kwargs: dict) -> None:
+        params = kwargs.get("invocation_params") or {}
+        metadata = kwargs.get("metadata") or {}
+        model = (params.get("model") or params.get("model_name")
+                 or metadata.get("ls_model_name") or "unknown")
+        span = tracer.start(f"llm {model}", "llm", model=str(model))
+        with self._lock:
+            self._inflight[run_id] = (time.perf_counter(), str(model), span)
+
+    def _finish(self, run_id: UUID) -> tuple[float, str, Any]:
+        with self._lock:
+            started, model, span = self._inflight.pop(run_id, (None, "unknown", None))
+        return (time.perf_counter() - started if started is not None else 0.0), model, span
+
+    def on_chat_model_start(self, serialized: dict, messages: list, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, serialized, kwargs)
+
+    def on_llm_start(self, serialized: dict, prompts: list, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, serialized, kwargs)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        elapsed, model, span = self._finish(run_id)
+        LLM_SECONDS.observe(elapsed, model=model, status="ok")
+        prompt, completion = token_usage(response)
+        if span is not None:
+            span.attrs.update(prompt_tokens=prompt, completion_tokens=completion)
+            tracer.finish(span, seconds=elapsed)
+        if prompt:
+            LLM_TOKENS.inc(prompt, model=model, kind="prompt")
+        if completion:
+            LLM_TOKENS.inc(completion, model=model, kind="completion")
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        elapsed, model, span = self._finish(run_id)
+        LLM_SECONDS.observe(elapsed, model=model, status="error")
+        LLM_ERRORS.inc(model=model)
+        if span is not None:
+            span.attrs["error"] = type(error).__name__
+            tracer.finish(span, "error", seconds=elapsed)
+
+
+def token_usage(response: LLMResult) -> tuple[int, int]:
+    """Prompt and completion tokens: per-message usage_metadata first, then the
+    provider's llm_output["token_usage"] (what ChatGroq reports)."""
+    prompt = completion = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt += usage.get("input_tokens", 0)
+                completion += usage.get("output_tokens", 0)
+    if not (prompt or completion):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt = usage.get("prompt_tokens", 0) or 0
+        completion = usage.get("completion_tokens", 0) or 0
+    return prompt, completion
+
+
+# One handler shared by every client the registry builds.
+llm_metrics_callback = LLMMetricsCallback()
@@ -0,0 +1,90 @@
+"""
+password_pool.py
+Bounded thread pool for password hashing and verification.
+
+PBKDF2-SHA256 at 390,000 iterations costs hundreds of milliseconds of CPU per
+call. Run inline in an async route, that stalls the event loop and every chat
+request on the worker with it. /auth/register and /auth/login hand the work to
+this pool instead. hashlib and bcrypt release the GIL while they hash, so the
+workers really do run in parallel with the loop.
+
+Admission control: at most HASH_WORKERS calls run and HASH_QUEUE_SIZE wait.
+Anything beyond that is refused with 503 + Retry-After straight away, rather
+than queueing logins whose clients will have timed out by the time they run.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from fastapi import HTTPException
+
+from src.config import HASH_QUEUE_SIZE, HASH_WORKERS
+from src.logging.logger import logger
+
+
+class PasswordHashPool:
+    """Runs blocking hash functions off the event loop, with a cap on pending calls."""
+
+    def __init__(self, workers: int = HASH_WORKERS, queue_size: int = HASH_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+        self._pending = 0
+        self._counters = {"completed": 0, "rejected": 0, "peak_pending": 0}
+        self._busy_seconds = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run fn(*args) on the pool. Raises 503 when the pool and its queue are full."""
+        if self._pending >= self.workers + self.queue_size:
+            self._counters["rejected"] += 1
+            logger.warning(f"Password hash pool saturated — {self._pending} pending, rejecting")
+            raise HTTPException(
+                status_code=503,
+                detail="Authentication is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        self._counters["peak_pending"] = max(self._counters["peak_pending"], self._pending)
+
+        # Written by the worker before its future completes; only the loop thread
+        # (in _release) adds it to the totals, so no counter is shared across threads.
+        elapsed = [0.0]
+
+        def timed():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                elapsed[0] = time.perf_counter() - started
+
+        future = self._executor.submit(timed)
+        # Release the slot when the work actually finishes, not when the caller
+        # stops waiting — a disconnected client's hash still occupies a worker.
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release, elapsed[0]))
+        return await asyncio.wrap_future(future)
+
+    def _release(self, busy_seconds: float) -> None:
+        self._pending -= 1
+        self._counters["completed"] += 1
+        self._busy_seconds += busy_seconds
+
+    def stats(self) -> dict:
+        completed = self._counters["completed"]
+        return {
+            "workers":         self.workers,
+            "queue_size":      self.queue_size,
+            "pending":         self._pending,
+            **self._counters,
+            "avg_hash_ms":     round(1000 * self._busy_seconds / completed, 1) if completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Process-wide instance — shut down by the FastAPI lifespan.
+password_pool = PasswordHashPool()
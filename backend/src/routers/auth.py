@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from src.auth import get_current_user, get_password_hash, verify_password, create_access_token
+from pymongo.errors import DuplicateKeyError
+from src.auth import get_bearer_token, get_current_user, aget_password_hash, averify_password, create_access_token, revoke_token
 from src.db.user_store import get_user_by_email, create_user
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -15,8 +16,12 @@ async def register(creds: UserCredentials):
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
         
-    hashed_pwd = get_password_hash(creds.password)
-    user = await create_user(creds.email, hashed_pwd)
+    hashed_pwd = await aget_password_hash(creds.password)
+    try:
+        user = await create_user(creds.email, hashed_pwd)
+    except DuplicateKeyError:
+        # Lost a race with a concurrent registration — the unique index caught it.
+        raise HTTPException(status_code=400, detail="Email already registered")
     
     # Returning the payload matching pyrebase so frontend UI handles it smoothly
     access_token = create_access_token(data={"sub": user["uid"], "email": user["email"]})
@@ -25,7 +30,7 @@ async def register(creds: UserCredentials):
 @router.post("/login")
 async def login(creds: UserCredentials):
     user = await get_user_by_email(creds.email)
-    if not user or not verify_password(creds.password, user["hashed_password"]):
+    if not user or not await averify_password(creds.password, user["hashed_password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -40,3 +45,8 @@ def auth_verify(user: dict = Depends(get_current_user)):
         "uid": user["uid"],
         "email": user.get("email")
     }
+
+@router.post("/logout")
+def logout(token: str = Depends(get_bearer_token), user: dict = Depends(get_current_user)):
+    revoke_token(token)
+    return {"status": "ok"}
@@ -1,14 +1,37 @@
+import asyncio
+import json
 import logging
-from fastapi import APIRouter, Depends, HTTPException, Request
+import re
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from langgraph.types import Command
 from pydantic import BaseModel
 
+from src.admission import admission
 from src.auth import get_current_user
+from src.db import idempotency, message_log, thread_lock
 from src.db.session_store import create_session, get_session, update_session
+from src.jobs import job_manager
+from src.tracing import tracer
+from src.Research_Agent.nodes.panel_generator_node import start_panel_speculation
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 logger = logging.getLogger(__name__)
 
+# Graph nodes whose start/end are surfaced to streaming clients.
+STREAMED_NODES = {
+    "analyze", "present", "classify", "panel_generator",
+    "moderator", "expert", "blue_team", "synthesis_tools",
+}
+
+# Client-chosen keys are stored and logged — keep them short and inert.
+_VALID_IDEMPOTENCY_KEY = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+# Mirror retries before /history's read-side backfill has to catch the log up.
+MIRROR_ATTEMPTS = 3
+MIRROR_RETRY_SECONDS = 0.2
+
 class ChatStartRequest(BaseModel):
     query: str
 
@@ -16,15 +39,37 @@ class ChatResumeRequest(BaseModel):
     thread_id: str
     user_response: str
 
+async def _mirror_messages(thread_id: str, messages: list) -> None:
+    """Append this run's new UI messages to the message log that /history reads."""
+    for attempt in range(MIRROR_ATTEMPTS):
+        try:
+            await message_log.sync_thread(thread_id, messages)
+            return
+        except Exception as e:
+            if attempt + 1 < MIRROR_ATTEMPTS:
+                await asyncio.sleep(MIRROR_RETRY_SECONDS * 2 ** attempt)
+                continue
+            # Never fail the turn: the session records message_count, and /history
+            # backfills from the checkpoint whenever the log is behind it.
+            logger.warning(f"Message log mirror failed for thread {thread_id}: {e}")
+
+
 async def _run_and_respond(agent, config: dict, session_id: str, user_id: str) -> dict:
     state = await agent.aget_state(config)
+    messages = state.values.get("messages", []) if state.values else []
+    await _mirror_messages(config["configurable"]["thread_id"], messages)
 
     if state.next:
         interrupt_val = state.tasks[0].interrupts[0].value if state.tasks[0].interrupts else {}
         interrupt_type = interrupt_val.get("type", "unknown")
         message = interrupt_val.get("summary", str(interrupt_val))
+
+        if interrupt_type == "confirmation" and admission.has_headroom():
+            # Most users just confirm — start building the panel while they read,
+            # unless real turns are already competing for the LLM.
+            start_panel_speculation(config["configurable"]["thread_id"], state.values.get("interpreted_context"))
         
-        await update_session(session_id, user_id, {"agent_phase": "waiting"})
+        await update_session(session_id, user_id, {"agent_phase": "waiting", "message_count": len(messages)})
         
         return {
             "status": "waiting",
@@ -37,7 +82,7 @@ async def _run_and_respond(agent, config: dict, session_id: str, user_id: str) -
         }
     else:
         final_report = state.values.get("final_report") if state.values else None
-        await update_session(session_id, user_id, {"agent_phase": "complete"})
+        await update_session(session_id, user_id, {"agent_phase": "complete", "message_count": len(messages)})
         
         return {
             "status": "complete",
@@ -48,17 +93,21 @@ async def _run_and_respond(agent, config: dict, session_id: str, user_id: str) -
         }
 
 
-@router.post("/start")
-async def chat_start(payload: ChatStartRequest, req: Request, user: dict = Depends(get_current_user)):
+def _get_agent(req: Request):
     agent = getattr(req.app.state, "agent", None)
     if agent is None:
         raise HTTPException(status_code=503, detail="Agent not initialized")
+    return agent
+
 
+async def _prepare_start(payload: ChatStartRequest, user: dict) -> tuple[dict, dict, dict]:
+    """Create the DB session and the initial graph state for a new conversation."""
     # 1. Create DB Session
     title = payload.query[:60]
     session = await create_session(user["uid"], title)
     thread_id = session["thread_id"]
     config = {"configurable": {"thread_id": thread_id}}
+    tracer.bind_thread(thread_id)
 
     # 2. Initial state
     initial_state = {
@@ -72,28 +121,18 @@ async def chat_start(payload: ChatStartRequest, req: Request, user: dict = Depen
         "current_speaker_idx":  0,
         "round_number":         0,
         "expert_critique":      [],
+        "debate_summary":       None,
+        "summarized_count":     0,
         "is_gauntlet_complete": False,
         "final_report":         None,
         "synthesis_thread":     [],
     }
-
-    try:
-        # Run graph
-        async for _ in agent.astream(initial_state, config):
-            pass
-    except Exception as e:
-        logger.error(f"Error during agent execution: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Internal server error during agent execution.")
-
-    return await _run_and_respond(agent, config, session["_id"], user["uid"])
+    return session, config, initial_state
 
 
-@router.post("/resume")
-async def chat_resume(payload: ChatResumeRequest, req: Request, user: dict = Depends(get_current_user)):
-    agent = getattr(req.app.state, "agent", None)
-    if agent is None:
-        raise HTTPException(status_code=503, detail="Agent not initialized")
-
+async def _prepare_resume(agent, payload: ChatResumeRequest, user: dict) -> tuple[dict, dict, str]:
+    """Validate that the thread belongs to the user and is paused on an interrupt.
+    Also returns the checkpoint id of that interrupt, re-checked once the run holds the thread."""
     # Verify session
     session = await get_session(payload.thread_id, user["uid"])
     if not session:
@@ -103,6 +142,7 @@ async def chat_resume(payload: ChatResumeRequest, req: Request, user: dict = Dep
         raise HTTPException(status_code=400, detail="Cannot resume a complete graph")
 
     config = {"configurable": {"thread_id": payload.thread_id}}
+    tracer.bind_thread(payload.thread_id)
 
     try:
         state = await agent.aget_state(config)
@@ -113,11 +153,204 @@ async def chat_resume(payload: ChatResumeRequest, req: Request, user: dict = Dep
     if not state.next:
         raise HTTPException(status_code=400, detail="No active interrupt on this thread")
 
+    return session, config, state.config["configurable"].get("checkpoint_id")
+
+
+async def _ensure_unchanged(agent, config: dict, checkpoint_id: str | None) -> None:
+    """Under the thread lease: refuse to resume if another turn ran since the request
+    was validated — its reply answered an interrupt that is no longer current."""
+    if checkpoint_id is None:
+        return
+    state = await agent.aget_state(config)
+    if state.config["configurable"].get("checkpoint_id") != checkpoint_id:
+        raise HTTPException(status_code=409, detail="This conversation has moved on since the request was made")
+
+
+async def _execute(agent, graph_input, config: dict, session_id: str, user_id: str, error_detail: str,
+                   expected_checkpoint: str | None = None) -> dict:
+    """Drive one graph segment to its next interrupt (or the end) and build the response.
+    Raises 429 if admission control turns the run away or another run holds the thread.
+    The lease is only taken once the run is admitted, so it is never held while queued."""
+    thread_id = config["configurable"]["thread_id"]
+    async with admission.admit(user_id, thread_id), thread_lock.hold(thread_id):
+        await _ensure_unchanged(agent, config, expected_checkpoint)
+        try:
+            async for _ in agent.astream(graph_input, config):
+                pass
+        except thread_lock.LeaseLost as e:
+            logger.warning(f"Run stopped: {e}")
+            raise HTTPException(status_code=409, detail="Another request took over this conversation")
+        except Exception as e:
+            logger.error(f"Error during agent execution: {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail=error_detail)
+
+        return await _run_and_respond(agent, config, session_id, user_id)
+
+
+def _enqueue(user_id: str, thread_id: str, runner) -> dict:
+    """Hand a segment to the background pool; the body of the 202 answer."""
+    job = job_manager.submit(user_id, thread_id, runner)
+    return {"status": "accepted", "job_id": job.job_id, "thread_id": thread_id}
+
+
+async def _respond_once(user: dict, idempotency_key: str | None, route: str, request_body: dict, handler):
+    """
+    Run `handler` (which returns the response body) and shape the response.
+    With an Idempotency-Key, the handler runs at most once per key: a duplicate
+    gets the stored or in-flight result, marked `Idempotent-Replayed: true`.
+    """
+    if idempotency_key is None:
+        body, replayed = await handler(), False
+    else:
+        if not _VALID_IDEMPOTENCY_KEY.match(idempotency_key):
+            raise HTTPException(status_code=400, detail="Invalid Idempotency-Key")
+
+        async def run():
+            return jsonable_encoder(await handler())
+
+        body, replayed = await idempotency.run_once(
+            user["uid"], idempotency_key, idempotency.fingerprint(route, request_body), run)
+
+    headers = {"Idempotent-Replayed": "true"} if replayed else {}
+    if body.get("status") == "accepted":
+        return JSONResponse(status_code=202, content=body,
+                            headers={"Location": f"/chat/jobs/{body['job_id']}", **headers})
+    return JSONResponse(content=body, headers=headers) if replayed else body
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _stream_and_respond(agent, graph_input, config: dict, session_id: str, user_id: str,
+                              expected_checkpoint: str | None = None):
+    """
+    Run one graph segment via astream_events and yield SSE frames as it progresses:
+      node_start / node_end  — a graph node was entered / finished
+      token                  — an LLM output chunk, tagged with the emitting node
+      final                  — the same payload _run_and_respond returns
+      error                  — the run failed, was refused admission or found the thread
+                               busy (status 429, with retry_after), or the thread moved
+                               on (status 409); the stream ends after this frame
+    """
+    thread_id = config["configurable"]["thread_id"]
     try:
-        async for _ in agent.astream(Command(resume=payload.user_response), config):
-            pass
+        async with admission.admit(user_id, thread_id), thread_lock.hold(thread_id):
+            await _ensure_unchanged(agent, config, expected_checkpoint)
+            async for event in agent.astream_events(graph_input, config, version="v2"):
+                kind = event["event"]
+                node = event.get("metadata", {}).get("langgraph_node")
+
+                if kind == "on_chat_model_stream":
+                    content = event["data"]["chunk"].content
+                    if isinstance(content, str) and content:
+                        yield _sse("token", {"node": node, "content": content})
+                elif event["name"] == node and node in STREAMED_NODES:
+                    if kind == "on_chain_start":
+                        yield _sse("node_start", {"node": node})
+                    elif kind == "on_chain_end":
+                        yield _sse("node_end", {"node": node})
+
+            yield _sse("final", await _run_and_respond(agent, config, session_id, user_id))
+    except HTTPException as e:
+        yield _sse("error", {"detail": e.detail, "status": e.status_code,
+                             "retry_after": (e.headers or {}).get("Retry-After")})
+    except thread_lock.LeaseLost as e:
+        logger.warning(f"Streamed run stopped: {e}")
+        yield _sse("error", {"detail": "Another request took over this conversation", "status": 409})
     except Exception as e:
-        logger.error(f"Error during agent resumption: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Internal server error during resumption.")
+        logger.error(f"Error during streamed agent execution: {e}", exc_info=True)
+        yield _sse("error", {"detail": "Internal server error during agent execution."})
+
+
+def _event_stream(frames) -> StreamingResponse:
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/start")
+async def chat_start(
+    payload: ChatStartRequest,
+    req: Request,
+    background: bool = Query(False, description="Run in the background and return 202 with a job id"),
+    idempotency_key: str | None = Header(None, description="Retries with the same key get the first run's result"),
+    user: dict = Depends(get_current_user),
+):
+    agent = _get_agent(req)
+
+    async def handle() -> dict:
+        session, config, initial_state = await _prepare_start(payload, user)
+
+        def run():
+            return _execute(agent, initial_state, config, session["_id"], user["uid"],
+                            "Internal server error during agent execution.")
+
+        if background:
+            return _enqueue(user["uid"], session["thread_id"], run)
+        return await run()
+
+    return await _respond_once(user, idempotency_key, "start",
+                               {**payload.model_dump(), "background": background}, handle)
+
+
+@router.post("/start/stream")
+async def chat_start_stream(payload: ChatStartRequest, req: Request, user: dict = Depends(get_current_user)):
+    agent = _get_agent(req)
+    session, config, initial_state = await _prepare_start(payload, user)
+    return _event_stream(_stream_and_respond(agent, initial_state, config, session["_id"], user["uid"]))
+
+
+@router.post("/resume")
+async def chat_resume(
+    payload: ChatResumeRequest,
+    req: Request,
+    background: bool = Query(False, description="Run in the background and return 202 with a job id"),
+    idempotency_key: str | None = Header(None, description="Retries with the same key get the first run's result"),
+    user: dict = Depends(get_current_user),
+):
+    agent = _get_agent(req)
+
+    async def handle() -> dict:
+        session, config, checkpoint_id = await _prepare_resume(agent, payload, user)
+
+        def run():
+            return _execute(agent, Command(resume=payload.user_response), config, session["_id"], user["uid"],
+                            "Internal server error during resumption.", expected_checkpoint=checkpoint_id)
+
+        if background:
+            return _enqueue(user["uid"], payload.thread_id, run)
+        return await run()
+
+    return await _respond_once(user, idempotency_key, "resume",
+                               {**payload.model_dump(), "background": background}, handle)
+
+
+@router.post("/resume/stream")
+async def chat_resume_stream(payload: ChatResumeRequest, req: Request, user: dict = Depends(get_current_user)):
+    agent = _get_agent(req)
+    session, config, checkpoint_id = await _prepare_resume(agent, payload, user)
+    return _event_stream(
+        _stream_and_respond(agent, Command(resume=payload.user_response), config, session["_id"], user["uid"],
+                            expected_checkpoint=checkpoint_id)
+    )
+
 
-    return await _run_and_respond(agent, config, session["_id"], user["uid"])
+@router.get("/jobs/{job_id}")
+async def chat_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to long-poll for completion"),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Poll a background run. `result` carries the same payload /chat/start and
+    /chat/resume return once `status` is "complete".
+    """
+    job = job_manager.get(job_id, user["uid"])
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job = await job_manager.wait(job, wait)
+    return job.to_dict()
@@ -1,24 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
 from src.auth import get_current_user
-from src.db.chat_history import get_thread_messages, get_chat_summary, get_thread_report
+from src.db.chat_history import get_logged_messages, get_chat_summary, get_thread_report
 from src.db.session_store import get_session
+from src.tracing import tracer
 
 router = APIRouter(prefix="/chat", tags=["history"])
 
 
 @router.get("/{thread_id}/history")
-async def get_thread_history(thread_id: str, req: Request, user: dict = Depends(get_current_user)):
+async def get_thread_history(
+    thread_id: str,
+    req: Request,
+    after_seq: int = Query(-1, ge=-1, description="Only return messages with seq greater than this"),
+    limit: int | None = Query(None, ge=1, le=500),
+    user: dict = Depends(get_current_user),
+):
     agent = req.app.state.agent
     session = await get_session(thread_id, user["uid"])
     if not session:
         raise HTTPException(status_code=404, detail="Session not found or not owned by user")
 
-    messages = await get_thread_messages(agent, thread_id)
+    messages = await get_logged_messages(agent, thread_id, after_seq, limit, session.get("message_count"))
     return {
         "thread_id": thread_id,
         "message_count": len(messages),
         "messages": messages,
+        "last_seq": messages[-1]["seq"] if messages else after_seq,
     }
 
 
@@ -41,3 +49,23 @@ async def get_thread_report_route(thread_id: str, req: Request, user: dict = Dep
 
     report = await get_thread_report(agent, thread_id)
     return {"thread_id": thread_id, "report": report}
+
+
+@router.get("/{thread_id}/trace")
+async def get_thread_trace(
+    thread_id: str,
+    turns: int = Query(5, ge=1, le=50, description="How many of the most recent turns to return"),
+    user: dict = Depends(get_current_user),
+):
+    """Latency waterfall of the last `turns` requests on this conversation: nested
+    http / auth / mongo / checkpoint / step / node / llm / tool spans, plus a
+    per-kind breakdown of where each turn's time went."""
+    session = await get_session(thread_id, user["uid"])
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found or not owned by user")
+
+    return {
+        "thread_id": thread_id,
+        "sink": tracer.stats()["sink"],
+        "turns": await tracer.waterfall(thread_id, turns),
+    }
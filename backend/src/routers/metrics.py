@@ -0,0 +1,39 @@
+import hmac
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from src.admission import admission
+from src.config import METRICS_TOKEN
+from src.jobs import job_manager
+from src.metrics import registry
+from src.password_pool import password_pool
+from src.token_cache import token_cache
+from src.tracing import tracer
+from src.Research_Agent.LLMS.cache import llm_cache
+from src.Research_Agent.LLMS.registry import llm_registry
+from src.Research_Agent.nodes.reply_classifier import reply_classifier
+from src.Research_Agent.tools.search_cache import search_cache
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# The /stats counters, exported as gauges on every scrape.
+registry.register_stats("admission", admission.stats)
+registry.register_stats("jobs", job_manager.stats)
+registry.register_stats("llm_registry", llm_registry.stats)
+registry.register_stats("llm_cache", llm_cache.stats)
+registry.register_stats("search_cache", search_cache.stats)
+registry.register_stats("reply_classifier", reply_classifier.stats)
+registry.register_stats("password_pool", password_pool.stats)
+registry.register_stats("token_cache", token_cache.stats)
+registry.register_stats("tracing", tracer.stats)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics(authorization: str | None = Header(default=None)):
+    """Prometheus scrape target. Requires `Bearer <METRICS_TOKEN>` when that is set."""
+    if METRICS_TOKEN and not hmac.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
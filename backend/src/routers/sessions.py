@@ -1,13 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 from src.auth import get_current_user
-from src.db import session_store
+from src.db import message_log, session_store
+from src.Research_Agent.nodes.panel_generator_node import discard_panel_speculation
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
 
 @router.get("")
-async def list_sessions(user: dict = Depends(get_current_user)):
-    return await session_store.get_sessions(user["uid"])
+async def list_sessions(
+    request: Request,
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    user: dict = Depends(get_current_user),
+):
+    """
+    One page of the sidebar listing. The response carries an ETag over the
+    page's content; a matching If-None-Match gets a bodiless 304, so a client
+    polling an unchanged sidebar only pays for the indexed query.
+    """
+    try:
+        sessions, next_cursor = await session_store.get_sessions(user["uid"], cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    body = json.dumps(jsonable_encoder({"sessions": sessions, "next_cursor": next_cursor}))
+    etag = f'W/"{hashlib.sha1(body.encode()).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/{session_id}")
@@ -23,4 +48,6 @@ async def delete_session(session_id: str, user: dict = Depends(get_current_user)
     deleted = await session_store.delete_session(session_id, user["uid"])
     if not deleted:
         raise HTTPException(status_code=404, detail="Session not found")
+    await message_log.delete_thread(session_id)
+    discard_panel_speculation(session_id)
     return {"status": "ok", "deleted": True}
@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends
+
+from src.admission import admission
+from src.auth import get_current_user
+from src.db import idempotency
+from src.jobs import job_manager
+from src.password_pool import password_pool
+from src.token_cache import token_cache
+from src.Research_Agent.LLMS.cache import llm_cache
+from src.Research_Agent.LLMS.registry import llm_registry
+from src.Research_Agent.nodes.reply_classifier import reply_classifier
+from src.Research_Agent.tools.registry import tool_registry
+from src.Research_Agent.tools.search_cache import search_cache
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/llm")
+def llm_stats(user: dict = Depends(get_current_user)):
+    """Client and HTTP connection reuse counters for the shared LLM registry."""
+    return llm_registry.stats()
+
+
+@router.get("/jobs")
+def job_stats(user: dict = Depends(get_current_user)):
+    """Queue depth and activity of the background job pool."""
+    return job_manager.stats()
+
+
+@router.get("/classifier")
+def classifier_stats(user: dict = Depends(get_current_user)):
+    """Per-path (rule / scorer / llm) hit rates and latency of the reply classifier."""
+    return reply_classifier.stats()
+
+
+@router.get("/llm-cache")
+def llm_cache_stats(user: dict = Depends(get_current_user)):
+    """Hit/miss/bytes counters of the LLM response cache."""
+    return llm_cache.stats()
+
+
+@router.get("/search-cache")
+def search_cache_stats(user: dict = Depends(get_current_user)):
+    """Hit/miss/de-duplication counters of the shared web search cache."""
+    return search_cache.stats()
+
+
+@router.get("/auth-hashing")
+def hashing_stats(user: dict = Depends(get_current_user)):
+    """Load and rejections of the password hashing pool."""
+    return password_pool.stats()
+
+
+@router.get("/auth-tokens")
+def token_cache_stats(user: dict = Depends(get_current_user)):
+    """Hit rate of the verified-token cache and size of the revocation set."""
+    return token_cache.stats()
+
+
+@router.get("/admission")
+def admission_stats(user: dict = Depends(get_current_user)):
+    """Running / queued graph runs, 429 rejections and admission wait times."""
+    return admission.stats()
+
+
+@router.get("/tools")
+def tool_stats(user: dict = Depends(get_current_user)):
+    """Which agent tools have been loaded, what loading cost and why any failed."""
+    return tool_registry.stats()
+
+
+@router.get("/idempotency")
+def idempotency_stats(user: dict = Depends(get_current_user)):
+    """Idempotency-Key runs, replays, attached duplicates and take-overs on this worker."""
+    return idempotency.stats()
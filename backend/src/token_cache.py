@@ -0,0 +1,102 @@
+"""
+token_cache.py
+Bounded LRU of verified access tokens, plus an in-memory revocation set.
+
+Every authenticated request would otherwise re-run jwt.decode (HMAC check,
+JSON parse, claim validation). The Streamlit frontend re-sends the same 7-day
+token on every rerun, so get_current_user verifies each token once and then
+serves it from here until the token's own `exp`.
+
+Entries are keyed by a SHA-256 digest of the token, so raw tokens are never
+held as dict keys. Tokens revoked through /auth/logout are remembered until
+they would have expired anyway. Both structures live in process memory: with
+several workers, a revocation only applies on the worker that received it.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from src.config import TOKEN_CACHE_MAX_ENTRIES
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class VerifiedTokenCache:
+    """LRU of token digest → (user dict, exp), respecting each token's expiry."""
+
+    def __init__(self, max_entries: int = TOKEN_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self._revoked: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "revoked_rejections": 0}
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return a copy of the cached user for a still-valid token, else None."""
+        key = token_digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            user, exp = entry
+            if exp <= now:
+                del self._entries[key]
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return dict(user)
+
+    def put(self, token: str, user: dict, exp: float) -> None:
+        with self._lock:
+            key = token_digest(token)
+            self._entries[key] = (dict(user), exp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def is_revoked(self, token: str) -> bool:
+        key = token_digest(token)
+        with self._lock:
+            exp = self._revoked.get(key)
+            if exp is None:
+                return False
+            if exp <= time.time():
+                del self._revoked[key]
+                return False
+            self._counters["revoked_rejections"] += 1
+            return True
+
+    def revoke(self, token: str, exp: float) -> None:
+        """Reject this token from now until `exp`, and drop it from the cache."""
+        key = token_digest(token)
+        now = time.time()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._revoked[key] = exp
+            # Forget revocations whose tokens have expired on their own.
+            for stale in [k for k, e in self._revoked.items() if e <= now]:
+                del self._revoked[stale]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "entries":  len(self._entries),
+                "revoked":  len(self._revoked),
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+
+# Process-wide instance used by get_current_user.
+token_cache = VerifiedTokenCache()
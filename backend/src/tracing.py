@@ -0,0 +1,568 @@
+"""
+tracing.py
+In-process request tracing with per-conversation latency waterfalls.
+
+Every HTTP request (and every background job) opens a root span. Work done on
+its behalf nests underneath:
+
+    http        POST /chat/resume
+    ├─ auth     get_current_user
+    ├─ mongo    sessions.get
+    ├─ checkpoint aget_tuple / aput / aput_writes
+    └─ step     graph super-step N
+       └─ node  expert
+          ├─ llm   llama-3.3-70b-versatile   (prompt / completion tokens)
+          └─ tool  tavily_search_results_json
+
+Spans find their parent through a ContextVar, so they nest correctly across
+awaits, asyncio tasks and LangGraph's executor threads. Finished spans are
+buffered on their trace and written in one batch when the root span closes.
+Only traces bound to a conversation (bind_thread) are kept; the sink is a
+local JSONL file or the "trace_spans" MongoDB collection (TRACE_SINK), and
+GET /chat/{thread_id}/trace reads the last N turns back as a waterfall. Both
+sinks look a conversation's spans up by thread id rather than scanning, and
+tracer.close() flushes whatever is still queued at shutdown.
+
+Usage:
+    from src.tracing import tracer
+    with tracer.span("sessions.get", "mongo"):
+        ...
+"""
+
+import asyncio
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from src.config import TRACE_FILE, TRACE_FILE_MAX_BYTES, TRACE_SINK, TRACE_TTL_SECONDS
+from src.logging.context import bind_log_context, request_id_var
+from src.logging.logger import logger
+
+COLLECTION = "trace_spans"
+
+# Kinds summed into each turn's breakdown — "where did the time go?"
+BREAKDOWN_KINDS = ("llm", "tool", "checkpoint", "mongo", "auth")
+
+INDEX_MAX_THREADS = 10_000   # conversations whose trace offsets the JSONL sink keeps (LRU)
+INDEX_MAX_BATCHES = 200      # trace batches remembered per conversation (the route reads ≤ 50 turns)
+
+
+class Trace:
+    """One request or background job: its thread binding and finished spans."""
+
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex
+        self.thread_id: Optional[str] = None
+        self.spans: list["Span"] = []
+        self.steps: dict[int, "Span"] = {}
+        self.flushed = False
+        self.lock = threading.Lock()
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "ts", "_t0", "duration_ms", "status", "attrs")
+
+    def __init__(self, trace: Trace, parent: Optional["Span"], name: str, kind: str, attrs: dict):
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.kind = kind
+        self.ts = time.time()
+        self._t0 = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.status = "ok"
+        self.attrs = attrs
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id":    self.trace.trace_id,
+            "span_id":     self.span_id,
+            "parent_id":   self.parent_id,
+            "thread_id":   self.trace.thread_id,
+            "name":        self.name,
+            "kind":        self.kind,
+            "ts":          self.ts,
+            "duration_ms": self.duration_ms,
+            "status":      self.status,
+            "attrs":       self.attrs,
+        }
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("trace_span", default=None)
+
+
+# ── Sinks ─────────────────────────────────────────────────────────────────────
+
+_STOP = object()   # queued by JsonlSink.close() to end the writer thread
+
+
+class JsonlSink:
+    """Appends spans to a JSONL file from a background thread; rolls the file
+    over to <name>.1 once it passes TRACE_FILE_MAX_BYTES.
+
+    Every batch written (one trace, or a late span) is indexed by thread id as
+    (file generation, byte offset, length), so reading a conversation back
+    seeks to its own lines instead of scanning both files. After a restart the
+    index is rebuilt from the files once, on first use."""
+
+    def __init__(self, path: str = TRACE_FILE, max_bytes: int = TRACE_FILE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._generation = 0   # bumped on every rollover; entries of generation - 1 are in <name>.1
+        self._index: OrderedDict[str, deque] = OrderedDict()
+        self._indexed = False
+
+    def write(self, spans: list[dict]) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    self._thread = threading.Thread(target=self._drain, name="trace-writer", daemon=True)
+                    self._thread.start()
+        self._queue.put(spans)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write out everything queued and stop the writer thread."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        with self._lock:
+            self._thread = None
+
+    def _drain(self) -> None:
+        while True:
+            batches = [self._queue.get()]
+            while not self._queue.empty():
+                batches.append(self._queue.get_nowait())
+            stop = any(b is _STOP for b in batches)
+            try:
+                with self._lock:
+                    self._load_index()
+                    if os.path.exists(self.path) and os.path.getsize(self.path) > self.max_bytes:
+                        os.replace(self.path, self.path + ".1")
+                        self._generation += 1
+                    with open(self.path, "ab") as f:
+                        for spans in batches:
+                            if spans is _STOP or not spans:
+                                continue
+                            data = "".join(json.dumps(s, default=str) + "\n" for s in spans).encode("utf-8")
+                            offset = f.tell()
+                            f.write(data)
+                            self._remember(spans[0].get("thread_id"), self._generation, offset, len(data))
+            except OSError as e:
+                logger.warning(f"Trace write failed: {e}")
+            if stop:
+                return
+
+    def _remember(self, thread_id: Optional[str], generation: int, offset: int, length: int) -> None:
+        if thread_id is None:
+            return
+        entries = self._index.get(thread_id)
+        if entries is None:
+            entries = self._index[thread_id] = deque(maxlen=INDEX_MAX_BATCHES)
+            while len(self._index) > INDEX_MAX_THREADS:
+                self._index.popitem(last=False)
+        else:
+            self._index.move_to_end(thread_id)
+        entries.append((generation, offset, length))
+
+    def _load_index(self) -> None:
+        """Index the spans already on disk, one entry per run of lines from the same trace."""
+        if self._indexed:
+            return
+        self._indexed = True
+        for generation, path in ((self._generation - 1, self.path + ".1"), (self._generation, self.path)):
+            if not os.path.exists(path):
+                continue
+            run = None   # (thread_id, trace_id, offset, length) of the lines being grouped
+            offset = 0
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        span = json.loads(line)
+                        key = (span.get("thread_id"), span.get("trace_id"))
+                    except ValueError:
+                        key = (None, None)   # a torn last line from a crash
+                    if run and run[:2] == key and run[2] + run[3] == offset:
+                        run = (*key, run[2], run[3] + len(line))
+                    else:
+                        if run:
+                            self._remember(run[0], generation, run[2], run[3])
+                        run = (*key, offset, len(line))
+                    offset += len(line)
+            if run:
+                self._remember(run[0], generation, run[2], run[3])
+
+    def _read(self, thread_id: str) -> list[dict]:
+        spans = []
+        with self._lock:
+            self._load_index()
+            paths = {self._generation: self.path, self._generation - 1: self.path + ".1"}
+            files = {}
+            try:
+                for generation, offset, length in self._index.get(thread_id, ()):
+                    path = paths.get(generation)
+                    if path is None:
+                        continue   # rolled out of both files
+                    if path not in files:
+                        try:
+                            files[path] = open(path, "rb")
+                        except OSError:
+                            files[path] = None
+                    f = files[path]
+                    if f is None:
+                        continue
+                    f.seek(offset)
+                    spans.extend(json.loads(line) for line in f.read(length).splitlines() if line.strip())
+            finally:
+                for f in files.values():
+                    if f is not None:
+                        f.close()
+        return spans
+
+    async def read(self, thread_id: str, turns: int) -> list[dict]:
+        return _last_turns(await asyncio.to_thread(self._read, thread_id), turns)
+
+
+class MemorySink:
+    """Keeps spans in a list — for benchmarks that read their own traces back."""
+
+    def __init__(self):
+        self.spans: list[dict] = []
+
+    def write(self, spans: list[dict]) -> None:
+        self.spans.extend(spans)
+
+    async def read(self, thread_id: str, turns: int) -> list[dict]:
+        return _last_turns([s for s in self.spans if s["thread_id"] == thread_id], turns)
+
+
+def _last_turns(spans: list[dict], turns: int) -> list[dict]:
+    roots = sorted((s for s in spans if s["parent_id"] is None), key=lambda s: s["ts"])[-turns:]
+    keep = {s["trace_id"] for s in roots}
+    return [s for s in spans if s["trace_id"] in keep]
+
+
+class MongoSink:
+    """Inserts each trace's spans into the trace_spans collection in one round trip."""
+
+    def __init__(self, ttl_seconds: int = TRACE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._pending: set[asyncio.Task] = set()
+
+    @property
+    def collection(self):
+        from src.db.mongo_client import MongoDB
+        return MongoDB.db[COLLECTION]
+
+    async def ensure_indexes(self) -> None:
+        await self.collection.create_indexes([
+            IndexModel([("thread_id", ASCENDING), ("parent_id", ASCENDING), ("ts", DESCENDING)],
+                       name="thread_roots"),
+            IndexModel([("trace_id", ASCENDING)], name="trace_id"),
+            IndexModel([("expires_at", ASCENDING)], name="expires_at", expireAfterSeconds=0),
+        ])
+
+    def write(self, spans: list[dict]) -> None:
+        expires_at = datetime.now(tz=timezone.utc) + timedelta(seconds=self.ttl_seconds)
+        docs = [{**s, "expires_at": expires_at} for s in spans]
+        try:
+            task = asyncio.get_running_loop().create_task(self._insert(docs))
+        except RuntimeError:
+            return   # no loop (a sync caller at shutdown) — drop rather than block
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def close(self) -> None:
+        """Wait for the inserts still in flight."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def _insert(self, docs: list[dict]) -> None:
+        try:
+            await self.collection.insert_many(docs, ordered=False)
+        except Exception as e:
+            logger.warning(f"Trace write failed: {e}")
+
+    async def read(self, thread_id: str, turns: int) -> list[dict]:
+        roots = await self.collection.find(
+            {"thread_id": thread_id, "parent_id": None}, {"trace_id": 1}
+        ).sort("ts", DESCENDING).limit(turns).to_list(turns)
+        keep = [r["trace_id"] for r in roots]
+        return await self.collection.find(
+            {"trace_id": {"$in": keep}}, {"_id": 0, "expires_at": 0}
+        ).to_list(None)
+
+
+def _make_sink():
+    if TRACE_SINK == "mongo":
+        return MongoSink()
+    if TRACE_SINK == "jsonl":
+        return JsonlSink()
+    return None
+
+
+# ── Tracer ────────────────────────────────────────────────────────────────────
+
+class Tracer:
+    """Opens, nests and flushes spans. Every call is a no-op outside a root span."""
+
+    def __init__(self, sink=None):
+        self.sink = sink
+        self._counters = {"traces_written": 0, "spans_written": 0, "traces_dropped": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.sink is not None
+
+    # ── Span lifecycle ───────────────────────────────────────────────────────
+
+    def start(self, name: str, kind: str, parent: Optional[Span] = None, **attrs) -> Optional[Span]:
+        """Open a child of `parent` (default: the current span). None when not tracing."""
+        parent = parent or _current.get()
+        if parent is None:
+            return None
+        return Span(parent.trace, parent, name, kind, attrs)
+
+    def finish(self, span: Optional[Span], status: str = "ok", seconds: Optional[float] = None) -> None:
+        if span is None:
+            return
+        elapsed = seconds if seconds is not None else time.perf_counter() - span._t0
+        span.duration_ms = round(1000 * elapsed, 3)
+        span.status = status
+        trace = span.trace
+        with trace.lock:
+            trace.spans.append(span)
+            late = trace.flushed
+            step = trace.steps.get(span.attrs.get("step")) if span.kind == "node" else None
+            if step is not None:
+                # A super-step lasts until its slowest node finishes.
+                step.duration_ms = max(step.duration_ms or 0.0, round(1000 * (time.perf_counter() - step._t0), 3))
+                if status != "ok" and step.status == "ok":
+                    step.status = status
+        if late:
+            # Background work (speculation, a detached task) outlived its request.
+            self._write(trace, [span])
+
+    def activate(self, span: Optional[Span]):
+        """Make `span` the parent of spans opened from here on; returns a reset token."""
+        return _current.set(span) if span is not None else None
+
+    def deactivate(self, token) -> None:
+        if token is not None:
+            _current.reset(token)
+
+    @contextmanager
+    def span(self, name: str, kind: str, **attrs):
+        """Run the block inside a child span of the current one."""
+        span = self.start(name, kind, **attrs)
+        if span is None:
+            yield None
+            return
+        token = _current.set(span)
+        status = "ok"
+        try:
+            yield span
+        except BaseException as e:
+            status = span_status(e)
+            raise
+        finally:
+            _current.reset(token)
+            self.finish(span, status)
+
+    @contextmanager
+    def root(self, name: str, kind: str, thread_id: Optional[str] = None, **attrs):
+        """Open a new trace (one HTTP request or background job) for the block."""
+        if not self.enabled:
+            yield None
+            return
+        trace = Trace()
+        trace.thread_id = thread_id
+        span = Span(trace, None, name, kind, attrs)
+        token = _current.set(span)
+        status = "ok"
+        try:
+            yield span
+        except BaseException as e:
+            status = span_status(e)
+            raise
+        finally:
+            _current.reset(token)
+            self.finish(span, status)
+            self._flush(trace)
+
+    def record(self, name: str, kind: str, seconds: float, status: str = "ok", **attrs) -> None:
+        """Add an already-finished child span, e.g. a tool call timed elsewhere."""
+        span = self.start(name, kind, **attrs)
+        if span is not None:
+            span.ts -= seconds
+            self.finish(span, status, seconds)
+
+    def step(self, number: int) -> Optional[Span]:
+        """The span of graph super-step `number` in the current trace, opened on first use."""
+        current = _current.get()
+        if current is None:
+            return None
+        trace = current.trace
+        with trace.lock:
+            step = trace.steps.get(number)
+            if step is None:
+                step = trace.steps[number] = Span(trace, current, f"step {number}", "step", {"step": number})
+                step.duration_ms = 0.0
+        return step
+
+    def bind_thread(self, thread_id: str) -> None:
+        """Tag the current trace — every span in it — and the log records that
+        follow with a conversation id."""
+        bind_log_context(thread_id=thread_id)
+        current = _current.get()
+        if current is not None:
+            current.trace.thread_id = thread_id
+
+    # ── Export ───────────────────────────────────────────────────────────────
+
+    def _flush(self, trace: Trace) -> None:
+        with trace.lock:
+            trace.flushed = True
+            spans = trace.spans + list(trace.steps.values())
+        if trace.thread_id is None:
+            self._counters["traces_dropped"] += 1
+            return
+        self._counters["traces_written"] += 1
+        self._write(trace, spans)
+
+    def _write(self, trace: Trace, spans: list[Span]) -> None:
+        if trace.thread_id is None or self.sink is None:
+            return
+        self._counters["spans_written"] += len(spans)
+        try:
+            self.sink.write([s.to_dict() for s in spans])
+        except Exception as e:
+            logger.warning(f"Trace export failed: {e}")
+
+    async def setup(self) -> None:
+        """Create the sink's indexes — call once from the FastAPI lifespan."""
+        if isinstance(self.sink, MongoSink):
+            await self.sink.ensure_indexes()
+
+    async def close(self) -> None:
+        """Flush the sink and stop its writer — call once from the FastAPI lifespan, at shutdown."""
+        if isinstance(self.sink, JsonlSink):
+            await asyncio.to_thread(self.sink.close)
+        elif isinstance(self.sink, MongoSink):
+            await self.sink.close()
+
+    async def waterfall(self, thread_id: str, turns: int = 5) -> list[dict]:
+        """The last `turns` traced turns of a conversation, oldest first, each with
+        its spans laid out as a waterfall and a per-kind time breakdown."""
+        if self.sink is None:
+            return []
+        return build_waterfall(await self.sink.read(thread_id, turns))
+
+    def stats(self) -> dict:
+        return {"sink": TRACE_SINK, **self._counters}
+
+
+def span_status(exc: BaseException) -> str:
+    # interrupt() works by raising GraphInterrupt — a pause, not a failure.
+    from langgraph.errors import GraphBubbleUp
+    return "interrupt" if isinstance(exc, GraphBubbleUp) else "error"
+
+
+def build_waterfall(spans: list[dict]) -> list[dict]:
+    by_trace: dict[str, list[dict]] = defaultdict(list)
+    for s in spans:
+        by_trace[s["trace_id"]].append(s)
+
+    turns = []
+    for trace_spans in by_trace.values():
+        root = next((s for s in trace_spans if s["parent_id"] is None), None)
+        if root is None:
+            continue
+        children: dict[str, list[dict]] = defaultdict(list)
+        for s in trace_spans:
+            if s["parent_id"] is not None:
+                children[s["parent_id"]].append(s)
+
+        rows = []
+
+        def walk(span: dict, depth: int) -> None:
+            rows.append({
+                "name":        span["name"],
+                "kind":        span["kind"],
+                "depth":       depth,
+                "offset_ms":   round(1000 * (span["ts"] - root["ts"]), 3),
+                "duration_ms": span["duration_ms"],
+                "status":      span["status"],
+                "attrs":       span.get("attrs") or {},
+            })
+            for child in sorted(children.get(span["span_id"], []), key=lambda s: s["ts"]):
+                walk(child, depth + 1)
+
+        walk(root, 0)
+        by_id = {s["span_id"]: s for s in trace_spans}
+        breakdown = {kind: 0.0 for kind in BREAKDOWN_KINDS}
+        for s in trace_spans:
+            parent = by_id.get(s["parent_id"])
+            # Nested spans of the same kind (an update that re-reads) are already counted.
+            if s["kind"] in breakdown and not (parent and parent["kind"] == s["kind"]):
+                breakdown[s["kind"]] += s["duration_ms"] or 0.0
+        turns.append({
+            "trace_id":     root["trace_id"],
+            "name":         root["name"],
+            "started_at":   datetime.fromtimestamp(root["ts"], tz=timezone.utc).isoformat(),
+            "duration_ms":  root["duration_ms"],
+            "status":       root["status"],
+            "breakdown_ms": {k: round(v, 3) for k, v in breakdown.items()},
+            "spans":        rows,
+        })
+    return sorted(turns, key=lambda t: t["started_at"])
+
+
+# ── Integrations ──────────────────────────────────────────────────────────────
+
+class TraceMiddleware:
+    """Pure ASGI middleware: one root span per HTTP request, kept open until the
+    response body (including a streamed one) has been sent."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        with tracer.root(f"{scope['method']} {scope['path']}", "http", request_id=request_id_var.get()) as span:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    span.attrs["status_code"] = message["status"]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                # Name by route template so turns read "POST /chat/resume", not raw paths.
+                route = scope.get("route")
+                if getattr(route, "path", None):
+                    span.name = f"{scope['method']} {route.path}"
+
+
+# Process-wide instance.
+tracer = Tracer(_make_sink())
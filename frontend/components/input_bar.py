@@ -10,17 +10,26 @@ def _reset_auth_and_flow_state():
     st.session_state["messages"]       = []
     st.session_state["interrupt_type"] = None
     st.session_state["last_response"]  = None
+    st.session_state["history_thread"] = None
 
 
 def _fetch_and_store_history():
-    """Pull latest message history from the backend into session state."""
+    """Pull the thread's new messages from the backend into session state.
+    Only messages after the locally held cursor (history_seq) are requested;
+    the sidebar's sessions page is revalidated alongside, in parallel, so the
+    rerun that follows renders it from cache."""
     thread_id = st.session_state.get("thread_id")
     token     = st.session_state.get("token")
     if not thread_id or not token:
         return
+    same_thread = st.session_state.get("history_thread") == thread_id
+    after_seq   = st.session_state.get("history_seq", -1) if same_thread else -1
     try:
-        history = api.get_thread_history(token, thread_id)
-        st.session_state["messages"] = history.get("messages", [])
+        _, history = api.get_sessions_and_history(token, thread_id, after_seq)
+        known = st.session_state.get("messages", []) if same_thread else []
+        st.session_state["messages"]       = known + history.get("messages", [])
+        st.session_state["history_thread"] = thread_id
+        st.session_state["history_seq"]    = history.get("last_seq", after_seq)
     except api.AuthExpiredError:
         st.warning("Session expired. Please log in again.")
         _reset_auth_and_flow_state()
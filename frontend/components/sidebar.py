@@ -10,6 +10,20 @@ def _reset_local_state():
     st.session_state["messages"]       = []
     st.session_state["interrupt_type"] = None
     st.session_state["last_response"]  = None
+    st.session_state["session_pages"]  = 1
+    st.session_state["history_thread"] = None
+
+
+def _load_sessions(token: str, pages: int) -> tuple[list, str | None]:
+    """Fetch the first `pages` pages of the sidebar listing, following the cursor."""
+    sessions, cursor = [], None
+    for _ in range(pages):
+        page = api.get_sessions(token, cursor=cursor)
+        sessions.extend(page["sessions"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    return sessions, cursor
 
 
 def _phase_icon(phase: str) -> str:
@@ -38,6 +52,10 @@ def render_sidebar():
                 st.rerun()
         with col2:
             if st.button("Logout", use_container_width=True):
+                try:
+                    api.logout(st.session_state["token"])
+                except api.ApiError:
+                    pass   # already expired or backend unreachable — log out locally anyway
                 _reset_local_state()
                 st.rerun()
 
@@ -50,7 +68,8 @@ def render_sidebar():
         )
 
         try:
-            sessions = api.get_sessions(st.session_state["token"])
+            pages = st.session_state.setdefault("session_pages", 1)
+            sessions, next_cursor = _load_sessions(st.session_state["token"], pages)
             if not sessions:
                 st.markdown(
                     "<div style='font-size:0.82rem;opacity:0.35;padding:0.4rem 0;'>"
@@ -78,11 +97,17 @@ def render_sidebar():
                         )
                         st.session_state["thread_id"]      = thread_id
                         st.session_state["messages"]       = history.get("messages", [])
+                        st.session_state["history_thread"] = thread_id
+                        st.session_state["history_seq"]    = history.get("last_seq", -1)
                         st.session_state["phase"]          = phase
                         st.session_state["interrupt_type"] = "resumed" if phase == "waiting" else None
                         st.session_state["last_response"]  = {}
                         st.rerun()
 
+                if next_cursor and st.button("Load more", key="sessions_load_more", use_container_width=True):
+                    st.session_state["session_pages"] = pages + 1
+                    st.rerun()
+
         except api.AuthExpiredError:
             st.warning("Session expired. Please log in again.")
             _reset_local_state()
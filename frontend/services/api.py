@@ -1,11 +1,29 @@
+import asyncio
 import requests
+import httpx
 import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from dotenv import load_dotenv
 
+from services import http
+
 load_dotenv()
 
 BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:8000")
 REQUEST_TIMEOUT_SECONDS = int(os.environ.get("API_TIMEOUT_SECONDS", "30"))
+# Opt-in: run gauntlet turns as background jobs so long LLM segments can't hit the HTTP
+# timeout. Job ids live in the worker that accepted the turn, so only enable this when
+# the backend runs a single worker (or polls are routed back to the same one).
+USE_BACKGROUND_JOBS = os.environ.get("API_USE_BACKGROUND_JOBS", "false").lower() == "true"
+JOB_POLL_WAIT_SECONDS = 20
+JOB_MAX_WAIT_SECONDS = int(os.environ.get("API_JOB_MAX_WAIT_SECONDS", "600"))
+SESSIONS_PAGE_SIZE = 30
+# Session pages are reused for this long, then revalidated with If-None-Match.
+SESSIONS_CACHE_SECONDS = float(os.environ.get("API_SESSIONS_CACHE_SECONDS", "5"))
+SESSIONS_CACHE_MAX_ENTRIES = 256
 
 
 class ApiError(Exception):
@@ -16,7 +34,7 @@ class AuthExpiredError(ApiError):
     pass
 
 
-def _extract_error_message(response: requests.Response, fallback: str) -> str:
+def _extract_error_message(response, fallback: str) -> str:
     try:
         payload = response.json()
         if isinstance(payload, dict):
@@ -26,29 +44,15 @@ def _extract_error_message(response: requests.Response, fallback: str) -> str:
     return fallback
 
 
-def _request(method: str, path: str, token: str | None = None, allow_statuses: set[int] | None = None, **kwargs):
-    headers = kwargs.pop("headers", {})
-    if token:
-        headers.update(get_headers(token))
-
-    try:
-        response = requests.request(
-            method,
-            f"{BASE_URL}{path}",
-            headers=headers,
-            timeout=REQUEST_TIMEOUT_SECONDS,
-            **kwargs,
-        )
-    except requests.RequestException as exc:
-        raise ApiError("Could not reach backend API. Check if Uvicorn is running.") from exc
-
+def _handle_response(response, allow_statuses: set[int] | None):
+    """Shared status handling for requests and httpx responses."""
     if response.status_code == 401:
         raise AuthExpiredError("Your session expired. Please log in again.")
 
     if allow_statuses and response.status_code in allow_statuses:
         return response
 
-    if not response.ok:
+    if response.status_code >= 400:
         raise ApiError(_extract_error_message(response, f"Request failed with status {response.status_code}"))
 
     if response.status_code == 204:
@@ -59,14 +63,104 @@ def _request(method: str, path: str, token: str | None = None, allow_statuses: s
     except ValueError as exc:
         raise ApiError("Backend returned a non-JSON response.") from exc
 
+
+def _request(method: str, path: str, token: str | None = None, allow_statuses: set[int] | None = None, **kwargs):
+    headers = kwargs.pop("headers", {})
+    if token:
+        headers.update(get_headers(token))
+
+    try:
+        response = http.session().request(
+            method,
+            f"{BASE_URL}{path}",
+            headers=headers,
+            timeout=REQUEST_TIMEOUT_SECONDS,
+            **kwargs,
+        )
+    except requests.RequestException as exc:
+        raise ApiError("Could not reach backend API. Check if Uvicorn is running.") from exc
+
+    return _handle_response(response, allow_statuses)
+
+
+async def _aget(path: str, token: str, allow_statuses: set[int] | None = None, params: dict | None = None,
+               headers: dict | None = None):
+    """Async GET on the shared httpx client, retrying like the sync session does."""
+    client = http.async_client()
+    for attempt in range(http.GET_RETRIES + 1):
+        try:
+            response = await client.get(
+                f"{BASE_URL}{path}",
+                headers={**get_headers(token), **(headers or {})},
+                params=params,
+                timeout=REQUEST_TIMEOUT_SECONDS,
+            )
+        except httpx.HTTPError as exc:
+            raise ApiError("Could not reach backend API. Check if Uvicorn is running.") from exc
+        if response.status_code not in http.RETRY_STATUSES or attempt == http.GET_RETRIES:
+            break
+        retry_after = response.headers.get("Retry-After", "")
+        await asyncio.sleep(float(retry_after) if retry_after.isdigit() else http.RETRY_BACKOFF_SECONDS * 2 ** attempt)
+    return _handle_response(response, allow_statuses)
+
 def get_headers(token: str):
     return {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json"
     }
 
-def get_sessions(token: str):
-    return _request("GET", "/sessions", token=token)
+def logout(token: str):
+    return _request("POST", "/auth/logout", token=token)
+
+# (token, cursor, limit) → (fetched_at, etag, page). Keyed by token so users never share pages.
+_sessions_cache: OrderedDict = OrderedDict()
+_sessions_lock = threading.Lock()
+
+def _sessions_params(cursor: str | None, limit: int) -> dict:
+    params = {"limit": limit}
+    if cursor:
+        params["cursor"] = cursor
+    return params
+
+def _cached_sessions(key) -> tuple | None:
+    with _sessions_lock:
+        return _sessions_cache.get(key)
+
+def _conditional_headers(key) -> dict:
+    cached = _cached_sessions(key)
+    return {"If-None-Match": cached[1]} if cached and cached[1] else {}
+
+def _store_sessions(key, response) -> dict:
+    """Turn a 200/304 sessions response into a page, refreshing the cache entry."""
+    if response.status_code == 304:
+        page = _cached_sessions(key)[2]
+    else:
+        page = _handle_response(response, None)
+    with _sessions_lock:
+        _sessions_cache[key] = (time.monotonic(), response.headers.get("ETag"), page)
+        _sessions_cache.move_to_end(key)
+        while len(_sessions_cache) > SESSIONS_CACHE_MAX_ENTRIES:
+            _sessions_cache.popitem(last=False)
+    return page
+
+def invalidate_sessions(token: str):
+    """Drop this user's cached session pages (after a change the ETag can't know about yet)."""
+    with _sessions_lock:
+        for key in [k for k in _sessions_cache if k[0] == token]:
+            del _sessions_cache[key]
+
+def get_sessions(token: str, cursor: str | None = None, limit: int = SESSIONS_PAGE_SIZE,
+                 max_age: float = SESSIONS_CACHE_SECONDS):
+    """Return one page of sessions: {"sessions": [...], "next_cursor": str | None}.
+    Pages younger than `max_age` come from the local cache; older ones are
+    revalidated with If-None-Match, so an unchanged page costs a bodiless 304."""
+    key = (token, cursor, limit)
+    cached = _cached_sessions(key)
+    if cached and time.monotonic() - cached[0] < max_age:
+        return cached[2]
+    response = _request("GET", "/sessions", token=token, params=_sessions_params(cursor, limit),
+                        headers=_conditional_headers(key), allow_statuses={200, 304})
+    return _store_sessions(key, response)
 
 def get_session(token: str, session_id: str):
     response = _request("GET", f"/sessions/{session_id}", token=token, allow_statuses={404})
@@ -75,21 +169,81 @@ def get_session(token: str, session_id: str):
     return response
 
 def delete_session(token: str, session_id: str):
-    return _request("DELETE", f"/sessions/{session_id}", token=token)
+    result = _request("DELETE", f"/sessions/{session_id}", token=token)
+    invalidate_sessions(token)
+    return result
+
+def _wait_for_job(token: str, job_id: str):
+    """Long-poll a background job until it finishes and return its result payload."""
+    deadline = time.monotonic() + JOB_MAX_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        job = _request("GET", f"/chat/jobs/{job_id}", token=token, params={"wait": JOB_POLL_WAIT_SECONDS})
+        if job["status"] == "complete":
+            return job["result"]
+        if job["status"] == "failed":
+            raise ApiError(job.get("error") or "The agent run failed.")
+    raise ApiError("The agent is taking too long to respond. Please try again.")
+
+def _post_turn(token: str, path: str, payload: dict, idempotency_key: str, params: dict | None = None):
+    """POST one turn, retrying transient failures with the same Idempotency-Key so
+    the backend runs it at most once (a retry gets the first attempt's result)."""
+    headers = {"Idempotency-Key": idempotency_key}
+    for attempt in range(http.GET_RETRIES + 1):
+        last = attempt == http.GET_RETRIES
+        try:
+            response = _request("POST", path, token=token, json=payload, params=params, headers=dict(headers),
+                                allow_statuses=set() if last else {409, *http.RETRY_STATUSES})
+        except ApiError as exc:
+            if last or not isinstance(exc.__cause__, requests.RequestException):
+                raise
+            time.sleep(http.RETRY_BACKOFF_SECONDS * 2 ** attempt)
+            continue
+        if not isinstance(response, requests.Response):
+            return response
+        retry_after = response.headers.get("Retry-After", "")
+        if response.status_code == 409 and not retry_after:
+            return _handle_response(response, None)   # the conversation moved on; retrying won't help
+        time.sleep(float(retry_after) if retry_after.isdigit() else http.RETRY_BACKOFF_SECONDS * 2 ** attempt)
+
+def _run_turn(token: str, path: str, payload: dict, idempotency_key: str):
+    if not USE_BACKGROUND_JOBS:
+        return _post_turn(token, path, payload, idempotency_key)
+    accepted = _post_turn(token, path, payload, idempotency_key, params={"background": "true"})
+    return _wait_for_job(token, accepted["job_id"])
 
 def chat_start(token: str, query: str):
-    return _request("POST", "/chat/start", token=token, json={"query": query})
+    # One key per user action: every retry of this call replays the same run.
+    return _run_turn(token, "/chat/start", {"query": query}, uuid.uuid4().hex)
 
 def chat_resume(token: str, thread_id: str, user_response: str):
-    return _request(
-        "POST",
+    return _run_turn(
+        token,
         "/chat/resume",
-        token=token,
-        json={"thread_id": thread_id, "user_response": user_response},
+        {"thread_id": thread_id, "user_response": user_response},
+        uuid.uuid4().hex,
     )
 
-def get_thread_history(token: str, thread_id: str):
-    response = _request("GET", f"/chat/{thread_id}/history", token=token, allow_statuses={404})
+def get_thread_history(token: str, thread_id: str, after_seq: int = -1):
+    """Messages of a thread with seq > after_seq, plus last_seq to pass next time."""
+    response = _request("GET", f"/chat/{thread_id}/history", token=token,
+                        params={"after_seq": after_seq}, allow_statuses={404})
     if isinstance(response, requests.Response) and response.status_code == 404:
-        return {"messages": []}
+        return {"messages": [], "last_seq": after_seq}
     return response
+
+def get_sessions_and_history(token: str, thread_id: str, after_seq: int = -1):
+    """After a turn: revalidate the first sessions page and fetch the thread's new
+    messages, in parallel. Returns (sessions_page, history) in the shapes
+    get_sessions / get_thread_history return."""
+    key = (token, None, SESSIONS_PAGE_SIZE)
+
+    async def both():
+        return await asyncio.gather(
+            _aget("/sessions", token, allow_statuses={200, 304}, params=_sessions_params(None, SESSIONS_PAGE_SIZE),
+                  headers=_conditional_headers(key)),
+            _aget(f"/chat/{thread_id}/history", token, allow_statuses={404}, params={"after_seq": after_seq}),
+        )
+    sessions_response, history = http.run_async(both())
+    if isinstance(history, httpx.Response):
+        history = {"messages": [], "last_seq": after_seq}
+    return _store_sessions(key, sessions_response), history
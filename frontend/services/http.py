@@ -0,0 +1,83 @@
+"""
+Shared HTTP clients for the backend API.
+
+Every Streamlit rerun makes several backend calls. Calling requests.request()
+directly opens a fresh TCP connection for each one, so this module keeps two
+pooled clients:
+
+  session()    — one requests.Session per process: keep-alive connection pool,
+                 gzip-decoded responses, and automatic retries with backoff for
+                 idempotent GETs (honouring Retry-After). POSTs are never retried.
+  run_async()  — runs a coroutine on a long-lived background event loop that owns
+                 one httpx.AsyncClient (async_client()), so a single rerun can
+                 issue independent GETs in parallel over pooled connections.
+"""
+
+import asyncio
+import os
+import threading
+
+import httpx
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+load_dotenv()
+
+POOL_MAXSIZE = int(os.environ.get("API_POOL_MAXSIZE", "10"))
+GET_RETRIES = int(os.environ.get("API_GET_RETRIES", "3"))
+RETRY_BACKOFF_SECONDS = float(os.environ.get("API_RETRY_BACKOFF_SECONDS", "0.3"))
+RETRY_STATUSES = (429, 502, 503, 504)
+
+_lock = threading.Lock()
+_session: requests.Session | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+_async_client: httpx.AsyncClient | None = None
+
+
+def session() -> requests.Session:
+    """The process-wide pooled requests.Session."""
+    global _session
+    with _lock:
+        if _session is None:
+            retry = Retry(
+                total=GET_RETRIES,
+                backoff_factor=RETRY_BACKOFF_SECONDS,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=frozenset({"GET"}),
+                respect_retry_after_header=True,
+                raise_on_status=False,   # hand the final response back to the caller
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+            _session = requests.Session()
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        return _session
+
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="api-async-loop", daemon=True).start()
+        return _loop
+
+
+def async_client() -> httpx.AsyncClient:
+    """The pooled httpx.AsyncClient — only use it inside coroutines passed to run_async()."""
+    global _async_client
+    if _async_client is None:
+        transport = httpx.AsyncHTTPTransport(
+            retries=GET_RETRIES,   # connection-level retries only; safe for any method
+            limits=httpx.Limits(max_connections=POOL_MAXSIZE, max_keepalive_connections=POOL_MAXSIZE),
+        )
+        _async_client = httpx.AsyncClient(transport=transport)
+    return _async_client
+
+
+def run_async(coro):
+    """Run a coroutine on the shared background loop and block until it returns."""
+    return asyncio.run_coroutine_threadsafe(coro, _ensure_loop()).result()
@@ -1,6 +1,7 @@
 import requests
 import os
 from dotenv import load_dotenv
+from services import http
 from services.api import ApiError
 
 load_dotenv()
@@ -20,7 +21,7 @@ def _error_message(response: requests.Response, fallback: str) -> str:
 
 def sign_in(email, password):
     try:
-        response = requests.post(
+        response = http.session().post(
             f"{BASE_URL}/auth/login",
             json={"email": email, "password": password},
             timeout=REQUEST_TIMEOUT_SECONDS,
@@ -34,7 +35,7 @@ def sign_in(email, password):
 
 def sign_up(email, password):
     try:
-        response = requests.post(
+        response = http.session().post(
             f"{BASE_URL}/auth/register",
             json={"email": email, "password": password},
             timeout=REQUEST_TIMEOUT_SECONDS,